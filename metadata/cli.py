@@ -1,6 +1,8 @@
+import hashlib
 import json
 import os
 import csv
+import subprocess
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Set
 import click
@@ -16,6 +18,10 @@ FONTS = os.path.join(PROJECT_ROOT, 'vendor', 'google')
 FONTS_APACHE = os.path.join(FONTS, 'apache')
 FONTS_OFL = os.path.join(FONTS, 'ofl')
 FONTS_UFL = os.path.join(FONTS, 'ufl')
+# Written by tools/catalog_delta.py
+CATALOG_DELTA = os.path.join(PROJECT_ROOT, '.cache', 'catalog-delta.json')
+# Per font directory: the digest it was last mapped at, and its family
+MAP_STATE = os.path.join(PROJECT_ROOT, '.cache', 'metadata-map-state.json')
 
 
 def load_webfonts_data(webfonts_path: str) -> Dict[str, Dict]:
@@ -52,6 +58,69 @@ def parse_metadata_pb(metadata_path: str) -> List[Dict]:
     return fonts
 
 
+def load_catalog_delta() -> Optional[Dict]:
+    """The catalog delta manifest, or None if catalog_delta.py has not run."""
+    if not os.path.exists(CATALOG_DELTA):
+        return None
+    with open(CATALOG_DELTA, 'r') as f:
+        return json.load(f)
+
+
+def vendor_tree_ids() -> Dict[str, str]:
+    """
+    Git tree id of every font directory ("ofl/abel") of the vendor/google
+    checkout, leaving out directories with uncommitted changes. Empty when
+    vendor/google is not a git checkout.
+    """
+    try:
+        listing = subprocess.run(['git', '-C', FONTS, 'ls-tree', 'HEAD', 'apache/', 'ofl/', 'ufl/'],
+                                 capture_output=True, text=True, check=True).stdout
+        status = subprocess.run(['git', '-C', FONTS, 'status', '--porcelain', '--', 'apache', 'ofl', 'ufl'],
+                                capture_output=True, text=True, check=True).stdout
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        return {}
+    trees = {}
+    for line in listing.splitlines():
+        info, path = line.split('\t', 1)
+        if info.split()[1] == 'tree':
+            trees[path] = info.split()[2]
+    for line in status.splitlines():
+        dirty = '/'.join(line[3:].split(' -> ')[-1].strip('"').split('/')[:2])
+        trees.pop(dirty, None)
+    return trees
+
+
+def font_dir_digest(font_dir: str, trees: Dict[str, str]) -> str:
+    """Digest of what map reads from a font directory: METADATA.pb and the font files."""
+    relative = os.path.relpath(font_dir, FONTS).replace(os.sep, '/')
+    if relative in trees:
+        return f"git:{trees[relative]}"
+    sha = hashlib.sha256()
+    for name in sorted(os.listdir(font_dir)):
+        if name == 'METADATA.pb' or name.lower().endswith(('.ttf', '.otf')):
+            sha.update(name.encode('utf-8') + b'\0')
+            with open(os.path.join(font_dir, name), 'rb') as f:
+                for block in iter(lambda: f.read(1 << 20), b''):
+                    sha.update(block)
+    return f"sha256:{sha.hexdigest()}"
+
+
+def load_map_state() -> Dict[str, Dict]:
+    if not os.path.exists(MAP_STATE):
+        return {}
+    try:
+        with open(MAP_STATE, 'r') as f:
+            return json.load(f)
+    except ValueError:
+        return {}
+
+
+def save_map_state(state: Dict[str, Dict]):
+    os.makedirs(os.path.dirname(MAP_STATE), exist_ok=True)
+    with open(MAP_STATE, 'w') as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+
+
 def validate_font_mapping(font_dir: str, webfonts_data: Dict[str, Dict]) -> List[Tuple[str, str, str]]:
     """Validate font mapping between local files and Google Fonts API data."""
     issues = []
@@ -405,7 +474,10 @@ def pre_validate(webfonts: str, output: str):
 @click.option('--webfonts', default=WEBFONTS_JSON, help='Path to webfonts.json')
 @click.option('--family', help='Specific font family to map (optional)')
 @click.option('--output', default=METADATA_JSON, help='Output JSON file path')
-def map(webfonts: str, family: Optional[str], output: str):
+@click.option('--only-changed', is_flag=True,
+              help='Only re-map families added or modified in the catalog delta manifest, or whose '
+                   'vendor/google directory changed since it was last mapped; keep the rest of the existing output')
+def map(webfonts: str, family: Optional[str], output: str, only_changed: bool):
     """Map font metadata to generate METADATA.json structure."""
     # Load webfonts data
     webfonts_data = load_webfonts_data(webfonts)
@@ -416,6 +488,17 @@ def map(webfonts: str, family: Optional[str], output: str):
     # Process fonts
     all_mappings = {}
 
+    changed = None
+    previous = {}
+    if only_changed and not family:
+        delta = load_catalog_delta()
+        if delta is None or not os.path.exists(output):
+            click.echo("No catalog delta manifest or previous output; mapping every family.")
+        else:
+            changed = set(delta['added']) | set(delta['modified'])
+            with open(output, 'r') as f:
+                previous = json.load(f)
+
     if family:
         # Check if family is in invalid list
         if family in invalid_fonts:
@@ -442,6 +525,12 @@ def map(webfonts: str, family: Optional[str], output: str):
         total = 0
         mapped = 0
         skipped = 0
+        reused = 0
+        # A directory keeps its previous mapping only if neither its API record
+        # nor its vendor/google files changed since it was last mapped
+        map_state = load_map_state()
+        new_state = {}
+        trees = vendor_tree_ids()
 
         for base_dir in [FONTS_APACHE, FONTS_OFL, FONTS_UFL]:
             if not os.path.exists(base_dir):
@@ -456,18 +545,34 @@ def map(webfonts: str, family: Optional[str], output: str):
                         skipped += 1
                         continue
 
+                    key = os.path.relpath(full_path, FONTS).replace(os.sep, '/')
+                    digest = font_dir_digest(full_path, trees)
+                    state = map_state.get(key, {})
+                    if (changed is not None and state.get('digest') == digest
+                            and state.get('family') in previous and state['family'] in webfonts_data
+                            and state['family'] not in changed):
+                        all_mappings[state['family']] = previous[state['family']]
+                        new_state[key] = state
+                        reused += 1
+                        continue
+
                     result = map_font_metadata(full_path, webfonts_data)
                     if result:
                         mapped += 1
                         family_name = result['family']
                         all_mappings[family_name] = result
+                        new_state[key] = {'digest': digest, 'family': family_name}
                         click.echo(f"Mapping for '{family_name}'")
 
+        save_map_state(new_state)
+
         click.echo(f"\nMapping Summary:")
         click.echo(f"Total fonts: {total}")
         click.echo(f"Successfully mapped: {mapped}")
         click.echo(f"Skipped (invalid): {skipped}")
-        click.echo(f"Failed to map: {total - mapped - skipped}")
+        if changed is not None:
+            click.echo(f"Unchanged (kept from {output}): {reused}")
+        click.echo(f"Failed to map: {total - mapped - skipped - reused}")
 
     # Write all mappings to output file
     if all_mappings:
@@ -0,0 +1,126 @@
+/**
+ * Decoder for google-fonts-latest.columnar.json, the dictionary-encoded
+ * catalog generated by tools/build_columnar_catalog.py (see that script for
+ * the format). Mirrors decode_catalog() there.
+ */
+
+export interface WebfontItem {
+  family: string;
+  variants: string[];
+  subsets: string[];
+  version: string;
+  lastModified: string;
+  files: { [variant: string]: string };
+  category: string;
+  kind: string;
+  menu?: string;
+  colorCapabilities?: string[];
+}
+
+export interface ColumnarCatalog {
+  format: "webfonts-columnar";
+  version: 1;
+  kind: string;
+  url_prefix: string;
+  tables: {
+    subsets: string[];
+    variants: string[];
+    categories: string[];
+    kinds: string[];
+    versions: string[];
+    extensions: string[];
+    color_capabilities: string[];
+  };
+  columns: {
+    family: string[];
+    category: number[];
+    kind: number[];
+    version: number[];
+    extension: number[];
+    /** Days since 1970-01-01 */
+    last_modified: number[];
+    /** gstatic directory; null when it is the default */
+    dir: (string | null)[];
+    subsets: number[][];
+    variants: number[][];
+    /** Per variant: file name, or the whole URL when it has another form */
+    files: (string | null)[][];
+    menu: (string | null)[];
+    /** Sparse, by item position */
+    color_capabilities: { [position: string]: number[] };
+  };
+}
+
+const DAY_MS = 24 * 60 * 60 * 1000;
+
+function fileUrl(
+  name: string | null,
+  path: string,
+  extension: string
+): string | null {
+  if (name === null || name.includes("/")) return name;
+  return `${path}${name}.${extension}`;
+}
+
+/**
+ * The catalog item at a position, decoded on demand.
+ */
+export function decodeItem(
+  catalog: ColumnarCatalog,
+  position: number
+): WebfontItem {
+  const { tables, columns } = catalog;
+  const family = columns.family[position];
+  const version = tables.versions[columns.version[position]];
+  const extension = tables.extensions[columns.extension[position]];
+  const dir =
+    columns.dir[position] ?? family.toLowerCase().split(" ").join("");
+  const path = `${catalog.url_prefix}${dir}/${version}/`;
+  const variants = columns.variants[position].map((v) => tables.variants[v]);
+
+  const files: { [variant: string]: string } = {};
+  columns.files[position].forEach((name, i) => {
+    const url = fileUrl(name, path, extension);
+    if (url !== null) files[variants[i]] = url;
+  });
+
+  const item: WebfontItem = {
+    family,
+    variants,
+    subsets: columns.subsets[position].map((s) => tables.subsets[s]),
+    version,
+    lastModified: new Date(columns.last_modified[position] * DAY_MS)
+      .toISOString()
+      .slice(0, 10),
+    files,
+    category: tables.categories[columns.category[position]],
+    kind: tables.kinds[columns.kind[position]],
+  };
+  const menu = fileUrl(columns.menu[position], path, extension);
+  if (menu !== null) item.menu = menu;
+  const capabilities = columns.color_capabilities[String(position)];
+  if (capabilities) {
+    item.colorCapabilities = capabilities.map(
+      (c) => tables.color_capabilities[c]
+    );
+  }
+  return item;
+}
+
+/**
+ * Rebuilds the webfonts.json catalog.
+ */
+export function decodeCatalog(catalog: ColumnarCatalog): {
+  kind: string;
+  items: WebfontItem[];
+} {
+  if (catalog.format !== "webfonts-columnar" || catalog.version !== 1) {
+    throw new Error(
+      `Unsupported catalog format: ${catalog.format} v${catalog.version}`
+    );
+  }
+  return {
+    kind: catalog.kind,
+    items: catalog.columns.family.map((_, i) => decodeItem(catalog, i)),
+  };
+}
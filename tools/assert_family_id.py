@@ -13,7 +13,6 @@ Usage:
 
 import os
 import sys
-import re
 from pathlib import Path
 from typing import List, Dict, Tuple, Set
 import click
@@ -26,19 +25,8 @@ except ImportError:
     print("Error: gftools not found. Please install it with: pip install gftools")
     sys.exit(1)
 
-
-def normalize_family_name(family_name: str) -> str:
-    """
-    Convert family name to family id format:
-    - Remove all spaces
-    - Convert to lowercase
-    """
-    if not family_name:
-        return ""
-
-    # Remove all spaces and convert to lowercase
-    normalized = re.sub(r'\s+', '', family_name.lower())
-    return normalized
+from family_id import normalize_family_name
+from metadata_cache import DEFAULT_CACHE_DIR, MetadataCache, load_metadata
 
 
 def parse_metadata_pb(metadata_path: str) -> Dict:
@@ -60,7 +48,7 @@ def parse_metadata_pb(metadata_path: str) -> Dict:
         return {'family_name': None, 'metadata': None}
 
 
-def validate_family_id(font_dir: str, verbose: bool = False) -> List[Tuple[str, str]]:
+def validate_family_id(font_dir: str, verbose: bool = False, cache: MetadataCache = None) -> List[Tuple[str, str]]:
     """
     Validate family id in a single font directory.
 
@@ -80,13 +68,18 @@ def validate_family_id(font_dir: str, verbose: bool = False) -> List[Tuple[str,
 
     # Parse METADATA.pb using gftools protobuf
     try:
-        with open(metadata_path, 'r', encoding='utf-8') as f:
-            metadata = pb.FamilyProto()
-            text_format.Parse(f.read(), metadata, allow_unknown_field=True)
+        metadata = load_metadata(metadata_path, cache)
     except Exception as e:
         issues.append(('ERROR', f'Failed to parse METADATA.pb: {e}'))
         return issues
 
+    return check_family_id(metadata, folder_name, verbose)
+
+
+def check_family_id(metadata, folder_name: str, verbose: bool = False) -> List[Tuple[str, str]]:
+    """Validate that a parsed FamilyProto's name normalizes to its folder name."""
+    issues = []
+
     # Get family name from METADATA.pb
     if not metadata.HasField('name'):
         issues.append(('ERROR', f'METADATA.pb missing family name'))
@@ -142,7 +135,17 @@ def scan_font_directories(base_dir: str, verbose: bool = False) -> List[str]:
     '--output',
     help='Output file for issues (CSV format)'
 )
-def main(fonts_dir, verbose, output):
+@click.option(
+    '--cache-dir',
+    default=DEFAULT_CACHE_DIR,
+    help=f'Binary cache of parsed METADATA.pb files (default: {DEFAULT_CACHE_DIR})'
+)
+@click.option(
+    '--no-cache',
+    is_flag=True,
+    help='Always parse METADATA.pb text format'
+)
+def main(fonts_dir, verbose, output, cache_dir, no_cache):
 
     # Find all font directories
     font_directories = []
@@ -172,6 +175,7 @@ def main(fonts_dir, verbose, output):
         sys.exit(1)
 
     print(f"Validating {len(font_directories)} font directories...")
+    cache = None if no_cache else MetadataCache(cache_dir)
 
     # Validate each font directory
     all_issues = []
@@ -185,7 +189,7 @@ def main(fonts_dir, verbose, output):
         if verbose:
             print(f"\nValidating: {family_name}")
 
-        issues = validate_family_id(font_dir, verbose)
+        issues = validate_family_id(font_dir, verbose, cache)
 
         if issues:
             invalid_fonts += 1
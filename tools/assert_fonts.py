@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Font Directory Validation Engine
+
+Runs the checks of assert_style.py, assert_family_id.py and assert_max_vf_2.py
+in a single pass: the font tree is walked once, each METADATA.pb is parsed
+once, and every selected rule runs against the parsed family in parallel
+worker processes. Issues from all rules go into one combined report.
+
+Exit codes match the individual scripts: 1 if no font directories are found
+or any selected rule reports an issue, 0 otherwise. `--rule style` alone is
+equivalent to assert_style.py, and so on.
+
+Adding a rule: write a function that takes a FamilyDir and returns a list of
+(issue_type, message) tuples, and register it with @rule('name').
+
+Usage:
+    python assert_fonts.py [--fonts-dir ./vendor/google] [--rule style ...] [--output issues.csv]
+"""
+
+import csv
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Tuple
+
+import click
+from tqdm import tqdm
+
+from assert_family_id import check_family_id
+from assert_max_vf_2 import FONT_EXTENSIONS, MAX_VF_PER_FAMILY, read_family_name, read_fvar_axes
+from assert_style import check_styles
+from metadata_cache import DEFAULT_CACHE_DIR, MetadataCache, load_metadata
+from sfnt import SfntError
+
+LICENSE_DIRS = ['ofl', 'apache', 'ufl']
+
+# name -> (check, needs_metadata). Rules that need metadata are skipped for
+# legacy directories without METADATA.pb, as in the individual scripts.
+RULES: Dict[str, Tuple[Callable, bool]] = {}
+
+# Set per worker process by _init_worker.
+_CACHE = None
+
+
+def rule(name: str, needs_metadata: bool = True):
+    def register(check: Callable) -> Callable:
+        RULES[name] = (check, needs_metadata)
+        return check
+    return register
+
+
+class FamilyDir:
+    """One font directory, listed and parsed once for every rule."""
+
+    def __init__(self, path: str, filenames: List[str], metadata=None):
+        self.path = path
+        self.folder = os.path.basename(path)
+        self.license = os.path.basename(os.path.dirname(path))
+        self.filenames = filenames
+        self.metadata = metadata
+        # Set by the max-vf rule; the limit is checked per family across directories
+        self.variable_fonts: List[str] = []
+
+    @property
+    def name(self) -> str:
+        if self.metadata is not None and self.metadata.HasField('name'):
+            return self.metadata.name
+        # Not parsed (or unparsable): same fallback as assert_max_vf_2.py
+        return read_family_name(self.path)
+
+
+@rule('style')
+def style_rule(family: FamilyDir) -> List[Tuple[str, str]]:
+    return check_styles(family.metadata)
+
+
+@rule('family-id')
+def family_id_rule(family: FamilyDir) -> List[Tuple[str, str]]:
+    return check_family_id(family.metadata, family.folder)
+
+
+@rule('max-vf', needs_metadata=False)
+def max_vf_rule(family: FamilyDir) -> List[Tuple[str, str]]:
+    """Finds the directory's VF files; check_max_vf applies the limit once every directory is scanned."""
+    issues = []
+    for filename in sorted(f for f in family.filenames if f.lower().endswith(FONT_EXTENSIONS)):
+        try:
+            if read_fvar_axes(os.path.join(family.path, filename)) is not None:
+                family.variable_fonts.append(filename)
+        except SfntError as e:
+            # Listed, but not failing, as in assert_max_vf_2.py
+            issues.append(('WARNING', f'{filename}: {e}'))
+    return issues
+
+
+def check_max_vf(results: List[Dict]):
+    """Add a max-vf issue to every directory of a family (by name) with too many VF files."""
+    by_family: Dict[str, List[Dict]] = {}
+    for r in results:
+        by_family.setdefault(r['family'], []).append(r)
+    for family_results in by_family.values():
+        files = [f if len(family_results) == 1 else f"{r['folder']}/{f}"
+                 for r in family_results for f in r['variable_fonts']]
+        if len(files) > MAX_VF_PER_FAMILY:
+            for r in family_results:
+                r['issues'].append(('max-vf', 'ERROR', f'{len(files)} variable font files '
+                                                       f'(max {MAX_VF_PER_FAMILY}): {", ".join(files)}'))
+
+
+def scan_font_directories(base_dir: str) -> List[str]:
+    """Immediate subdirectories of base_dir."""
+    if not os.path.isdir(base_dir):
+        return []
+    with os.scandir(base_dir) as entries:
+        return [entry.path for entry in entries if entry.is_dir()]
+
+
+def find_font_directories(fonts_dir: str) -> List[str]:
+    """Same lookup as the assert_* scripts: a single family, the license directories, or fonts_dir itself."""
+    if not os.path.exists(fonts_dir):
+        return []
+    if os.path.exists(os.path.join(fonts_dir, 'METADATA.pb')):
+        return [fonts_dir]
+    font_directories = []
+    for subdir in LICENSE_DIRS:
+        font_directories.extend(scan_font_directories(os.path.join(fonts_dir, subdir)))
+    return font_directories or scan_font_directories(fonts_dir)
+
+
+def _init_worker(cache_dir):
+    global _CACHE
+    _CACHE = MetadataCache(cache_dir) if cache_dir else None
+
+
+def validate_family(task: Tuple[str, List[str]]) -> Dict:
+    """Run the selected rules against one font directory. Returns a picklable result."""
+    font_dir, rule_names = task
+    filenames = os.listdir(font_dir)
+    result = {'folder': os.path.basename(font_dir), 'path': font_dir,
+              'has_metadata': 'METADATA.pb' in filenames, 'issues': []}
+
+    metadata = None
+    needs_metadata = any(RULES[name][1] for name in rule_names)
+    if result['has_metadata'] and needs_metadata:
+        try:
+            metadata = load_metadata(os.path.join(font_dir, 'METADATA.pb'), _CACHE)
+        except Exception as e:
+            # Rules that do not need metadata still run
+            result['issues'].append(('metadata', 'ERROR', f'Failed to parse METADATA.pb: {e}'))
+
+    family = FamilyDir(font_dir, filenames, metadata)
+    result['family'] = family.name
+    for name in rule_names:
+        check, rule_needs_metadata = RULES[name]
+        if rule_needs_metadata and metadata is None:
+            continue
+        for issue_type, message in check(family):
+            result['issues'].append((name, issue_type, message))
+    result['variable_fonts'] = family.variable_fonts
+    return result
+
+
+def write_report(output: str, rule_names: List[str], results: List[Dict]):
+    issues = [(r['folder'], rule_name, issue_type, message)
+              for r in results for rule_name, issue_type, message in r['issues']]
+    if output.endswith('.json'):
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump({
+                'generated_at': datetime.now(timezone.utc).isoformat(),
+                'rules': rule_names,
+                'families': len(results),
+                'issues': [{'family': family, 'rule': rule_name, 'issue_type': issue_type, 'message': message}
+                           for family, rule_name, issue_type, message in issues],
+            }, f, indent=2, ensure_ascii=False)
+    else:
+        with open(output, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['family', 'rule', 'issue_type', 'message'])
+            writer.writerows(issues)
+
+
+@click.command()
+@click.option('--fonts-dir', default='./vendor/google',
+              help='Base directory containing font directories (default: ./vendor/google)')
+@click.option('--rule', 'rules', multiple=True, type=click.Choice(sorted(RULES)),
+              help='Rule to run (repeatable, default: all rules)')
+@click.option('--output', help='Output file for issues (CSV, or JSON if it ends in .json)')
+@click.option('--cache-dir', default=DEFAULT_CACHE_DIR,
+              help=f'Binary cache of parsed METADATA.pb files (default: {DEFAULT_CACHE_DIR})')
+@click.option('--no-cache', is_flag=True, help='Always parse METADATA.pb text format')
+@click.option('--jobs', '-j', default=os.cpu_count(), type=int, help='Worker processes (default: CPU count)')
+@click.option('--verbose', '-v', is_flag=True, help='Verbose output')
+def main(fonts_dir, rules, output, cache_dir, no_cache, jobs, verbose):
+    """Validate every font directory against all rules in a single pass."""
+    rule_names = list(rules) or list(RULES)
+
+    font_directories = sorted(find_font_directories(fonts_dir))
+    if not font_directories:
+        print(f"Error: No font directories found in {fonts_dir}")
+        print("Expected structure: vendor/google/{ofl,apache,ufl}/*/METADATA.pb")
+        print("Or point directly to a font directory containing METADATA.pb")
+        sys.exit(1)
+
+    print(f"Validating {len(font_directories)} font directories ({', '.join(rule_names)})...")
+
+    tasks = [(font_dir, rule_names) for font_dir in font_directories]
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                             initargs=(None if no_cache else cache_dir,)) as pool:
+        results = list(tqdm(pool.map(validate_family, tasks, chunksize=32),
+                            total=len(tasks), desc="Validating families"))
+    if 'max-vf' in rule_names:
+        check_max_vf(results)
+
+    flagged = [r for r in results if r['issues']]
+    invalid = [r for r in flagged if any(issue_type != 'WARNING' for _, issue_type, _ in r['issues'])]
+    skipped = sum(1 for r in results if not r['has_metadata'])
+    rule_counts = {name: 0 for name in rule_names}
+    for r in flagged:
+        for rule_name, _, _ in r['issues']:
+            rule_counts[rule_name] = rule_counts.get(rule_name, 0) + 1
+
+    print(f"\nValidation Results:")
+    print(f"  Total fonts: {len(results)}")
+    print(f"  Valid fonts: {len(results) - len(invalid)}")
+    print(f"  Invalid fonts: {len(invalid)}")
+    print(f"  Without METADATA.pb: {skipped}")
+    for name, count in rule_counts.items():
+        print(f"  {name} issues: {count}")
+
+    if verbose and skipped:
+        print(f"\nSkipped legacy fonts (no METADATA.pb):")
+        for r in results:
+            if not r['has_metadata']:
+                print(f"  {r['folder']}")
+
+    if flagged:
+        print(f"\nIssues Found:")
+        for r in flagged:
+            print(f"\n  {r['folder']}:")
+            for rule_name, issue_type, message in r['issues']:
+                print(f"    [{issue_type}] ({rule_name}) {message}")
+
+    if output:
+        write_report(output, rule_names, results)
+        print(f"\nIssues written to: {output}")
+
+    if invalid:
+        sys.exit(1)
+    print(f"\n✅ All fonts validated successfully!")
+
+
+if __name__ == '__main__':
+    main()
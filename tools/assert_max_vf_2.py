@@ -3,24 +3,94 @@
 Variable Font Assertion Script
 
 This script asserts that there can only be up to 2 variable fonts per family.
-Variable fonts are identified by the naming convention: name[xxxx].ttf
+Variable fonts are identified by the presence of an fvar table, read from the
+sfnt table directory without loading the font. Files whose name disagrees
+with their fvar (name[xxxx].ttf without fvar, or fvar without brackets) are
+reported as misnamed. Axis tags and ranges are reported per family.
 
 Usage:
     python assert_max_vf_2.py [--fonts-dir /path/to/fonts] [--verbose] [--output file.csv]
 """
 
 import os
+import struct
 import sys
+import zlib
 from pathlib import Path
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
 import click
 
+from sfnt import SfntError, read_table
+
+MAX_VF_PER_FAMILY = 2
+FONT_EXTENSIONS = ('.ttf', '.otf')
+
 
 def is_variable_font(filename: str) -> bool:
     """Check if a filename represents a variable font based on naming convention."""
     return '[' in filename and ']' in filename and filename.lower().endswith('.ttf')
 
 
+def read_fvar_axes(path: str) -> Optional[List[Dict]]:
+    """
+    Axes from a font's fvar table, or None if the font has no fvar (is not
+    variable). Only the table directory and the fvar table are read.
+    Raises SfntError if the file cannot be read or its fvar is malformed.
+    """
+    try:
+        data = read_table(path, 'fvar')
+        if data is None:
+            return None
+
+        axes_offset, _, axis_count, axis_size = struct.unpack('>HHHH', data[4:12])
+        axes = []
+        for i in range(axis_count):
+            offset = axes_offset + i * axis_size
+            tag, min_value, default_value, max_value = struct.unpack('>4siii', data[offset:offset + 16])
+            axes.append({
+                'tag': tag.decode('latin-1'),
+                'min': min_value / 65536,
+                'default': default_value / 65536,
+                'max': max_value / 65536,
+            })
+        return axes
+    except SfntError:
+        raise
+    except (OSError, struct.error, zlib.error, IndexError) as e:
+        raise SfntError(f"unreadable font: {e}") from e
+
+
+def format_axes(axes: List[Dict]) -> str:
+    """'wdth 75-100, wght 100-900' style summary of axis ranges."""
+    return ", ".join(f"{a['tag']} {a['min']:g}-{a['max']:g}" for a in axes)
+
+
+def family_axes(fonts: List[Dict]) -> List[Dict]:
+    """Union of the axes of a family's VF files, with the widest range per tag."""
+    merged = {}
+    for font in fonts:
+        for axis in font['axes']:
+            current = merged.setdefault(axis['tag'], dict(axis))
+            current['min'] = min(current['min'], axis['min'])
+            current['max'] = max(current['max'], axis['max'])
+    return [merged[tag] for tag in sorted(merged)]
+
+
+def read_family_name(font_dir: str) -> str:
+    """Family name from the first `name:` line of METADATA.pb, else the directory name."""
+    metadata_path = os.path.join(font_dir, 'METADATA.pb')
+    if os.path.exists(metadata_path):
+        try:
+            # Simple parsing to get family name
+            with open(metadata_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if line.strip().startswith('name:'):
+                        return line.split(':', 1)[1].strip().strip('"')
+        except Exception:
+            pass  # Use directory name as fallback
+    return os.path.basename(font_dir)
+
+
 def scan_font_directories(base_dir: str, verbose: bool = False) -> List[str]:
     """Scan for all font directories in the base directory."""
     font_dirs = []
@@ -40,48 +110,57 @@ def scan_font_directories(base_dir: str, verbose: bool = False) -> List[str]:
     return font_dirs
 
 
-def find_variable_fonts(font_dir: str, verbose: bool = False) -> List[Dict]:
+def find_variable_fonts(font_dir: str, verbose: bool = False) -> Tuple[List[Dict], List[Dict], List[Dict]]:
     """
     Find variable fonts in a single font directory.
     
     Returns:
-        List of dictionaries with font information
+        (variable fonts, misnamed files, unreadable files) as lists of dictionaries with font information
     """
     variable_fonts = []
-    family_name = os.path.basename(font_dir)
+    misnamed = []
+    unreadable = []
     
     if not os.path.exists(font_dir):
-        return variable_fonts
+        return variable_fonts, misnamed, unreadable
     
-    # Get family name from METADATA.pb if available
-    metadata_path = os.path.join(font_dir, 'METADATA.pb')
-    if os.path.exists(metadata_path):
-        try:
-            # Simple parsing to get family name
-            with open(metadata_path, 'r', encoding='utf-8') as f:
-                for line in f:
-                    if line.strip().startswith('name:'):
-                        family_name = line.split(':', 1)[1].strip().strip('"')
-                        break
-        except Exception:
-            pass  # Use directory name as fallback
+    family_name = read_family_name(font_dir)
     
-    # Scan for variable font files
-    for filename in os.listdir(font_dir):
-        if is_variable_font(filename):
-            font_info = {
-                'family': family_name,
-                'filename': filename,
-                'path': os.path.join(font_dir, filename),
-                'relative_path': os.path.relpath(os.path.join(font_dir, filename)),
-                'size_bytes': os.path.getsize(os.path.join(font_dir, filename))
-            }
+    # Scan font files for an fvar table
+    for filename in sorted(os.listdir(font_dir)):
+        if not filename.lower().endswith(FONT_EXTENSIONS):
+            continue
+        path = os.path.join(font_dir, filename)
+        try:
+            axes = read_fvar_axes(path)
+        except SfntError as e:
+            unreadable.append({'family': family_name, 'filename': filename, 'issue': str(e)})
+            if verbose:
+                print(f"  Unreadable: {filename} ({e})")
+            continue
+        named_variable = is_variable_font(filename)
+        if axes is None and not named_variable:
+            continue
+
+        font_info = {
+            'family': family_name,
+            'filename': filename,
+            'path': path,
+            'relative_path': os.path.relpath(path),
+            'size_bytes': os.path.getsize(path),
+            'axes': axes or [],
+        }
+        if axes is None or not named_variable:
+            font_info['issue'] = 'named as VF but has no fvar table' if axes is None else 'has fvar but not named as VF'
+            misnamed.append(font_info)
+            if verbose:
+                print(f"  Misnamed: {filename} ({font_info['issue']})")
+        if axes is not None:
             variable_fonts.append(font_info)
-            
             if verbose:
-                print(f"  Found VF: {filename}")
+                print(f"  Found VF: {filename} ({format_axes(axes)})")
     
-    return variable_fonts
+    return variable_fonts, misnamed, unreadable
 
 
 @click.command()
@@ -138,6 +217,8 @@ def main(fonts_dir, verbose, output, format):
     
     # Find all variable fonts
     all_variable_fonts = []
+    all_misnamed = []
+    all_unreadable = []
     families_with_vf = set()
     
     for font_dir in sorted(font_directories):
@@ -146,8 +227,10 @@ def main(fonts_dir, verbose, output, format):
         if verbose:
             print(f"\nScanning: {family_name}")
         
-        variable_fonts = find_variable_fonts(font_dir, verbose)
+        variable_fonts, misnamed, unreadable = find_variable_fonts(font_dir, verbose)
         all_variable_fonts.extend(variable_fonts)
+        all_misnamed.extend(misnamed)
+        all_unreadable.extend(unreadable)
         
         if variable_fonts:
             families_with_vf.add(family_name)
@@ -161,7 +244,7 @@ def main(fonts_dir, verbose, output, format):
     # Check for violations (families with more than 2 VF files)
     violations = []
     for family, count in family_counts.items():
-        if count > 2:
+        if count > MAX_VF_PER_FAMILY:
             violations.append((family, count))
     
     # Report results
@@ -169,13 +252,25 @@ def main(fonts_dir, verbose, output, format):
     print(f"  Total font directories: {len(font_directories)}")
     print(f"  Families with variable fonts: {len(families_with_vf)}")
     print(f"  Total variable font files: {len(all_variable_fonts)}")
-    
     if all_variable_fonts:
         # Calculate total size
         total_size = sum(font['size_bytes'] for font in all_variable_fonts)
         total_size_mb = total_size / (1024 * 1024)
         print(f"  Total size: {total_size_mb:.2f} MB")
-        
+    print(f"  Misnamed font files: {len(all_misnamed)}")
+    print(f"  Unreadable font files: {len(all_unreadable)}")
+    
+    if all_misnamed:
+        print(f"\n⚠️  Files whose name disagrees with their fvar table:")
+        for font in all_misnamed:
+            print(f"  {font['family']} - {font['filename']}: {font['issue']}")
+
+    if all_unreadable:
+        print(f"\n⚠️  Files whose sfnt directory or fvar table could not be read:")
+        for font in all_unreadable:
+            print(f"  {font['family']} - {font['filename']}: {font['issue']}")
+    
+    if all_variable_fonts:
         # Show family statistics
         families_with_0_vf = len(font_directories) - len(families_with_vf)
         print(f"\nVariable Fonts per Family:")
@@ -186,6 +281,19 @@ def main(fonts_dir, verbose, output, format):
         print(f"  Families with 2 VF files: {sum(1 for count in family_counts.values() if count == 2)}")
         print(f"  Families with 3+ VF files: {sum(1 for count in family_counts.values() if count >= 3)}")
         
+        # Axis sets per family (union of the axes of its VF files)
+        axes_by_family = {
+            family: family_axes([f for f in all_variable_fonts if f['family'] == family])
+            for family in family_counts
+        }
+        axis_set_counts = {}
+        for axes in axes_by_family.values():
+            axis_set = ",".join(a['tag'] for a in axes)
+            axis_set_counts[axis_set] = axis_set_counts.get(axis_set, 0) + 1
+        print(f"\nAxis Sets (families):")
+        for axis_set, count in sorted(axis_set_counts.items(), key=lambda x: x[1], reverse=True)[:15]:
+            print(f"  {axis_set:<40} {count}")
+        
         # Show violations if any
         if violations:
             print(f"\n❌ VALIDATION FAILED: Found {len(violations)} families with more than 2 VF files:")
@@ -217,8 +325,8 @@ def main(fonts_dir, verbose, output, format):
             # Show family breakdown table if verbose or format is specified
             if verbose or format != 'table':
                 print(f"\nVariable Fonts by Family:")
-                print(f"{'Family':<30} {'Count':<8} {'Names':<50} {'Size (MB)':<12}")
-                print("-" * 100)
+                print(f"{'Family':<30} {'Count':<8} {'Names':<50} {'Size (MB)':<12} {'Axes'}")
+                print("-" * 130)
                 
                 # Sort families by number of VF files (descending)
                 sorted_families = sorted(family_counts.items(), key=lambda x: x[1], reverse=True)
@@ -236,22 +344,22 @@ def main(fonts_dir, verbose, output, format):
                     if len(names_str) > 48:
                         names_str = names_str[:45] + "..."
                     
-                    print(f"{family:<30} {count:<8} {names_str:<50} {family_size:<12.2f}")
+                    print(f"{family:<30} {count:<8} {names_str:<50} {family_size:<12.2f} {format_axes(axes_by_family[family])}")
         
         # Output results in other formats if requested
         if format == 'list':
             print(f"\nVariable Fonts Found:")
             for font in sorted(all_variable_fonts, key=lambda x: (x['family'], x['filename'])):
                 size_mb = font['size_bytes'] / (1024 * 1024)
-                print(f"  {font['family']} - {font['filename']} ({size_mb:.2f} MB)")
+                print(f"  {font['family']} - {font['filename']} ({size_mb:.2f} MB) [{format_axes(font['axes'])}]")
         
         elif format == 'csv':
             if output:
                 with open(output, 'w', encoding='utf-8') as f:
-                    f.write("family,filename,path,relative_path,size_bytes,size_mb\n")
+                    f.write("family,filename,path,relative_path,size_bytes,size_mb,axes\n")
                     for font in sorted(all_variable_fonts, key=lambda x: (x['family'], x['filename'])):
                         size_mb = font['size_bytes'] / (1024 * 1024)
-                        f.write(f'"{font["family"]}","{font["filename"]}","{font["path"]}","{font["relative_path"]}",{font["size_bytes"]},{size_mb:.2f}\n')
+                        f.write(f'"{font["family"]}","{font["filename"]}","{font["path"]}","{font["relative_path"]}",{font["size_bytes"]},{size_mb:.2f},"{format_axes(font["axes"])}"\n')
                 print(f"\nResults written to: {output}")
             else:
                 print("CSV format requires --output option")
@@ -260,10 +368,10 @@ def main(fonts_dir, verbose, output, format):
         # Write to output file if specified (for non-CSV formats)
         if output and format != 'csv':
             with open(output, 'w', encoding='utf-8') as f:
-                f.write("family,filename,path,relative_path,size_bytes,size_mb\n")
+                f.write("family,filename,path,relative_path,size_bytes,size_mb,axes\n")
                 for font in sorted(all_variable_fonts, key=lambda x: (x['family'], x['filename'])):
                     size_mb = font['size_bytes'] / (1024 * 1024)
-                    f.write(f'"{font["family"]}","{font["filename"]}","{font["path"]}","{font["relative_path"]}",{font["size_bytes"]},{size_mb:.2f}\n')
+                    f.write(f'"{font["family"]}","{font["filename"]}","{font["path"]}","{font["relative_path"]}",{font["size_bytes"]},{size_mb:.2f},"{format_axes(font["axes"])}"\n')
             print(f"\nResults written to: {output}")
     
     else:
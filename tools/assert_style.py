@@ -24,6 +24,8 @@ except ImportError:
     print("Error: gftools not found. Please install it with: pip install gftools")
     sys.exit(1)
 
+from metadata_cache import DEFAULT_CACHE_DIR, MetadataCache, load_metadata
+
 
 def parse_metadata_pb(metadata_path: str) -> List[Dict]:
     """Parse METADATA.pb file using gftools protobuf and extract font information."""
@@ -52,7 +54,7 @@ def parse_metadata_pb(metadata_path: str) -> List[Dict]:
         return []
 
 
-def validate_font_styles(font_dir: str, verbose: bool = False) -> List[Tuple[str, str]]:
+def validate_font_styles(font_dir: str, verbose: bool = False, cache: MetadataCache = None) -> List[Tuple[str, str]]:
     """
     Validate font styles in a single font directory.
     
@@ -72,9 +74,7 @@ def validate_font_styles(font_dir: str, verbose: bool = False) -> List[Tuple[str
     
     # Parse METADATA.pb using gftools protobuf
     try:
-        with open(metadata_path, 'r', encoding='utf-8') as f:
-            metadata = pb.FamilyProto()
-            text_format.Parse(f.read(), metadata, allow_unknown_field=True)
+        metadata = load_metadata(metadata_path, cache)
     except Exception as e:
         issues.append(('ERROR', f'Failed to parse METADATA.pb: {e}'))
         return issues
@@ -83,7 +83,12 @@ def validate_font_styles(font_dir: str, verbose: bool = False) -> List[Tuple[str
     if metadata.HasField('name'):
         family_name = metadata.name
     
-    # Validate each font declaration
+    return check_styles(metadata, verbose)
+
+
+def check_styles(metadata, verbose: bool = False) -> List[Tuple[str, str]]:
+    """Validate the style of each font declaration in a parsed FamilyProto."""
+    issues = []
     valid_styles = {'normal', 'italic'}
     
     for i, font in enumerate(metadata.fonts):
@@ -132,7 +137,17 @@ def scan_font_directories(base_dir: str, verbose: bool = False) -> List[str]:
     '--output',
     help='Output file for issues (CSV format)'
 )
-def main(fonts_dir, verbose, output):
+@click.option(
+    '--cache-dir',
+    default=DEFAULT_CACHE_DIR,
+    help=f'Binary cache of parsed METADATA.pb files (default: {DEFAULT_CACHE_DIR})'
+)
+@click.option(
+    '--no-cache',
+    is_flag=True,
+    help='Always parse METADATA.pb text format'
+)
+def main(fonts_dir, verbose, output, cache_dir, no_cache):
     
     # Find all font directories
     font_directories = []
@@ -162,6 +177,7 @@ def main(fonts_dir, verbose, output):
         sys.exit(1)
     
     print(f"Validating {len(font_directories)} font directories...")
+    cache = None if no_cache else MetadataCache(cache_dir)
     
     # Validate each font directory
     all_issues = []
@@ -175,7 +191,7 @@ def main(fonts_dir, verbose, output):
         if verbose:
             print(f"\nValidating: {family_name}")
         
-        issues = validate_font_styles(font_dir, verbose)
+        issues = validate_font_styles(font_dir, verbose, cache)
         
         if issues:
             invalid_fonts += 1
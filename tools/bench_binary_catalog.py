@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Binary Catalog Benchmark
+
+Measures the time from nothing loaded to the first lookup result: opening
+and memory-mapping webfonts.bin (build_binary_catalog.py) and finding a
+family by id, against json.load of webfonts.json followed by a scan for the
+same family. Each run starts from a fresh reader, but the files stay in the
+OS page cache, so this is a process-cold, not disk-cold, comparison.
+
+Usage:
+    python bench_binary_catalog.py [--family "Open Sans"] [--repeat 50] [--output report.csv]
+"""
+
+import csv
+import json
+import os
+import sys
+import time
+
+import click
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from build_binary_catalog import BinaryCatalog  # noqa: E402
+from family_id import family_to_id  # noqa: E402
+
+
+def json_lookup(path: str, family: str):
+    with open(path, 'r') as f:
+        items = json.load(f)['items']
+    target = family_to_id(family)
+    return next((item for item in items if family_to_id(item['family']) == target), None)
+
+
+def binary_lookup(path: str, family: str):
+    with BinaryCatalog(path) as catalog:
+        return catalog.lookup(family)
+
+
+def timings(fn, repeat: int):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {'mean_ms': sum(samples) / len(samples), 'median_ms': samples[len(samples) // 2],
+            'min_ms': samples[0]}
+
+
+@click.command()
+@click.option('--webfonts', default='./www/public/webfonts.json', type=click.Path(exists=True),
+              help='Path to webfonts.json (default: ./www/public/webfonts.json)')
+@click.option('--binary', default='./www/public/webfonts.bin', type=click.Path(exists=True),
+              help='Path to the binary catalog (default: ./www/public/webfonts.bin)')
+@click.option('--family', 'families', multiple=True, default=['Open Sans', 'Zilla Slab Highlight'],
+              help='Family to look up (repeatable)')
+@click.option('--repeat', default=50, help='Runs per family (default: 50)')
+@click.option('--output', help='Save results to CSV')
+def main(webfonts, binary, families, repeat, output):
+    """Compare cold-open-to-first-lookup time of the binary catalog and webfonts.json."""
+    rows = []
+    for family in families:
+        expected = json_lookup(webfonts, family)
+        if binary_lookup(binary, family) != expected:
+            print(f"Error: {binary} and {webfonts} disagree on {family}; rebuild it with build_binary_catalog.py")
+            sys.exit(1)
+        for method, fn in (('json.load', json_lookup), ('mmap', binary_lookup)):
+            rows.append({'family': family, 'method': method, 'found': expected is not None,
+                         **timings(lambda: fn(webfonts if method == 'json.load' else binary, family), repeat)})
+
+    print(f"webfonts.json {os.path.getsize(webfonts) / 1024:.1f} KB, "
+          f"{os.path.basename(binary)} {os.path.getsize(binary) / 1024:.1f} KB, {repeat} runs each\n")
+    print(f"{'Family':<24} {'Method':<10} {'Mean ms':>9} {'Median ms':>10} {'Min ms':>8}")
+    print('-' * 65)
+    for row in rows:
+        print(f"{row['family'][:24]:<24} {row['method']:<10} {row['mean_ms']:>9.3f} "
+              f"{row['median_ms']:>10.3f} {row['min_ms']:>8.3f}")
+    for family in families:
+        json_ms, mmap_ms = (row['median_ms'] for row in rows if row['family'] == family)
+        print(f"{family}: {json_ms / mmap_ms:.0f}x faster to first lookup (median)")
+
+    if output:
+        with open(output, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+            writer.writeheader()
+            writer.writerows(rows)
+        print(f"\nResults saved to: {output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+fonts2svg Render Benchmark
+
+Renders a preview for the largest local font files twice — once with the font
+fully decoded up front (the previous behaviour) and once through the lazy
+loader used by fonts2svg.py — and reports wall time and peak Python memory
+for each file. The lazy render is also timed without kerning, to show the
+cost of the precomputed GPOS pair table.
+
+Usage:
+    python bench_fonts2svg.py [--fonts-dir ./vendor/google] [--top 20] [--output report.csv]
+"""
+
+import io
+import os
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Tuple
+
+import click
+from fontTools.ttLib import TTFont
+from tqdm import tqdm
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from fonts2svg import load_font, text_to_svg_path  # noqa: E402
+
+FONT_EXTENSIONS = ('.ttf', '.otf')
+
+
+def find_largest_fonts(fonts_dir: str, top_n: int) -> List[Tuple[str, int]]:
+    """Return the top_n largest font files under fonts_dir as (path, size) pairs."""
+    font_sizes = []
+    for root, _, files in os.walk(fonts_dir):
+        for name in files:
+            if name.lower().endswith(FONT_EXTENSIONS):
+                path = os.path.join(root, name)
+                font_sizes.append((path, os.path.getsize(path)))
+    font_sizes.sort(key=lambda x: x[1], reverse=True)
+    return font_sizes[:top_n]
+
+
+def open_eager(path: str) -> TTFont:
+    """Read the whole binary into memory and decode every table and glyph."""
+    with open(path, 'rb') as f:
+        font = TTFont(io.BytesIO(f.read()), lazy=False)
+    font.ensureDecompiled()
+    return font
+
+
+def preview_text(path: str) -> str:
+    """The family name stored in the font, as fonts2svg would render it."""
+    with TTFont(path, lazy=True) as font:
+        return font['name'].getDebugName(1) or os.path.basename(path)
+
+
+def measure(open_font: Callable[[str], TTFont], path: str, text: str, kern: bool = True) -> Dict:
+    """Time and trace one open + render cycle."""
+    tracemalloc.start()
+    started = time.perf_counter()
+    with open_font(path) as font:
+        rendered = text_to_svg_path(text, font, kern=kern) is not None
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {'ms': elapsed * 1000, 'peak_kb': peak / 1024, 'rendered': rendered}
+
+
+@click.command()
+@click.option('--fonts-dir', default='./vendor/google',
+              help='Directory containing font files (default: ./vendor/google)')
+@click.option('--top', 'top_n', default=20, type=int, help='Number of largest files to benchmark (default: 20)')
+@click.option('--output', help='Output file for per-font results (CSV format)')
+def main(fonts_dir: str, top_n: int, output: str):
+    """Compare eager and lazy font loading for preview rendering."""
+    fonts = find_largest_fonts(fonts_dir, top_n)
+    if not fonts:
+        print(f"Error: No font files found in {fonts_dir}")
+        sys.exit(1)
+
+    results = []
+    for path, size in tqdm(fonts, desc="Benchmarking fonts"):
+        text = preview_text(path)
+        eager = measure(open_eager, path, text)
+        lazy = measure(load_font, path, text)
+        unkerned = measure(load_font, path, text, kern=False)
+        results.append((path, size, eager, lazy, unkerned))
+
+    print(f"\n{'File':<44} {'Size (KB)':>10} {'Eager ms':>9} {'Lazy ms':>8} {'No kern ms':>11} "
+          f"{'Eager KB':>10} {'Lazy KB':>9}")
+    print("-" * 107)
+    for path, size, eager, lazy, unkerned in results:
+        name = os.path.basename(path)
+        if len(name) > 42:
+            name = name[:39] + "..."
+        print(f"{name:<44} {size / 1024:>10.0f} {eager['ms']:>9.1f} {lazy['ms']:>8.1f} {unkerned['ms']:>11.1f} "
+              f"{eager['peak_kb']:>10.0f} {lazy['peak_kb']:>9.0f}")
+
+    total_eager_ms = sum(r[2]['ms'] for r in results)
+    total_lazy_ms = sum(r[3]['ms'] for r in results)
+    total_unkerned_ms = sum(r[4]['ms'] for r in results)
+    total_eager_kb = sum(r[2]['peak_kb'] for r in results)
+    total_lazy_kb = sum(r[3]['peak_kb'] for r in results)
+    print(f"\nTotal time: eager {total_eager_ms:.0f} ms, lazy {total_lazy_ms:.0f} ms "
+          f"({total_eager_ms / max(total_lazy_ms, 1e-9):.1f}x)")
+    print(f"Kerning overhead: lazy {total_lazy_ms:.0f} ms vs unkerned {total_unkerned_ms:.0f} ms "
+          f"(+{total_lazy_ms - total_unkerned_ms:.0f} ms)")
+    print(f"Summed peak memory: eager {total_eager_kb / 1024:.1f} MB, lazy {total_lazy_kb / 1024:.1f} MB "
+          f"({total_eager_kb / max(total_lazy_kb, 1e-9):.1f}x)")
+
+    if output:
+        with open(output, 'w', encoding='utf-8') as f:
+            f.write("path,size_bytes,eager_ms,lazy_ms,unkerned_ms,eager_peak_kb,lazy_peak_kb,rendered\n")
+            for path, size, eager, lazy, unkerned in results:
+                f.write(f'"{path}",{size},{eager["ms"]:.2f},{lazy["ms"]:.2f},{unkerned["ms"]:.2f},'
+                        f'{eager["peak_kb"]:.0f},{lazy["peak_kb"]:.0f},{lazy["rendered"]}\n')
+        print(f"\nResults written to: {output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Search Index Benchmark
+
+Replays sample queries against the catalog twice: once with the linear
+substring filter /api/search used per request (family, category and variant
+substrings over every item), and once through the inverted index built by
+build_search_index.py. Reports the mean time per query and the number of
+matches for each, plus the index load time.
+
+The two do not match identically: the index matches word prefixes, the
+linear filter any substring ("ans" finds "Open Sans" only linearly).
+
+Usage:
+    python bench_search_index.py [--queries queries.txt] [--repeat 200] [--output report.csv]
+"""
+
+import csv
+import json
+import os
+import sys
+import time
+from typing import Dict, List
+
+import click
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from build_search_index import SearchIndex, build_index  # noqa: E402
+
+SAMPLE_QUERIES = [
+    'roboto', 'open sans', 'opensans', 'noto sans jp', 'mono', 'serif', 'sans-serif',
+    'display', 'italic', '700', 'inter', 'playfair', 'zz', 'a', 'noto', 'source code',
+]
+
+
+def linear_filter(items: List[Dict], query: str) -> List[int]:
+    """The per-request filter of filterFonts() in www/lib/fonts-utils.ts."""
+    term = query.lower()
+    return [
+        doc for doc, item in enumerate(items)
+        if term in item['family'].lower()
+        or term in item.get('category', '').lower()
+        or any(term in variant.lower() for variant in item.get('variants', []))
+    ]
+
+
+def mean_seconds(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+@click.command()
+@click.option('--webfonts-vf', default='./www/public/webfonts-vf.json', type=click.Path(exists=True),
+              help='Path to webfonts-vf.json (default: ./www/public/webfonts-vf.json)')
+@click.option('--index', 'index_path', default='./www/public/search-index.json',
+              help='Search index; built in memory if the file does not exist')
+@click.option('--queries', type=click.Path(exists=True), help='File with one query per line (default: built-in samples)')
+@click.option('--repeat', default=200, help='Runs per query (default: 200)')
+@click.option('--output', help='Save per-query results to CSV')
+def main(webfonts_vf, index_path, queries, repeat, output):
+    """Compare linear search with the inverted index on sample queries."""
+    with open(webfonts_vf, 'r') as f:
+        items = json.load(f).get('items', [])
+
+    start = time.perf_counter()
+    if os.path.exists(index_path):
+        with open(index_path, 'r') as f:
+            data = json.load(f)
+        source = index_path
+    else:
+        data = build_index(items)
+        source = 'built in memory'
+    load_ms = (time.perf_counter() - start) * 1000
+    if data['families'] != [item['family'] for item in items]:
+        print(f"Error: {index_path} was built from a different catalog; rebuild it with build_search_index.py")
+        sys.exit(1)
+
+    if queries:
+        with open(queries, 'r') as f:
+            sample = [line.strip() for line in f if line.strip()]
+    else:
+        sample = SAMPLE_QUERIES
+
+    rows = []
+    for query in sample:
+        # A fresh reader per query, so decoded postings are not carried over between queries
+        index = SearchIndex(data)
+        indexed = index.search(query) or []
+        rows.append({
+            'query': query,
+            'linear_matches': len(linear_filter(items, query)),
+            'index_matches': len(indexed),
+            'linear_us': mean_seconds(lambda: linear_filter(items, query), repeat) * 1e6,
+            'index_us': mean_seconds(lambda: SearchIndex(data).search(query), repeat) * 1e6,
+        })
+
+    print(f"{len(items)} families, index {source} (loaded in {load_ms:.1f} ms), {repeat} runs per query\n")
+    print(f"{'Query':<16} {'Linear':>8} {'Index':>8} {'Linear us':>10} {'Index us':>10} {'Speedup':>8}")
+    print('-' * 66)
+    for row in rows:
+        speedup = row['linear_us'] / row['index_us'] if row['index_us'] else float('inf')
+        print(f"{row['query'][:16]:<16} {row['linear_matches']:>8} {row['index_matches']:>8} "
+              f"{row['linear_us']:>10.1f} {row['index_us']:>10.1f} {speedup:>7.1f}x")
+    linear_total = sum(row['linear_us'] for row in rows)
+    index_total = sum(row['index_us'] for row in rows)
+    print('-' * 66)
+    print(f"{'Total':<34} {linear_total:>10.1f} {index_total:>10.1f} {linear_total / index_total:>7.1f}x")
+
+    if output:
+        with open(output, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+            writer.writeheader()
+            writer.writerows(rows)
+        print(f"\nResults saved to: {output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Artifact Manifest
+
+Writes www/public/artifacts.json, mapping every generated artifact to the
+SHA-256 and byte size of its contents:
+
+    {
+      "version": 1,
+      "artifacts": {
+        "www/public/webfonts.json": {
+          "sha256": "...", "size": 1860412,
+          "url": "/artifacts/webfonts.3f2a9c1b7d4e.json"
+        },
+        "broken.lock.json": {"sha256": "...", "size": 51230},
+        ...
+      }
+    }
+
+Artifacts under www/public also get `url`, a hashed alias served by
+www/app/artifacts/[...path]/route.ts with a long-lived immutable
+Cache-Control header: the route only answers while the file still has that
+hash, so a cached alias never goes stale, and a changed file gets a new URL.
+
+The manifest depends only on file contents (no timestamps, sorted keys), so
+unchanged artifacts keep their hashes, and an unchanged tree rewrites a
+byte-identical manifest.
+
+Usage:
+    python build_artifact_manifest.py [--output ./www/public/artifacts.json]
+"""
+
+import glob
+import hashlib
+import json
+import os
+from typing import Dict, List, Optional
+
+import click
+
+from run_ledger import ledger_stage
+
+MANIFEST_VERSION = 1
+PUBLIC_DIR = 'www/public'
+ALIAS_PREFIX = '/artifacts'
+ALIAS_HASH_LENGTH = 12
+# Generated artifacts, relative to the repository root
+ARTIFACTS = [
+    'www/public/webfonts.json',
+    'www/public/webfonts-vf.json',
+    'www/public/webfonts.metadata.json',
+    'www/public/webfonts.bin',
+    'www/public/family-ids.json',
+    'www/public/sort-orders.json',
+    'www/public/search-index.json',
+    'www/public/facet-index.json',
+    'www/public/svg/*.svg',
+    'www/public/svg.manifest.json',
+    'www/public/families/*.json',
+    'www/public/preview-fonts/*',
+    'www/app/api/popular/stats.json',
+    'broken.lock.json',
+    'sdks/google-fonts-js/google-fonts-latest.columnar.json',
+]
+
+
+def file_sha256(path: str) -> str:
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            sha.update(block)
+    return sha.hexdigest()
+
+
+def hashed_alias(artifact: str, sha256: str) -> Optional[str]:
+    """The immutable URL of a www/public file ("svg/abel.svg" -> "/artifacts/svg/abel.<hash>.svg")."""
+    relative = os.path.relpath(artifact, PUBLIC_DIR)
+    if relative.startswith('..'):
+        return None
+    stem, extension = os.path.splitext(relative.replace(os.sep, '/'))
+    return f"{ALIAS_PREFIX}/{stem}.{sha256[:ALIAS_HASH_LENGTH]}{extension}"
+
+
+def collect_artifacts(root: str, patterns: List[str]) -> List[str]:
+    paths = set()
+    for pattern in patterns:
+        for path in glob.glob(os.path.join(root, pattern)):
+            if os.path.isfile(path):
+                paths.add(os.path.relpath(path, root).replace(os.sep, '/'))
+    return sorted(paths)
+
+
+def build_manifest(root: str, patterns: List[str] = ARTIFACTS) -> Dict:
+    artifacts = {}
+    for artifact in collect_artifacts(root, patterns):
+        path = os.path.join(root, artifact)
+        sha256 = file_sha256(path)
+        entry = {'sha256': sha256, 'size': os.path.getsize(path)}
+        alias = hashed_alias(artifact, sha256)
+        if alias:
+            entry['url'] = alias
+        artifacts[artifact] = entry
+    return {'version': MANIFEST_VERSION, 'artifacts': artifacts}
+
+
+def load_manifest(path: str) -> Optional[Dict]:
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+@click.command()
+@click.option('--root', default='.', type=click.Path(exists=True, file_okay=False),
+              help='Repository root (default: .)')
+@click.option('--output', default='./www/public/artifacts.json',
+              help='Output file (default: ./www/public/artifacts.json)')
+def main(root, output):
+    """Write the content-hash manifest of the generated artifacts."""
+    with ledger_stage('build_artifact_manifest') as record:
+        previous = (load_manifest(output) or {}).get('artifacts', {})
+        manifest = build_manifest(root)
+        record.add(items=len(manifest['artifacts']))
+
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, separators=(',', ':'), sort_keys=True)
+            f.write('\n')
+
+    artifacts = manifest['artifacts']
+    changed = [a for a, entry in artifacts.items() if previous.get(a, {}).get('sha256') != entry['sha256']]
+    removed = [a for a in previous if a not in artifacts]
+    missing = [p for p in ARTIFACTS if '*' not in p and p not in artifacts]
+    print(f"Artifact manifest: {len(artifacts)} artifacts, "
+          f"{sum(entry['size'] for entry in artifacts.values()) / 1024 / 1024:.1f} MB")
+    print(f"  changed: {len(changed)}, unchanged: {len(artifacts) - len(changed)}, removed: {len(removed)}")
+    for artifact in changed[:10]:
+        print(f"    {artifact}")
+    if len(changed) > 10:
+        print(f"    ... and {len(changed) - 10} more")
+    for artifact in missing:
+        print(f"  missing: {artifact}")
+    print(f"Written to {output}")
+
+
+if __name__ == '__main__':
+    main()
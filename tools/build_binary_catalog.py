@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+Binary Catalog
+
+Writes the catalog as a fixed-layout binary file (www/public/webfonts.bin)
+that native consumers can memory-map and query by family id without
+parsing anything. BinaryCatalog is the reference reader.
+
+Layout (little-endian; every section 8-byte aligned; offsets are from the
+start of the file, string offsets from the start of the string pool):
+
+    header   64 bytes   magic "WFBC", format version (u16), header size
+                        (u16), item count, record size, then the offsets
+                        of the sections below and the string pool size (u32)
+    records  count * 64 bytes, in catalog order:
+               family, id, version, menu   string refs (u32 offset, u32 length;
+                                           length 0: absent)
+               last_modified   u32  days since 1970-01-01
+               category, kind  u16  table indexes
+               subsets         u32 start, u16 count   into the u16 lists
+               color           u16  bitmask over the color capabilities table
+               files           u32 start, u16 count   into the file entries
+               axes            u16 count, u32 start   into the axis entries
+               reserved        u32
+    index    count * u32   record numbers sorted by id (bytewise), for
+                           binary search
+    tables   5 * (u32 start, u32 count) directory, then string refs: the
+             subsets, variants, categories, kinds and color capabilities
+    lists    u16 table indexes (subsets)
+    files    12 bytes each: variant (u16), pad (u16), URL string ref
+             (length 0: the variant has no file); one per variant, in order
+    axes     24 bytes each: tag (4 bytes), pad (u32), start (f64), end (f64)
+    strings  UTF-8 string pool, each distinct string stored once
+
+Ids are the URL ids of family_id.family_to_id ("Open Sans" -> "open-sans").
+A new format version is required for any layout change; readers must
+check the magic and version.
+
+Usage:
+    python build_binary_catalog.py [--webfonts ./www/public/webfonts.json]
+"""
+
+import datetime
+import json
+import mmap
+import os
+import struct
+from collections import Counter
+from typing import Dict, List, Optional
+
+import click
+
+from family_id import family_to_id
+from run_ledger import ledger_stage
+
+MAGIC = b'WFBC'
+FORMAT_VERSION = 1
+EPOCH = datetime.date(1970, 1, 1)
+ITEM_FIELDS = {'family', 'variants', 'subsets', 'version', 'lastModified', 'files', 'category', 'kind', 'menu',
+               'colorCapabilities', 'axes'}
+TABLES = ('subsets', 'variants', 'categories', 'kinds', 'color_capabilities')
+
+HEADER = struct.Struct('<4sHHIIIIIIIIII')
+HEADER_SIZE = 64
+RECORD = struct.Struct('<IIIIIIIIIHHIHHIHHII')
+STR_REF = struct.Struct('<II')
+TABLE_DIR = struct.Struct('<II')
+FILE_ENTRY = struct.Struct('<HHII')
+AXIS_ENTRY = struct.Struct('<4sIdd')
+U16 = struct.Struct('<H')
+U32 = struct.Struct('<I')
+
+
+def align(size: int) -> int:
+    return (size + 7) & ~7
+
+
+class StringPool:
+    def __init__(self):
+        self.data = bytearray()
+        self.offsets: Dict[str, int] = {}
+
+    def ref(self, value: Optional[str]):
+        if not value:
+            return 0, 0
+        if value not in self.offsets:
+            self.offsets[value] = len(self.data)
+            self.data += value.encode('utf-8')
+        return self.offsets[value], len(value.encode('utf-8'))
+
+
+def string_table(values) -> List[str]:
+    counts = Counter(values)
+    return sorted(counts, key=lambda value: (-counts[value], value))
+
+
+def encode_catalog(items: List[Dict]) -> bytes:
+    for item in items:
+        unknown = set(item) - ITEM_FIELDS
+        if unknown:
+            raise ValueError(f"{item['family']}: fields the format does not encode {sorted(unknown)}")
+        extra = set(item.get('files', {})) - set(item.get('variants', []))
+        if extra:
+            raise ValueError(f"{item['family']}: files for unlisted variants {sorted(extra)}")
+    ids = [family_to_id(item['family']) for item in items]
+    duplicates = [i for i, count in Counter(ids).items() if count > 1]
+    if duplicates:
+        raise ValueError(f"Duplicate family ids: {duplicates}")
+
+    tables = {
+        'subsets': string_table(s for item in items for s in item.get('subsets', [])),
+        'variants': string_table(v for item in items for v in item.get('variants', [])),
+        'categories': string_table(item['category'] for item in items),
+        'kinds': string_table(item['kind'] for item in items),
+        'color_capabilities': string_table(c for item in items for c in item.get('colorCapabilities', [])),
+    }
+    if len(tables['color_capabilities']) > 16:
+        raise ValueError('More than 16 color capabilities do not fit the record bitmask')
+    index = {name: {value: i for i, value in enumerate(table)} for name, table in tables.items()}
+
+    pool = StringPool()
+    records = bytearray()
+    lists = bytearray()
+    files = bytearray()
+    axes = bytearray()
+    for item, family_id in zip(items, ids):
+        color = 0
+        for capability in item.get('colorCapabilities', []):
+            color |= 1 << index['color_capabilities'][capability]
+        item_axes = item.get('axes') or []
+        records += RECORD.pack(
+            *pool.ref(item['family']), *pool.ref(family_id), *pool.ref(item['version']),
+            *pool.ref(item.get('menu')),
+            (datetime.date.fromisoformat(item['lastModified']) - EPOCH).days,
+            index['categories'][item['category']], index['kinds'][item['kind']],
+            len(lists) // U16.size, len(item.get('subsets', [])), color,
+            len(files) // FILE_ENTRY.size, len(item.get('variants', [])), len(item_axes),
+            len(axes) // AXIS_ENTRY.size, 0,
+        )
+        for subset in item.get('subsets', []):
+            lists += U16.pack(index['subsets'][subset])
+        for variant in item.get('variants', []):
+            files += FILE_ENTRY.pack(index['variants'][variant], 0, *pool.ref(item.get('files', {}).get(variant)))
+        for axis in item_axes:
+            axes += AXIS_ENTRY.pack(axis['tag'].encode('ascii'), 0, axis['start'], axis['end'])
+
+    order = sorted(range(len(items)), key=lambda i: ids[i].encode('utf-8'))
+    id_index = b''.join(U32.pack(i) for i in order)
+
+    table_bytes = bytearray()
+    start = 0
+    for name in TABLES:
+        table_bytes += TABLE_DIR.pack(start, len(tables[name]))
+        start += len(tables[name])
+    for name in TABLES:
+        for value in tables[name]:
+            table_bytes += STR_REF.pack(*pool.ref(value))
+
+    sections = [records, id_index, table_bytes, lists, files, axes, pool.data]
+    offsets = []
+    position = HEADER_SIZE
+    for section in sections:
+        offsets.append(position)
+        position = align(position + len(section))
+
+    out = bytearray(HEADER.pack(MAGIC, FORMAT_VERSION, HEADER_SIZE, len(items), RECORD.size, *offsets,
+                                len(pool.data)))
+    out += bytes(HEADER_SIZE - len(out))
+    for offset, section in zip(offsets, sections):
+        out += bytes(offset - len(out))
+        out += section
+    return bytes(out)
+
+
+class BinaryCatalog:
+    """Reference reader: memory-maps the file and decodes records on demand."""
+
+    def __init__(self, path: str):
+        with open(path, 'rb') as f:
+            self.buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, _, self.count, record_size, self.records, self.index, self.tables, self.lists,
+         self.files, self.axes, self.strings, _) = HEADER.unpack_from(self.buffer, 0)
+        if magic != MAGIC or version != FORMAT_VERSION or record_size != RECORD.size:
+            self.close()
+            raise ValueError(f"{path}: not a version {FORMAT_VERSION} binary catalog")
+        self._tables: Optional[Dict[str, List[str]]] = None
+
+    def close(self):
+        self.buffer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def string(self, offset: int, length: int) -> Optional[str]:
+        if not length:
+            return None
+        start = self.strings + offset
+        return self.buffer[start:start + length].decode('utf-8')
+
+    def record(self, position: int):
+        return RECORD.unpack_from(self.buffer, self.records + position * RECORD.size)
+
+    def _id_bytes(self, position: int) -> bytes:
+        offset, length = STR_REF.unpack_from(self.buffer, self.records + position * RECORD.size + 8)
+        start = self.strings + offset
+        return self.buffer[start:start + length]
+
+    def find(self, family_or_id: str) -> Optional[int]:
+        """Catalog position of a family (by name or id), by binary search over the id index."""
+        target = family_to_id(family_or_id).encode('utf-8')
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            position = U32.unpack_from(self.buffer, self.index + mid * 4)[0]
+            if self._id_bytes(position) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.count:
+            position = U32.unpack_from(self.buffer, self.index + lo * 4)[0]
+            if self._id_bytes(position) == target:
+                return position
+        return None
+
+    def table(self, name: str) -> List[str]:
+        if self._tables is None:
+            refs = self.tables + TABLE_DIR.size * len(TABLES)
+            self._tables = {}
+            for i, table in enumerate(TABLES):
+                start, count = TABLE_DIR.unpack_from(self.buffer, self.tables + i * TABLE_DIR.size)
+                self._tables[table] = [
+                    self.string(*STR_REF.unpack_from(self.buffer, refs + (start + j) * STR_REF.size))
+                    for j in range(count)
+                ]
+        return self._tables[name]
+
+    def item(self, position: int) -> Dict:
+        """The webfonts.json item at a catalog position."""
+        (family_offset, family_length, _, _, version_offset, version_length, menu_offset, menu_length, days,
+         category, kind, subsets_start, subsets_count, color, files_start, files_count, axes_count,
+         axes_start, _) = self.record(position)
+        variants = self.table('variants')
+        item = {
+            'family': self.string(family_offset, family_length),
+            'variants': [],
+            'subsets': [
+                self.table('subsets')[U16.unpack_from(self.buffer, self.lists + (subsets_start + i) * U16.size)[0]]
+                for i in range(subsets_count)
+            ],
+            'version': self.string(version_offset, version_length),
+            'lastModified': (EPOCH + datetime.timedelta(days=days)).isoformat(),
+            'files': {},
+            'category': self.table('categories')[category],
+            'kind': self.table('kinds')[kind],
+        }
+        for i in range(files_count):
+            variant, _, offset, length = FILE_ENTRY.unpack_from(
+                self.buffer, self.files + (files_start + i) * FILE_ENTRY.size)
+            item['variants'].append(variants[variant])
+            if length:
+                item['files'][variants[variant]] = self.string(offset, length)
+        if menu_length:
+            item['menu'] = self.string(menu_offset, menu_length)
+        if color:
+            capabilities = self.table('color_capabilities')
+            item['colorCapabilities'] = [c for bit, c in enumerate(capabilities) if color >> bit & 1]
+        if axes_count:
+            item['axes'] = []
+            for i in range(axes_count):
+                tag, _, start, end = AXIS_ENTRY.unpack_from(self.buffer, self.axes + (axes_start + i) * AXIS_ENTRY.size)
+                item['axes'].append({'tag': tag.decode('ascii'), 'start': start, 'end': end})
+        return item
+
+    def lookup(self, family_or_id: str) -> Optional[Dict]:
+        position = self.find(family_or_id)
+        return None if position is None else self.item(position)
+
+
+@click.command()
+@click.option('--webfonts', default='./www/public/webfonts.json', type=click.Path(exists=True),
+              help='Path to webfonts.json or webfonts-vf.json (default: ./www/public/webfonts.json)')
+@click.option('--output', default='./www/public/webfonts.bin', help='Output file (default: ./www/public/webfonts.bin)')
+def main(webfonts, output):
+    """Build the memory-mappable binary catalog."""
+    with ledger_stage('build_binary_catalog') as record:
+        with open(webfonts, 'r') as f:
+            items = json.load(f).get('items', [])
+        try:
+            data = encode_catalog(items)
+        except ValueError as e:
+            raise click.ClickException(str(e))
+        record.add(items=len(items))
+
+        staging = output + '.tmp'
+        with open(staging, 'wb') as f:
+            f.write(data)
+        with BinaryCatalog(staging) as catalog:
+            decoded = [catalog.item(i) for i in range(len(catalog))]
+        if decoded != items:
+            os.remove(staging)
+            raise click.ClickException(f"Binary catalog does not decode to {webfonts}; not written")
+        os.replace(staging, output)
+
+    print(f"Binary catalog: {len(items)} families, {len(data) / 1024:.1f} KB "
+          f"({os.path.getsize(webfonts) / 1024:.1f} KB JSON)")
+    print(f"Written to {output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Columnar Catalog
+
+Encodes webfonts.json into the dictionary-encoded, columnar catalog shipped
+with the google-fonts-js SDK (sdks/google-fonts-js/google-fonts-latest.columnar.json):
+
+    {
+      "format": "webfonts-columnar",
+      "version": 1,
+      "kind": "webfonts#webfontList",
+      "url_prefix": "https://fonts.gstatic.com/s/",
+      "tables": {
+        "subsets": ["latin", ...],     # most frequent first
+        "variants": ["regular", ...],
+        "categories": [...], "kinds": [...], "versions": ["v23", ...],
+        "extensions": ["ttf", "otf"], "color_capabilities": [...]
+      },
+      "columns": {
+        "family": ["ABeeZee", ...],
+        "category": [0, ...],          # index into tables.categories
+        "kind": [...], "version": [...], "extension": [...],
+        "last_modified": [20339, ...], # days since 1970-01-01
+        "dir": [null, ...],            # gstatic directory; null when it is the default
+        "subsets": [[0, 1], ...],
+        "variants": [[0, 2], ...],
+        "files": [["esDR31x...", ...]],# per variant; null when the variant has no file
+        "menu": ["esDR31x...", ...],
+        "color_capabilities": {"102": [0, 1], ...}  # sparse, by item position
+      }
+    }
+
+A file URL is url_prefix + dir + "/" + version + "/" + name + "." + extension,
+where the default dir is the family lower-cased with spaces removed. Any
+URL that does not fit that pattern is stored whole (names never contain
+"/"), so every catalog round-trips exactly; decode_catalog() is the
+reference decoder (the SDK's is sdks/google-fonts-js/columnar.ts).
+
+Usage:
+    python build_columnar_catalog.py [--webfonts ./www/public/webfonts.json]
+"""
+
+import datetime
+import gzip
+import json
+import os
+from collections import Counter
+from typing import Dict, List, Optional
+
+import click
+
+from run_ledger import ledger_stage
+
+FORMAT = 'webfonts-columnar'
+FORMAT_VERSION = 1
+URL_PREFIX = 'https://fonts.gstatic.com/s/'
+EPOCH = datetime.date(1970, 1, 1)
+ITEM_FIELDS = {'family', 'variants', 'subsets', 'version', 'lastModified', 'files', 'category', 'kind', 'menu',
+               'colorCapabilities'}
+
+
+def default_dir(family: str) -> str:
+    return family.lower().replace(' ', '')
+
+
+def string_table(values) -> List[str]:
+    """Distinct values, most frequent first (smaller indexes for common values)."""
+    counts = Counter(values)
+    return sorted(counts, key=lambda value: (-counts[value], value))
+
+
+def encode_date(value: str) -> int:
+    return (datetime.date.fromisoformat(value) - EPOCH).days
+
+
+def decode_date(days: int) -> str:
+    return (EPOCH + datetime.timedelta(days=days)).isoformat()
+
+
+def file_name(url: Optional[str], path: str, extension: str) -> Optional[str]:
+    """The part of a URL after the item's path, or the whole URL if it has another form."""
+    if url is None:
+        return None
+    suffix = '.' + extension
+    if url.startswith(path) and url.endswith(suffix) and '/' not in url[len(path):]:
+        return url[len(path):-len(suffix)]
+    return url
+
+
+def file_url(name: Optional[str], path: str, extension: str) -> Optional[str]:
+    if name is None or '/' in name:
+        return name
+    return f"{path}{name}.{extension}"
+
+
+def item_path(url_prefix: str, directory: str, version: str) -> str:
+    return f"{url_prefix}{directory}/{version}/"
+
+
+def item_extension(item: Dict) -> str:
+    urls = list(item.get('files', {}).values()) + ([item['menu']] if item.get('menu') else [])
+    counts = Counter(os.path.splitext(url)[1].lstrip('.') for url in urls)
+    return counts.most_common(1)[0][0] if counts else 'ttf'
+
+
+def item_dir(item: Dict, url_prefix: str) -> str:
+    """The gstatic directory most of the item's URLs use."""
+    urls = list(item.get('files', {}).values()) + ([item['menu']] if item.get('menu') else [])
+    counts = Counter(url[len(url_prefix):].split('/', 1)[0] for url in urls if url.startswith(url_prefix))
+    return counts.most_common(1)[0][0] if counts else default_dir(item['family'])
+
+
+def encode_catalog(catalog: Dict, url_prefix: str = URL_PREFIX) -> Dict:
+    items = catalog.get('items', [])
+    for item in items:
+        unknown = set(item) - ITEM_FIELDS
+        if unknown:
+            raise ValueError(f"{item['family']}: fields the format does not encode {sorted(unknown)}")
+        extra = set(item.get('files', {})) - set(item.get('variants', []))
+        if extra:
+            raise ValueError(f"{item['family']}: files for unlisted variants {sorted(extra)}")
+
+    tables = {
+        'subsets': string_table(s for item in items for s in item.get('subsets', [])),
+        'variants': string_table(v for item in items for v in item.get('variants', [])),
+        'categories': string_table(item['category'] for item in items),
+        'kinds': string_table(item['kind'] for item in items),
+        'versions': string_table(item['version'] for item in items),
+        'extensions': string_table(item_extension(item) for item in items),
+        'color_capabilities': string_table(
+            c for item in items for c in item.get('colorCapabilities', [])),
+    }
+    index = {name: {value: i for i, value in enumerate(table)} for name, table in tables.items()}
+
+    columns: Dict = {name: [] for name in (
+        'family', 'category', 'kind', 'version', 'extension', 'last_modified', 'dir',
+        'subsets', 'variants', 'files', 'menu')}
+    columns['color_capabilities'] = {}
+    for position, item in enumerate(items):
+        extension = item_extension(item)
+        directory = item_dir(item, url_prefix)
+        path = item_path(url_prefix, directory, item['version'])
+        files = item.get('files', {})
+
+        columns['family'].append(item['family'])
+        columns['category'].append(index['categories'][item['category']])
+        columns['kind'].append(index['kinds'][item['kind']])
+        columns['version'].append(index['versions'][item['version']])
+        columns['extension'].append(index['extensions'][extension])
+        columns['last_modified'].append(encode_date(item['lastModified']))
+        columns['dir'].append(None if directory == default_dir(item['family']) else directory)
+        columns['subsets'].append([index['subsets'][s] for s in item.get('subsets', [])])
+        columns['variants'].append([index['variants'][v] for v in item.get('variants', [])])
+        columns['files'].append([file_name(files.get(v), path, extension) for v in item.get('variants', [])])
+        columns['menu'].append(file_name(item.get('menu'), path, extension))
+        if 'colorCapabilities' in item:
+            columns['color_capabilities'][str(position)] = [
+                index['color_capabilities'][c] for c in item['colorCapabilities']]
+
+    return {
+        'format': FORMAT,
+        'version': FORMAT_VERSION,
+        'kind': catalog.get('kind'),
+        'url_prefix': url_prefix,
+        'tables': tables,
+        'columns': columns,
+    }
+
+
+def decode_catalog(data: Dict) -> Dict:
+    """Reference decoder: rebuilds the webfonts.json catalog."""
+    if data.get('format') != FORMAT or data.get('version') != FORMAT_VERSION:
+        raise ValueError(f"Unsupported catalog format: {data.get('format')} v{data.get('version')}")
+    tables, columns = data['tables'], data['columns']
+    items = []
+    for position, family in enumerate(columns['family']):
+        version = tables['versions'][columns['version'][position]]
+        extension = tables['extensions'][columns['extension'][position]]
+        directory = columns['dir'][position]
+        if directory is None:
+            directory = default_dir(family)
+        path = item_path(data['url_prefix'], directory, version)
+        variants = [tables['variants'][v] for v in columns['variants'][position]]
+
+        item = {
+            'family': family,
+            'variants': variants,
+            'subsets': [tables['subsets'][s] for s in columns['subsets'][position]],
+            'version': version,
+            'lastModified': decode_date(columns['last_modified'][position]),
+            'files': {
+                variant: file_url(name, path, extension)
+                for variant, name in zip(variants, columns['files'][position]) if name is not None
+            },
+            'category': tables['categories'][columns['category'][position]],
+            'kind': tables['kinds'][columns['kind'][position]],
+        }
+        menu = file_url(columns['menu'][position], path, extension)
+        if menu is not None:
+            item['menu'] = menu
+        capabilities = columns['color_capabilities'].get(str(position))
+        if capabilities is not None:
+            item['colorCapabilities'] = [tables['color_capabilities'][c] for c in capabilities]
+        items.append(item)
+    return {'kind': data['kind'], 'items': items}
+
+
+def size_row(label: str, raw: bytes) -> Dict:
+    return {'label': label, 'raw': len(raw), 'gzip': len(gzip.compress(raw, 9))}
+
+
+@click.command()
+@click.option('--webfonts', default='./www/public/webfonts.json', type=click.Path(exists=True),
+              help='Path to webfonts.json (default: ./www/public/webfonts.json)')
+@click.option('--output', default='./sdks/google-fonts-js/google-fonts-latest.columnar.json',
+              help='Output file (default: ./sdks/google-fonts-js/google-fonts-latest.columnar.json)')
+def main(webfonts, output):
+    """Build the columnar catalog for the google-fonts-js SDK."""
+    with ledger_stage('build_columnar_catalog') as record:
+        with open(webfonts, 'r') as f:
+            catalog = json.load(f)
+        try:
+            encoded = encode_catalog(catalog)
+        except ValueError as e:
+            raise click.ClickException(str(e))
+        if decode_catalog(encoded)['items'] != catalog.get('items', []):
+            raise click.ClickException('Columnar catalog does not round-trip; not written')
+        record.add(items=len(catalog.get('items', [])))
+
+        body = json.dumps(encoded, separators=(',', ':'), ensure_ascii=False).encode('utf-8') + b'\n'
+        with open(output, 'wb') as f:
+            f.write(body)
+
+    with open(webfonts, 'rb') as f:
+        source = f.read()
+    rows = [
+        size_row(os.path.basename(webfonts), source),
+        size_row(f"{os.path.basename(webfonts)} (minified)", json.dumps(
+            catalog, separators=(',', ':'), ensure_ascii=False).encode('utf-8')),
+        size_row(os.path.basename(output), body),
+    ]
+    print(f"Columnar catalog: {len(encoded['columns']['family'])} families, "
+          f"{len(encoded['tables']['subsets'])} subsets, {len(encoded['tables']['variants'])} variants")
+    print(f"\n{'File':<44} {'Raw':>10} {'Gzip':>10}")
+    print('-' * 66)
+    for row in rows:
+        print(f"{row['label']:<44} {row['raw'] / 1024:>8.1f}KB {row['gzip'] / 1024:>8.1f}KB")
+    print(f"\nWritten to {output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Facet Index
+
+Builds the bitmaps behind the category, subset, property, axis and license
+filters of /api/search (www/lib/facet-index.ts), written to
+www/public/facet-index.json:
+
+    {
+      "version": 1,
+      "families": [...],      # doc id -> family (webfonts-vf.json item order)
+      "facets": {
+        "category": {"serif": {"bits": "<base64>"}, ...},
+        "subset":   {"latin": {"bits": "..."}, "adlam": {"ids": [12, 940]}, ...},
+        "property": {"variable": ..., "static": ...},
+        "axis":     {"wght": ..., ...},
+        "license":  {"ofl": ..., "apache": ..., "ufl": ...}
+      }
+    }
+
+Each bitmap is stored in whichever form is smaller: a base64 bitset (bit i
+of byte i >> 3 set for doc i, least significant bit first) or, for sparse
+values, the sorted doc ids. A multi-facet filter is the intersection of one
+bitmap per facet.
+
+Everything comes from one pass over the catalog: category, subsets and axes
+from webfonts-vf.json (subsets unioned with webfonts.json), and the license
+from the vendor/google directory holding the family's METADATA.pb.
+
+Usage:
+    python build_facet_index.py [--fonts-dir ./vendor/google]
+"""
+
+import base64
+import json
+import os
+from typing import Dict, List, Optional, Set
+
+import click
+
+from family_id import normalize_family_name
+from run_ledger import ledger_stage
+
+INDEX_VERSION = 1
+LICENSE_DIRS = ['ofl', 'apache', 'ufl']
+
+
+def encode_bitmap(doc_ids: List[int], size: int) -> Dict:
+    """The smaller of a base64 bitset and the sorted id list."""
+    bits = bytearray((size + 7) // 8)
+    for doc_id in doc_ids:
+        bits[doc_id >> 3] |= 1 << (doc_id & 7)
+    bitset = {'bits': base64.b64encode(bytes(bits)).decode('ascii')}
+    ids = {'ids': sorted(doc_ids)}
+    return ids if len(json.dumps(ids)) < len(json.dumps(bitset)) else bitset
+
+
+def decode_bitmap(entry: Dict, size: int) -> Set[int]:
+    if 'ids' in entry:
+        return set(entry['ids'])
+    bits = base64.b64decode(entry['bits'])
+    return {doc_id for doc_id in range(size) if bits[doc_id >> 3] >> (doc_id & 7) & 1}
+
+
+def find_license(family: str, fonts_dir: str) -> Optional[str]:
+    folder = normalize_family_name(family)
+    for license_dir in LICENSE_DIRS:
+        if os.path.exists(os.path.join(fonts_dir, license_dir, folder, 'METADATA.pb')):
+            return license_dir
+    return None
+
+
+def build_facets(vf_items: List[Dict], static_items: List[Dict], fonts_dir: str) -> Dict:
+    static_subsets = {item['family']: item.get('subsets', []) for item in static_items}
+    values: Dict[str, Dict[str, List[int]]] = {
+        facet: {} for facet in ('category', 'subset', 'property', 'axis', 'license')
+    }
+
+    for doc_id, item in enumerate(vf_items):
+        family = item['family']
+        axes = item.get('axes') or []
+        facets = {
+            'category': [item.get('category', '').lower()],
+            'subset': sorted(set(item.get('subsets', [])) | set(static_subsets.get(family, []))),
+            'property': ['variable' if axes else 'static'],
+            'axis': sorted({axis['tag'] for axis in axes}),
+            'license': [find_license(family, fonts_dir)],
+        }
+        for facet, facet_values in facets.items():
+            for value in facet_values:
+                if value:
+                    values[facet].setdefault(value, []).append(doc_id)
+
+    size = len(vf_items)
+    return {
+        facet: {value: encode_bitmap(doc_ids, size) for value, doc_ids in sorted(by_value.items())}
+        for facet, by_value in values.items()
+    }
+
+
+@click.command()
+@click.option('--webfonts', default='./www/public/webfonts.json', type=click.Path(exists=True),
+              help='Path to webfonts.json (default: ./www/public/webfonts.json)')
+@click.option('--webfonts-vf', default='./www/public/webfonts-vf.json', type=click.Path(exists=True),
+              help='Path to webfonts-vf.json (default: ./www/public/webfonts-vf.json)')
+@click.option('--fonts-dir', default='./vendor/google', help='Font directory for licenses (default: ./vendor/google)')
+@click.option('--output', default='./www/public/facet-index.json',
+              help='Output file (default: ./www/public/facet-index.json)')
+def main(webfonts, webfonts_vf, fonts_dir, output):
+    """Build the facet bitmaps for the search filters."""
+    with ledger_stage('build_facet_index') as record:
+        with open(webfonts, 'r') as f:
+            static_items = json.load(f).get('items', [])
+        with open(webfonts_vf, 'r') as f:
+            vf_items = json.load(f).get('items', [])
+        facets = build_facets(vf_items, static_items, fonts_dir)
+        record.add(items=len(vf_items))
+
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump({
+                'version': INDEX_VERSION,
+                'families': [item['family'] for item in vf_items],
+                'facets': facets,
+            }, f, separators=(',', ':'), ensure_ascii=False)
+            f.write('\n')
+
+    print(f"Facet index for {len(vf_items)} families:")
+    for facet, bitmaps in facets.items():
+        print(f"  {facet:<9} {len(bitmaps)} values")
+    if not facets['license']:
+        print(f"  (no licenses: {fonts_dir} has no family directories)")
+    print(f"Written to {output} ({os.path.getsize(output) / 1024:.1f} KB)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Family Id Index
+
+Builds the id -> family index used by the www font route
+(www/app/api/fonts/[id]/route.ts). Every family in webfonts.json and
+webfonts-vf.json is keyed by its URL id ("open-sans"), with its folder id
+("opensans") as an alias, and records the family's position in each catalog
+so the route can look it up directly instead of scanning the items.
+
+Fails (exit 1, nothing written) when two different families collapse to the
+same id, since one of them would silently become unreachable.
+
+Usage:
+    python build_family_ids.py [--webfonts ./webfonts.json] [--webfonts-vf ./webfonts-vf.json]
+"""
+
+import json
+import sys
+from typing import Dict, List
+
+import click
+
+from family_id import family_to_id, normalize_family_name
+from run_ledger import ledger_stage
+
+INDEX_VERSION = 1
+
+
+def find_collisions(families) -> Dict[str, List[str]]:
+    """Ids (URL or folder form) claimed by more than one family."""
+    claims: Dict[str, set] = {}
+    for family in families:
+        for key in (family_to_id(family), normalize_family_name(family)):
+            claims.setdefault(key, set()).add(family)
+    return {key: sorted(claimed) for key, claimed in claims.items() if len(claimed) > 1}
+
+
+def build_index(static_items: List[Dict], vf_items: List[Dict]) -> Dict:
+    """URL id -> {family, static, vf} positions, plus folder id -> URL id aliases."""
+    ids: Dict[str, Dict] = {}
+    for key, items in (('static', static_items), ('vf', vf_items)):
+        for position, item in enumerate(items):
+            ids.setdefault(family_to_id(item['family']), {'family': item['family']})[key] = position
+
+    aliases = {}
+    for url_id, entry in ids.items():
+        folder_id = normalize_family_name(entry['family'])
+        if folder_id != url_id:
+            aliases[folder_id] = url_id
+
+    return {
+        'version': INDEX_VERSION,
+        'ids': dict(sorted(ids.items())),
+        'aliases': dict(sorted(aliases.items())),
+    }
+
+
+@click.command()
+@click.option('--webfonts', default='./webfonts.json', type=click.Path(exists=True),
+              help='Path to webfonts.json (default: ./webfonts.json)')
+@click.option('--webfonts-vf', default='./webfonts-vf.json', type=click.Path(exists=True),
+              help='Path to webfonts-vf.json (default: ./webfonts-vf.json)')
+@click.option('--output', default='./www/public/family-ids.json',
+              help='Output file (default: ./www/public/family-ids.json)')
+def main(webfonts, webfonts_vf, output):
+    """Build the id -> family index, failing on id collisions."""
+    with ledger_stage('build_family_ids') as record:
+        with open(webfonts, 'r') as f:
+            static_items = json.load(f).get('items', [])
+        with open(webfonts_vf, 'r') as f:
+            vf_items = json.load(f).get('items', [])
+        record.add(items=len(static_items) + len(vf_items))
+
+        collisions = find_collisions({item['family'] for item in static_items + vf_items})
+        for key, families in collisions.items():
+            record.failure(key, f"id shared by {', '.join(families)}")
+        if collisions:
+            print(f"❌ {len(collisions)} family id collisions:")
+            for key, families in sorted(collisions.items()):
+                print(f"  {key}: {', '.join(families)}")
+            sys.exit(1)
+
+        index = build_index(static_items, vf_items)
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump(index, f, separators=(',', ':'), ensure_ascii=False)
+            f.write('\n')
+
+    print(f"Indexed {len(index['ids'])} families ({len(index['aliases'])} aliases) -> {output}")
+
+
+if __name__ == '__main__':
+    main()
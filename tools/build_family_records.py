@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Family Records
+
+Joins the per-family data that the www detail lookups otherwise assemble at
+request time from several multi-MB files, and writes one small record per
+family id to www/public/families/<id>.json:
+
+    {
+      "version": 1,
+      "id": "open-sans",                  # URL id (family_id.family_to_id)
+      "family": "Open Sans",
+      "vf": {...},                        # webfonts-vf.json item, incl. axes (or null)
+      "static": {...},                    # webfonts.json item (or null)
+      "post_script_names": {...},         # webfonts.metadata.json psname -> variant
+      "stats": {...},                     # google_fonts_metadata_stats.py row (or null)
+      "preview": "/svg/opensans.svg"      # SVG preview, if rendered (or null)
+    }
+
+Unchanged records are not rewritten, and records of families that left the
+catalog are removed.
+
+Usage:
+    python build_family_records.py [--output ./www/public/families]
+"""
+
+import json
+import os
+from typing import Dict, List, Optional
+
+import click
+from tqdm import tqdm
+
+from family_id import family_to_id, normalize_family_name
+from run_ledger import ledger_stage
+
+RECORD_VERSION = 1
+STATS_FIELDS = ('rate', 'total_views', 'year_views', 'year_change')
+
+
+def load_items(path: str) -> List[Dict]:
+    with open(path, 'r') as f:
+        return json.load(f).get('items', [])
+
+
+def load_optional_json(path: str, default):
+    if not os.path.exists(path):
+        return default
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def build_records(static_items: List[Dict], vf_items: List[Dict], metadata: Dict[str, Dict],
+                  stats: List[Dict], svg_dir: Optional[str]) -> Dict[str, Dict]:
+    """URL id -> joined record for every family in either catalog."""
+    static_by_family = {item['family']: item for item in static_items}
+    vf_by_family = {item['family']: item for item in vf_items}
+    stats_by_family = {row['family']: row for row in stats}
+    previews = set(os.listdir(svg_dir)) if svg_dir and os.path.isdir(svg_dir) else set()
+
+    records = {}
+    for family in sorted(static_by_family.keys() | vf_by_family.keys()):
+        row = stats_by_family.get(family)
+        preview = f"{normalize_family_name(family)}.svg"
+        record_id = family_to_id(family)
+        records[record_id] = {
+            'version': RECORD_VERSION,
+            'id': record_id,
+            'family': family,
+            'vf': vf_by_family.get(family),
+            'static': static_by_family.get(family),
+            'post_script_names': metadata.get(family, {}).get('post_script_names', {}),
+            'stats': {field: row.get(field) for field in STATS_FIELDS} if row else None,
+            'preview': f"/svg/{preview}" if preview in previews else None,
+        }
+    return records
+
+
+def write_records(records: Dict[str, Dict], output: str) -> Dict[str, int]:
+    """Write changed records and remove stale ones; returns counts per outcome."""
+    os.makedirs(output, exist_ok=True)
+    counts = {'written': 0, 'unchanged': 0, 'removed': 0}
+    for record_id, record in tqdm(records.items(), desc="Writing family records"):
+        payload = json.dumps(record, separators=(',', ':'), sort_keys=True, ensure_ascii=False) + '\n'
+        path = os.path.join(output, f"{record_id}.json")
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                if f.read() == payload:
+                    counts['unchanged'] += 1
+                    continue
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(payload)
+        counts['written'] += 1
+
+    for filename in os.listdir(output):
+        if filename.endswith('.json') and filename[:-len('.json')] not in records:
+            os.remove(os.path.join(output, filename))
+            counts['removed'] += 1
+    return counts
+
+
+@click.command()
+@click.option('--webfonts', default='./www/public/webfonts.json', type=click.Path(exists=True),
+              help='Path to webfonts.json (default: ./www/public/webfonts.json)')
+@click.option('--webfonts-vf', default='./www/public/webfonts-vf.json', type=click.Path(exists=True),
+              help='Path to webfonts-vf.json (default: ./www/public/webfonts-vf.json)')
+@click.option('--metadata', default='./www/public/webfonts.metadata.json',
+              help='Path to webfonts.metadata.json (optional)')
+@click.option('--stats', default='./www/app/api/popular/stats.json',
+              help='Path to the popularity stats (optional)')
+@click.option('--svg-dir', default='./www/public/svg', help='SVG preview directory (optional)')
+@click.option('--output', default='./www/public/families',
+              help='Output directory (default: ./www/public/families)')
+def main(webfonts, webfonts_vf, metadata, stats, svg_dir, output):
+    """Write one joined record per family id."""
+    with ledger_stage('build_family_records') as record:
+        records = build_records(load_items(webfonts), load_items(webfonts_vf),
+                                load_optional_json(metadata, {}), load_optional_json(stats, []), svg_dir)
+        counts = write_records(records, output)
+        record.add(items=len(records), cache_hits=counts['unchanged'])
+
+    sizes = [os.path.getsize(os.path.join(output, f"{record_id}.json")) for record_id in records]
+    print(f"Family records: {len(records)} in {output} "
+          f"({counts['written']} written, {counts['unchanged']} unchanged, {counts['removed']} removed)")
+    if sizes:
+        print(f"Record size: avg {sum(sizes) / len(sizes) / 1024:.1f} KB, max {max(sizes) / 1024:.1f} KB")
+
+
+if __name__ == '__main__':
+    main()
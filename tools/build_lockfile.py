@@ -7,6 +7,8 @@ Reads:
   - www/public/webfonts.metadata.json   (output of metadata/cli.py map+polyfill)
   - metadata/invalid.csv                (pre-validate output)
   - failed_fonts.log                    (optional, fonts2svg failures)
+  - failed_subsets.log                  (optional, verify_subsets failures)
+  - .cache/run-ledger.jsonl             (optional, per-stage timings, see run_ledger.py)
 
 Writes:
   - broken.lock.json                    (at repo root)
@@ -14,6 +16,9 @@ Writes:
 The lockfile is shipped alongside the data so humans can periodically review
 which families are in a degraded state and investigate. Each refresh run
 regenerates it from scratch — there is no history, just the current state.
+The one exception is `performance`: each stage of the current run keeps the
+previous lockfile's timing as `previous_seconds`, so slowdowns show up in
+the lockfile diff.
 """
 
 import csv
@@ -24,11 +29,14 @@ from datetime import datetime, timezone
 
 import click
 
+from run_ledger import read_events, summarize_run
+
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 WEBFONTS_JSON = os.path.join(PROJECT_ROOT, 'www', 'public', 'webfonts.json')
 METADATA_JSON = os.path.join(PROJECT_ROOT, 'www', 'public', 'webfonts.metadata.json')
 INVALID_CSV = os.path.join(PROJECT_ROOT, 'metadata', 'invalid.csv')
 FAILED_SVG_LOG = os.path.join(PROJECT_ROOT, 'failed_fonts.log')
+FAILED_SUBSETS_LOG = os.path.join(PROJECT_ROOT, 'failed_subsets.log')
 DEFAULT_OUT = os.path.join(PROJECT_ROOT, 'broken.lock.json')
 
 
@@ -81,6 +89,26 @@ def load_failed_svgs() -> dict:
     return result
 
 
+def load_failed_subsets() -> dict:
+    """family -> [{subset, coverage, missing_count}]. verify_subsets writes a JSON array to failed_subsets.log."""
+    if not os.path.exists(FAILED_SUBSETS_LOG):
+        return {}
+    with open(FAILED_SUBSETS_LOG, 'r') as f:
+        content = f.read().strip()
+    if not content:
+        return {}
+    data = json.loads(content)
+    if not isinstance(data, list):
+        raise RuntimeError(f"expected a JSON array in {FAILED_SUBSETS_LOG}, got {type(data).__name__}")
+    result = {}
+    for entry in data:
+        family = entry.get('family')
+        if not family or not entry.get('subset'):
+            continue
+        result.setdefault(family, []).append(entry)
+    return result
+
+
 def get_submodule_sha() -> str:
     try:
         out = subprocess.check_output(
@@ -92,6 +120,25 @@ def get_submodule_sha() -> str:
         return ''
 
 
+def build_performance(previous_lockfile: str) -> dict:
+    """Per-stage roll-up of the current (or latest) run from the run ledger."""
+    summary = summarize_run(read_events(), os.environ.get('RUN_ID'))
+    if summary is None:
+        return {}
+
+    previous = {}
+    if os.path.exists(previous_lockfile):
+        try:
+            with open(previous_lockfile, 'r') as f:
+                previous = json.load(f).get('performance', {}).get('stages', {})
+        except ValueError:
+            pass
+    for name, stage in summary['stages'].items():
+        if name in previous:
+            stage['previous_seconds'] = previous[name].get('seconds')
+    return summary
+
+
 @click.command()
 @click.option('--output', default=DEFAULT_OUT, help='Output lockfile path.')
 def main(output: str):
@@ -99,6 +146,7 @@ def main(output: str):
     metadata_families = load_metadata_families()
     invalid = load_invalid_csv()
     failed_svgs = load_failed_svgs()
+    failed_subsets = load_failed_subsets()
 
     # Build broken entries keyed by family. A family may have multiple reasons.
     broken: dict = {}
@@ -132,6 +180,16 @@ def main(output: str):
         if 'fonts2svg' not in entry['sources']:
             entry['sources'].append('fonts2svg')
 
+    # 4. Families whose fonts do not cover a subset they declare.
+    for family, entries in failed_subsets.items():
+        entry = broken.setdefault(family, {'family': family, 'reasons': [], 'sources': []})
+        for failure in entries:
+            tag = f"subset_not_covered:{failure['subset']}"
+            if tag not in entry['reasons']:
+                entry['reasons'].append(tag)
+        if 'verify-subsets' not in entry['sources']:
+            entry['sources'].append('verify-subsets')
+
     lockfile = {
         'generated_at': datetime.now(timezone.utc).isoformat(),
         'vendor_google_sha': get_submodule_sha(),
@@ -142,8 +200,10 @@ def main(output: str):
             'missing_from_metadata': len(missing_from_metadata),
             'pre_validate_invalid': len(invalid),
             'svg_render_failed': len(failed_svgs),
+            'subset_not_covered': len(failed_subsets),
         },
         'broken': sorted(broken.values(), key=lambda e: e['family']),
+        'performance': build_performance(output),
     }
 
     with open(output, 'w') as f:
@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+Preview Fonts
+
+Builds one tiny font per family that only holds the glyphs of its preview
+string (the family name, as on the SVG previews), so a listing page can
+render every family name in its own typeface as live, restylable text
+without downloading the full fonts.
+
+The font is the family's regular variant (else its first variant, as in
+fonts2svg.py), resolved to a local file in vendor/google through
+METADATA.pb. The preview string is the family name when the font covers
+it, else the sample text fonts2svg.py renders for it. The subset keeps the
+layout features that apply to that string (kerning, ligatures, contextual
+forms); hinting is dropped. A variable font is pinned to the variant's
+weight and the default of every other axis, so previews are static.
+
+Fonts are written to <output-dir>/<family id>.woff2 (or .ttf with
+--format ttf). The manifest, <output-dir>/manifest.json, maps each family
+to its preview font:
+
+    {
+      "version": 1,
+      "format": "woff2",
+      "families": {
+        "abel": {
+          "family": "Abel", "variant": "regular", "text": "Abel",
+          "file": "abel.woff2", "size": 1024,
+          "font": "Abel-Regular.ttf", "source": "sha256:...", "inputs": "sha256:..."
+        }
+      }
+    }
+
+Families are built in a process pool. A family whose source hash and
+inputs (preview text, variant, subsets, format, builder version, and for a
+sample text the sample-text definitions) match its manifest entry, and
+whose preview font is on disk, is reused without opening the font.
+
+Usage:
+    python build_preview_fonts.py [--webfonts ./www/public/webfonts.json] [--fonts-dir ./vendor/google]
+                                  [--output-dir ./www/public/preview-fonts] [--format woff2] [--jobs 8]
+"""
+
+import hashlib
+import json
+import os
+import re
+import statistics
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import click
+from tqdm import tqdm
+
+try:
+    from fontTools import subset
+    from fontTools.ttLib import TTFont
+    from fontTools.varLib import instancer
+except ImportError:
+    print("Error: fonttools is required. Install with: pip install fonttools")
+    sys.exit(1)
+
+from family_id import normalize_family_name
+from fonts2svg import NATIVE_NAMES, get_sample_text_for_font
+from metadata_cache import DEFAULT_CACHE_DIR, MetadataCache, load_metadata
+from run_ledger import StageRecord
+from sample_texts import SampleCoverage, build_samples, load_subset_names
+from verify_subsets import FONT_EXTENSIONS, find_family_dirs
+
+# Bump whenever a change to the builder alters the output files
+BUILDER_VERSION = 1
+MANIFEST_VERSION = 1
+SAMPLE_SUBSET = 'latin'
+
+# Set once per worker process by _init_worker.
+_CACHE: Optional[MetadataCache] = None
+_COVERAGE: Optional[SampleCoverage] = None
+_SAMPLES: Optional[str] = None
+
+
+def preview_variant(variants: List[str]) -> Optional[str]:
+    return 'regular' if 'regular' in variants else (variants[0] if variants else None)
+
+
+def variant_style(variant: str) -> Tuple[str, int]:
+    """"regular" -> ("normal", 400), "700italic" -> ("italic", 700)."""
+    match = re.fullmatch(r'(\d*)(regular|italic)?', variant)
+    if not match:
+        raise ValueError(f"Unknown variant {variant!r}")
+    weight, style = match.groups()
+    return ('italic' if style == 'italic' else 'normal'), int(weight or 400)
+
+
+def select_font_file(font_dir: str, variant: str) -> str:
+    """The file name of a variant in a vendor font directory."""
+    filenames = sorted(f for f in os.listdir(font_dir) if f.lower().endswith(FONT_EXTENSIONS))
+    if not filenames:
+        raise ValueError(f"No font files in {font_dir}")
+    style, weight = variant_style(variant)
+    metadata_path = os.path.join(font_dir, 'METADATA.pb')
+    if os.path.exists(metadata_path):
+        fonts = [f for f in load_metadata(metadata_path, _CACHE).fonts if f.filename in filenames]
+        for candidates in ([f for f in fonts if f.style == style and f.weight == weight],
+                           [f for f in fonts if f.style == style], fonts):
+            if candidates:
+                return candidates[0].filename
+    # No (usable) METADATA.pb: a variable font or a "-Regular" file before the rest
+    upright = [f for f in filenames if 'italic' not in f.lower()] or filenames
+    for filename in upright:
+        if '[' in filename or 'regular' in filename.lower():
+            return filename
+    return upright[0]
+
+
+def preview_text(font_info: Dict, cmap, coverage: SampleCoverage) -> Optional[str]:
+    """The family name if the font covers it, else the sample text of the SVG preview."""
+    family = font_info['family']
+    if all(ord(char) in cmap for char in family):
+        return family
+    return get_sample_text_for_font(font_info, SAMPLE_SUBSET, cmap, coverage)
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return f"sha256:{digest.hexdigest()}"
+
+
+def samples_digest(coverage: SampleCoverage) -> str:
+    """Digest of the sample-text definitions (native names and per-subset samples) a fallback text comes from."""
+    payload = json.dumps({'native': NATIVE_NAMES, 'samples': coverage.samples}, sort_keys=True, ensure_ascii=False)
+    return f"sha256:{hashlib.sha256(payload.encode()).hexdigest()}"
+
+
+def preview_inputs(text: str, variant: str, subsets: List[str], font_format: str,
+                   samples: Optional[str]) -> str:
+    """
+    Digest of everything besides the source file that determines a preview font (or its text).
+    samples is the samples_digest for a sample text, None for the family name.
+    """
+    payload = json.dumps({'text': text, 'variant': variant, 'subsets': subsets, 'format': font_format,
+                          'samples': samples, 'builder': BUILDER_VERSION}, sort_keys=True)
+    return f"sha256:{hashlib.sha256(payload.encode()).hexdigest()}"
+
+
+def pin_axes(font: TTFont, weight: int):
+    """Instance a variable font at the weight (clamped to its range) and every other axis' default."""
+    limits = {}
+    for axis in font['fvar'].axes:
+        value = axis.defaultValue
+        if axis.axisTag == 'wght':
+            value = min(max(weight, axis.minValue), axis.maxValue)
+        limits[axis.axisTag] = value
+    instancer.instantiateVariableFont(font, limits, inplace=True)
+
+
+def subset_preview(font: TTFont, text: str, weight: int, font_format: str, output: str):
+    options = subset.Options()
+    options.layout_features = ['*']
+    options.hinting = False
+    options.desubroutinize = True
+    options.notdef_outline = True
+    options.flavor = 'woff2' if font_format == 'woff2' else None
+    subsetter = subset.Subsetter(options)
+    subsetter.populate(text=text)
+    subsetter.subset(font)
+    if 'fvar' in font:
+        pin_axes(font, weight)
+    subset.save_font(font, output, options)
+
+
+def _init_worker(cache_dir, subset_names):
+    global _CACHE, _COVERAGE, _SAMPLES
+    _CACHE = MetadataCache(cache_dir) if cache_dir else None
+    _COVERAGE = SampleCoverage(build_samples(subset_names))
+    _SAMPLES = samples_digest(_COVERAGE)
+
+
+def build_preview(task: Tuple) -> Tuple[str, str, Optional[Dict], Optional[str]]:
+    """
+    Build one family's preview font, unless its manifest entry is current.
+    Returns (family id, status, entry, error) with status 'cached', 'built' or 'failed'.
+    """
+    family_id, font_info, font_dir, previous, output_dir, font_format = task
+    try:
+        variant = preview_variant(font_info.get('variants', []))
+        if variant is None:
+            raise ValueError('No variants')
+        subsets = font_info.get('subsets', [])
+        family = font_info['family']
+        filename = select_font_file(font_dir, variant)
+        path = os.path.join(font_dir, filename)
+        source = file_sha256(path)
+        relative = f"{family_id}.{font_format}"
+        output = os.path.join(output_dir, relative)
+
+        def inputs_of(text):
+            return preview_inputs(text, variant, subsets, font_format, None if text == family else _SAMPLES)
+
+        # The preview text only depends on the font, the family name, its subsets
+        # and the sample texts, so a current entry is reused without opening the font
+        if (previous and previous.get('source') == source and previous.get('font') == filename
+                and previous.get('family') == family and previous.get('file') == relative
+                and previous.get('inputs') == inputs_of(previous.get('text', ''))
+                and os.path.exists(output)):
+            return family_id, 'cached', previous, None
+
+        font = TTFont(path)
+        try:
+            text = preview_text(font_info, set(font.getBestCmap() or {}), _COVERAGE)
+            if text is None:
+                raise ValueError(f"{filename} covers neither the family name nor any sample text")
+            inputs = inputs_of(text)
+            subset_preview(font, text, variant_style(variant)[1], font_format, output)
+        finally:
+            font.close()
+
+        return family_id, 'built', {
+            'family': family,
+            'variant': variant,
+            'text': text,
+            'file': relative,
+            'size': os.path.getsize(output),
+            'font': filename,
+            'source': source,
+            'inputs': inputs,
+        }, None
+    except Exception as e:
+        return family_id, 'failed', None, str(e)
+
+
+def load_manifest(path: str) -> Dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def save_manifest(path: str, manifest: Dict):
+    # Temp file first: an interrupted run never leaves a truncated manifest
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True, ensure_ascii=False)
+        f.write('\n')
+    os.replace(tmp_path, path)
+
+
+def prune_previews(output_dir: str, previous: Dict, current: Dict) -> int:
+    """Delete preview fonts the previous manifest listed and the current one does not."""
+    keep = {entry['file'] for entry in current.values()}
+    pruned = 0
+    for entry in previous.values():
+        path = os.path.join(output_dir, entry['file'])
+        if entry['file'] not in keep and os.path.exists(path):
+            os.remove(path)
+            pruned += 1
+    return pruned
+
+
+@click.command()
+@click.option('--webfonts', default='./www/public/webfonts.json', type=click.Path(exists=True),
+              help='Path to webfonts.json (default: ./www/public/webfonts.json)')
+@click.option('--fonts-dir', default='./vendor/google',
+              help='Base directory containing font directories (default: ./vendor/google)')
+@click.option('--output-dir', default='./www/public/preview-fonts',
+              help='Output directory (default: ./www/public/preview-fonts)')
+@click.option('--format', 'font_format', default='woff2', type=click.Choice(['woff2', 'ttf']),
+              help='Preview font format (default: woff2)')
+@click.option('--family', 'families', multiple=True, help='Only build these families (repeatable)')
+@click.option('--cache-dir', default=DEFAULT_CACHE_DIR, help=f'METADATA.pb cache directory (default: {DEFAULT_CACHE_DIR})')
+@click.option('--no-cache', is_flag=True, help='Always parse METADATA.pb text format')
+@click.option('--jobs', '-j', default=os.cpu_count(), type=int, help='Worker processes (default: CPU count)')
+def main(webfonts, fonts_dir, output_dir, font_format, families, cache_dir, no_cache, jobs):
+    """Build family-name preview fonts from the vendor fonts."""
+    with open(webfonts, 'r') as f:
+        items = json.load(f).get('items', [])
+
+    family_dirs = find_family_dirs(fonts_dir)
+    if not family_dirs:
+        print(f"Error: No font directories found in {fonts_dir}")
+        print("Expected structure: vendor/google/{ofl,apache,ufl}/*/")
+        sys.exit(1)
+
+    manifest_path = os.path.join(output_dir, 'manifest.json')
+    previous = load_manifest(manifest_path)
+    previous_families = previous.get('families', {}) if previous.get('format') == font_format else {}
+    os.makedirs(output_dir, exist_ok=True)
+
+    tasks = []
+    missing = 0
+    for item in items:
+        if families and item['family'] not in families:
+            continue
+        family_id = normalize_family_name(item['family'])
+        font_dir = family_dirs.get(family_id)
+        if font_dir is None:
+            missing += 1
+            continue
+        tasks.append((family_id, item, font_dir, previous_families.get(family_id), output_dir, font_format))
+
+    # Sample texts for every subset we know of, as fonts2svg.py
+    catalog_subsets = {name for item in items for name in item.get('subsets', [])}
+    subset_names = list(load_subset_names()) + sorted(catalog_subsets)
+
+    print(f"Building {len(tasks)} preview fonts into {output_dir} ({font_format})...")
+    record = StageRecord('build_preview_fonts')
+
+    current: Dict[str, Dict] = {}
+    counts = {'cached': 0, 'built': 0, 'failed': 0}
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                             initargs=(None if no_cache else cache_dir, subset_names)) as pool:
+        for family_id, status, entry, error in tqdm(pool.map(build_preview, tasks, chunksize=4),
+                                                    total=len(tasks), desc="Building previews"):
+            counts[status] += 1
+            if status == 'failed':
+                tqdm.write(f"Error building preview of {family_id}: {error}")
+                record.failure(family_id, error)
+                continue
+            current[family_id] = entry
+
+    if families:
+        # A partial run keeps the other families' entries
+        for family_id, entry in previous_families.items():
+            current.setdefault(family_id, entry)
+    pruned = prune_previews(output_dir, previous_families, current)
+    save_manifest(manifest_path, {'version': MANIFEST_VERSION, 'format': font_format, 'families': current})
+
+    print(f"\nBuilt {counts['built']}, unchanged {counts['cached']}, failed {counts['failed']}, "
+          f"no vendor directory {missing}, pruned {pruned} stale previews")
+    sizes = [entry['size'] for entry in current.values()]
+    if sizes:
+        print(f"{len(sizes)} preview fonts, {sum(sizes) / 1024 / 1024:.1f} MB "
+              f"(median {statistics.median(sizes) / 1024:.1f} KB, max {max(sizes) / 1024:.1f} KB). "
+              f"Manifest: {manifest_path}")
+
+    record.add(items=len(tasks), cache_hits=counts['cached'])
+    record.end()
+
+
+if __name__ == '__main__':
+    main()
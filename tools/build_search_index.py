@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Search Index
+
+Builds the inverted index behind `q` in /api/search
+(www/lib/search-index.ts), written to www/public/search-index.json:
+
+    {
+      "version": 1,
+      "families": [...],           # doc id -> family (webfonts-vf.json item order)
+      "terms": ["abel", ...],      # sorted term dictionary
+      "postings": [[0, 3, 1], ...] # per term: doc ids, gap-encoded
+    }
+
+Terms are diacritic-folded, lower-cased runs of letters or digits taken from
+the family name and the variants, plus the name and the category with spaces
+and punctuation stripped ("opensans", "sansserif"). A query matches a
+document when each of its tokens is a prefix of one of the document's terms,
+or when the whole query, stripped the same way, is. Prefixes are resolved by
+binary search over the sorted dictionary, so no per-prefix postings are
+stored. Query cost grows with the matching terms and documents, not with the
+catalog.
+
+tokenize() must stay in step with tokenize() in www/lib/search-index.ts.
+
+Usage:
+    python build_search_index.py [--webfonts-vf ./www/public/webfonts-vf.json]
+"""
+
+import json
+import os
+import re
+import unicodedata
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Set
+
+import click
+
+from run_ledger import ledger_stage
+
+INDEX_VERSION = 1
+TOKEN_RE = re.compile(r'[a-z]+|[0-9]+')
+COMBINING_MARKS = re.compile('[\u0300-\u036f]')
+
+
+def fold(text: str) -> str:
+    """Lower-case and strip diacritics ("Óptima" -> "optima")."""
+    return COMBINING_MARKS.sub('', unicodedata.normalize('NFKD', text)).lower()
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_RE.findall(fold(text))
+
+
+def doc_terms(item: Dict) -> Set[str]:
+    """Every term a catalog item is findable by."""
+    name_tokens = tokenize(item['family'])
+    terms = set(name_tokens)
+    terms.add(''.join(name_tokens))  # space-stripped id form
+    # Categories only in joined form: "sans-serif" is "sansserif", so "serif" finds serif fonts only
+    terms.add(''.join(tokenize(item.get('category', ''))))
+    for variant in item.get('variants', []):
+        terms.update(tokenize(variant))
+    terms.discard('')
+    return terms
+
+
+def gap_encode(doc_ids: Iterable[int]) -> List[int]:
+    previous = 0
+    gaps = []
+    for doc_id in doc_ids:
+        gaps.append(doc_id - previous)
+        previous = doc_id
+    return gaps
+
+
+def gap_decode(gaps: List[int]) -> List[int]:
+    doc_ids = []
+    current = 0
+    for gap in gaps:
+        current += gap
+        doc_ids.append(current)
+    return doc_ids
+
+
+def build_index(items: List[Dict]) -> Dict:
+    postings: Dict[str, List[int]] = {}
+    for doc_id, item in enumerate(items):
+        for term in doc_terms(item):
+            postings.setdefault(term, []).append(doc_id)
+    terms = sorted(postings)
+    return {
+        'version': INDEX_VERSION,
+        'families': [item['family'] for item in items],
+        'terms': terms,
+        'postings': [gap_encode(postings[term]) for term in terms],
+    }
+
+
+class SearchIndex:
+    """Reference reader of the index (the benchmark uses it; the route uses the TypeScript port)."""
+
+    def __init__(self, data: Dict):
+        self.families = data['families']
+        self.terms = data['terms']
+        self.postings = data['postings']
+        self.decoded: Dict[int, List[int]] = {}
+
+    def prefix_docs(self, token: str) -> Set[int]:
+        start = bisect_left(self.terms, token)
+        end = bisect_left(self.terms, token + '\uffff', start)
+        docs: Set[int] = set()
+        for term_id in range(start, end):
+            if term_id not in self.decoded:
+                self.decoded[term_id] = gap_decode(self.postings[term_id])
+            docs.update(self.decoded[term_id])
+        return docs
+
+    def search(self, query: str) -> Optional[List[int]]:
+        """Doc ids matching the query (see module docstring), or None for a query without tokens."""
+        tokens = tokenize(query)
+        if not tokens:
+            return None
+        ordered = sorted(set(tokens), key=len, reverse=True)  # longest: fewest matches
+        docs = self.prefix_docs(ordered[0])
+        for token in ordered[1:]:
+            if not docs:
+                break
+            docs &= self.prefix_docs(token)
+        if len(tokens) > 1:
+            docs |= self.prefix_docs(''.join(tokens))
+        return sorted(docs)
+
+
+@click.command()
+@click.option('--webfonts-vf', default='./www/public/webfonts-vf.json', type=click.Path(exists=True),
+              help='Path to webfonts-vf.json (default: ./www/public/webfonts-vf.json)')
+@click.option('--output', default='./www/public/search-index.json',
+              help='Output file (default: ./www/public/search-index.json)')
+def main(webfonts_vf, output):
+    """Build the search index over the catalog."""
+    with ledger_stage('build_search_index') as record:
+        with open(webfonts_vf, 'r') as f:
+            items = json.load(f).get('items', [])
+        index = build_index(items)
+        record.add(items=len(items))
+
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump(index, f, separators=(',', ':'), ensure_ascii=False)
+            f.write('\n')
+
+    postings = sum(len(p) for p in index['postings'])
+    print(f"Search index: {len(items)} families, {len(index['terms'])} terms, {postings} postings")
+    print(f"Written to {output} ({os.path.getsize(output) / 1024:.1f} KB)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Sort Orders
+
+Precomputes the orderings the www search and popular APIs otherwise sort
+for on every request, and writes them to www/public/sort-orders.json:
+
+    {
+      "version": 1,
+      "catalog": {
+        "families": [...],               # webfonts-vf.json families, in item order
+        "orders": {"popular": [3, 0, ...], "trending": [...], ...},
+        "ranks": {"popular": [2, 1, 0, ...], "trending": [...]}
+      },
+      "stats": {
+        "families": [...],               # stats.json families, in row order
+        "orders": {"rate": [...], "total_views": [...], "year_views": [...]}
+      }
+    }
+
+Orders are arrays of item positions, so an API pages through a sort by
+slicing one. Ranks are dense (ties share a rank, 1 = top) per catalog
+position, with 0 for families that have no stats. `families` lets readers
+detect an artifact that is older than the file it indexes.
+
+Catalog sort keys:
+- popular: stats `rate`, descending
+- trending: stats `year_change`, descending
+- alphabetical: family name
+- date-added: METADATA.pb `date_added`, newest first (needs --fonts-dir)
+- last-modified: catalog `lastModified`, newest first
+Families without a value sort after the rest; ties sort alphabetically.
+
+Usage:
+    python build_sort_orders.py [--fonts-dir ./vendor/google] [--output ./www/public/sort-orders.json]
+"""
+
+import json
+import os
+from typing import Callable, Dict, List, Optional
+
+import click
+
+from family_id import normalize_family_name
+from metadata_cache import DEFAULT_CACHE_DIR, LICENSE_DIRS, MetadataCache, load_metadata
+from run_ledger import ledger_stage
+
+ORDERS_VERSION = 1
+STATS_SORT_FIELDS = ('rate', 'total_views', 'year_views')
+
+
+def order_by(families: List[str], value: Callable[[int], Optional[object]], descending: bool = True) -> List[int]:
+    """Positions sorted by value (missing values last), then alphabetically."""
+    def key(position: int):
+        v = value(position)
+        if v is None:
+            return (1, 0, families[position].lower())
+        return (0, -v if descending else v, families[position].lower())
+    return sorted(range(len(families)), key=key)
+
+
+def order_by_date(families: List[str], date: Callable[[int], Optional[str]]) -> List[int]:
+    """Positions by ISO date, newest first (missing dates last), then alphabetically."""
+    dated = sorted((p for p in range(len(families)) if date(p)),
+                   key=lambda p: families[p].lower())
+    dated.sort(key=date, reverse=True)  # stable: ties stay alphabetical
+    undated = sorted((p for p in range(len(families)) if not date(p)),
+                     key=lambda p: families[p].lower())
+    return dated + undated
+
+
+def dense_ranks(families: List[str], value: Callable[[int], Optional[float]]) -> List[int]:
+    """Dense rank per position by descending value; 0 where there is no value."""
+    distinct = sorted({value(p) for p in range(len(families)) if value(p) is not None}, reverse=True)
+    rank_of = {v: rank for rank, v in enumerate(distinct, start=1)}
+    return [rank_of.get(value(p), 0) for p in range(len(families))]
+
+
+def load_dates_added(families: List[str], fonts_dir: str, cache: Optional[MetadataCache]) -> Dict[str, str]:
+    """family -> date_added from vendor/google METADATA.pb files (empty without a checkout)."""
+    dates = {}
+    for family in families:
+        folder = normalize_family_name(family)
+        for license_dir in LICENSE_DIRS:
+            metadata_path = os.path.join(fonts_dir, license_dir, folder, 'METADATA.pb')
+            if os.path.exists(metadata_path):
+                metadata = load_metadata(metadata_path, cache)
+                if metadata.date_added:
+                    dates[family] = metadata.date_added
+                break
+    return dates
+
+
+def build_sort_orders(vf_items: List[Dict], stats: List[Dict], dates_added: Dict[str, str]) -> Dict:
+    families = [item['family'] for item in vf_items]
+    stats_by_family = {row['family']: row for row in stats}
+
+    def stat(field):
+        return lambda p: (stats_by_family.get(families[p]) or {}).get(field)
+
+    catalog_orders = {
+        'popular': order_by(families, stat('rate')),
+        'trending': order_by(families, stat('year_change')),
+        'alphabetical': order_by(families, lambda p: None),
+        'date-added': order_by_date(families, lambda p: dates_added.get(families[p])),
+        'last-modified': order_by_date(families, lambda p: vf_items[p].get('lastModified')),
+    }
+    catalog_ranks = {
+        'popular': dense_ranks(families, stat('rate')),
+        'trending': dense_ranks(families, stat('year_change')),
+    }
+
+    stats_families = [row['family'] for row in stats]
+    stats_orders = {
+        field: order_by(stats_families, lambda p, field=field: stats[p].get(field))
+        for field in STATS_SORT_FIELDS
+    }
+
+    return {
+        'version': ORDERS_VERSION,
+        'catalog': {'families': families, 'orders': catalog_orders, 'ranks': catalog_ranks},
+        'stats': {'families': stats_families, 'orders': stats_orders},
+    }
+
+
+@click.command()
+@click.option('--webfonts-vf', default='./www/public/webfonts-vf.json', type=click.Path(exists=True),
+              help='Path to webfonts-vf.json (default: ./www/public/webfonts-vf.json)')
+@click.option('--stats', default='./www/app/api/popular/stats.json', type=click.Path(exists=True),
+              help='Path to the popularity stats (default: ./www/app/api/popular/stats.json)')
+@click.option('--fonts-dir', default='./vendor/google', help='Font directory for date_added (default: ./vendor/google)')
+@click.option('--cache-dir', default=DEFAULT_CACHE_DIR, help=f'METADATA.pb cache directory (default: {DEFAULT_CACHE_DIR})')
+@click.option('--no-cache', is_flag=True, help='Parse every METADATA.pb without the binary cache')
+@click.option('--output', default='./www/public/sort-orders.json',
+              help='Output file (default: ./www/public/sort-orders.json)')
+def main(webfonts_vf, stats, fonts_dir, cache_dir, no_cache, output):
+    """Precompute sort orders and popularity ranks for the www APIs."""
+    with ledger_stage('build_sort_orders') as record:
+        with open(webfonts_vf, 'r') as f:
+            vf_items = json.load(f).get('items', [])
+        with open(stats, 'r') as f:
+            stats_rows = json.load(f)
+
+        cache = None if no_cache else MetadataCache(cache_dir)
+        dates_added = load_dates_added([item['family'] for item in vf_items], fonts_dir, cache)
+        orders = build_sort_orders(vf_items, stats_rows, dates_added)
+        record.add(items=len(vf_items) + len(stats_rows))
+
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump(orders, f, separators=(',', ':'), ensure_ascii=False)
+            f.write('\n')
+
+    ranked = sum(1 for rank in orders['catalog']['ranks']['popular'] if rank)
+    print(f"Sort orders for {len(vf_items)} families ({ranked} with stats, "
+          f"{len(dates_added)} with date_added) and {len(stats_rows)} stats rows")
+    print(f"Written to {output} ({os.path.getsize(output) / 1024:.1f} KB)")
+
+
+if __name__ == '__main__':
+    main()
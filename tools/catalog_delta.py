@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Catalog Delta
+
+Compares the current webfonts.json / webfonts-vf.json with the previous
+snapshot (by default the committed version at git HEAD, i.e. the catalog
+the last refresh shipped) and writes a change manifest listing added,
+removed and modified families, with the top-level fields that changed per
+family (prefixed `vf:` for webfonts-vf.json fields).
+
+Each family record is hashed once on each side, so a run is linear in the
+catalog size; fields are only compared for records whose hash differs.
+The manifest carries no timestamp, so it only changes when the delta does.
+
+Downstream tools accept `--only-changed` to limit their work to the added
+and modified families in the manifest (.cache/catalog-delta.json):
+metadata/cli.py map and fonts2svg.py.
+
+Usage:
+    python tools/catalog_delta.py                      # diff against HEAD
+    python tools/catalog_delta.py --base origin/main
+    python tools/catalog_delta.py --previous-dir ./old  # diff against files on disk
+"""
+
+import hashlib
+import json
+import os
+import subprocess
+from typing import Dict, List, Optional, Set, Tuple
+
+import click
+
+from run_ledger import ledger_stage
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_DELTA = os.path.join(PROJECT_ROOT, '.cache', 'catalog-delta.json')
+# (path relative to the project root, prefix for its field names)
+TARGETS = [
+    ('www/public/webfonts.json', ''),
+    ('www/public/webfonts-vf.json', 'vf:'),
+]
+
+
+def digest(value) -> str:
+    return hashlib.sha1(json.dumps(value, sort_keys=True, separators=(',', ':'),
+                                   ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+def index_items(items: List[Dict]) -> Dict[str, str]:
+    """family -> record digest"""
+    return {item['family']: digest(item) for item in items}
+
+
+def changed_fields(old: Dict, new: Dict) -> List[str]:
+    return sorted(key for key in old.keys() | new.keys() if old.get(key) != new.get(key))
+
+
+def diff_items(old_items: List[Dict], new_items: List[Dict], prefix: str = '') -> Tuple[Set[str], Set[str], Dict[str, List[str]]]:
+    """Returns (added, removed, {family: [changed field]}) between two item lists."""
+    old_digests = index_items(old_items)
+    new_digests = index_items(new_items)
+    added = new_digests.keys() - old_digests.keys()
+    removed = old_digests.keys() - new_digests.keys()
+
+    changed = {family for family in new_digests.keys() & old_digests.keys()
+               if new_digests[family] != old_digests[family]}
+    modified = {}
+    if changed:
+        old_by_family = {item['family']: item for item in old_items if item['family'] in changed}
+        for item in new_items:
+            if item['family'] in changed:
+                modified[item['family']] = [prefix + field for field in changed_fields(old_by_family[item['family']], item)]
+    return set(added), set(removed), modified
+
+
+def read_items(path: str) -> Optional[List[Dict]]:
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r') as f:
+        return json.load(f).get('items', [])
+
+
+def read_items_at(base: str, relpath: str) -> Optional[List[Dict]]:
+    """Items of a catalog file as committed at `base`, or None if it is not in that revision."""
+    result = subprocess.run(['git', 'show', f'{base}:{relpath}'], cwd=PROJECT_ROOT,
+                            capture_output=True)
+    if result.returncode != 0:
+        return None
+    return json.loads(result.stdout).get('items', [])
+
+
+def build_delta(current: Dict[str, Optional[List[Dict]]], previous: Dict[str, Optional[List[Dict]]]) -> Dict:
+    """
+    Merge the per-target diffs into one manifest keyed by family. A family
+    is added/removed when it is new to/gone from the whole catalog; joining
+    or leaving only one target (e.g. gaining a VF) is a modification of
+    that target's `*` field.
+    """
+    new_families: Set[str] = set()
+    old_families: Set[str] = set()
+    modified: Dict[str, List[str]] = {}
+
+    for relpath, prefix in TARGETS:
+        new_items = current.get(relpath) or []
+        old_items = previous.get(relpath) or []
+        new_families.update(item['family'] for item in new_items)
+        old_families.update(item['family'] for item in old_items)
+        target_added, target_removed, target_modified = diff_items(old_items, new_items, prefix)
+        for family in target_added | target_removed:
+            modified.setdefault(family, []).append(prefix + '*')
+        for family, fields in target_modified.items():
+            modified.setdefault(family, []).extend(fields)
+
+    added = new_families - old_families
+    removed = old_families - new_families
+    modified = {family: fields for family, fields in modified.items()
+                if family not in added and family not in removed}
+
+    return {
+        'version': 1,
+        'added': sorted(added),
+        'removed': sorted(removed),
+        'modified': {family: sorted(fields) for family, fields in sorted(modified.items())},
+        'unchanged': len(new_families - added - modified.keys()),
+    }
+
+
+def load_delta(path: str = DEFAULT_DELTA) -> Optional[Dict]:
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def load_changed_families(path: str = DEFAULT_DELTA) -> Optional[Set[str]]:
+    """Added and modified families of the delta manifest, or None if there is no manifest (do a full run)."""
+    delta = load_delta(path)
+    if delta is None:
+        return None
+    return set(delta['added']) | set(delta['modified'])
+
+
+@click.command()
+@click.option('--base', default='HEAD', help='Git revision holding the previous snapshot (default: HEAD).')
+@click.option('--previous-dir', type=click.Path(exists=True, file_okay=False),
+              help='Read the previous webfonts.json / webfonts-vf.json from this directory instead of git.')
+@click.option('--output', default=DEFAULT_DELTA, help='Delta manifest path.')
+@click.option('--verbose', '-v', is_flag=True, help='List every changed family.')
+def main(base: str, previous_dir: Optional[str], output: str, verbose: bool):
+    """Write the change manifest between the previous and current catalog."""
+    with ledger_stage('catalog_delta') as record:
+        current = {relpath: read_items(os.path.join(PROJECT_ROOT, relpath)) for relpath, _ in TARGETS}
+        if previous_dir:
+            previous = {relpath: read_items(os.path.join(previous_dir, os.path.basename(relpath)))
+                        for relpath, _ in TARGETS}
+        else:
+            previous = {relpath: read_items_at(base, relpath) for relpath, _ in TARGETS}
+
+        delta = build_delta(current, previous)
+        delta['base'] = previous_dir or base
+        record.add(items=sum(len(items or []) for items in current.values()),
+                   cache_hits=delta['unchanged'])
+
+        os.makedirs(os.path.dirname(output), exist_ok=True)
+        with open(output, 'w') as f:
+            json.dump(delta, f, indent=2, ensure_ascii=False)
+
+    print(f"Catalog delta against {delta['base']}: {len(delta['added'])} added, "
+          f"{len(delta['removed'])} removed, {len(delta['modified'])} modified, {delta['unchanged']} unchanged")
+    if verbose:
+        for family in delta['added']:
+            print(f"  + {family}")
+        for family in delta['removed']:
+            print(f"  - {family}")
+        for family, fields in delta['modified'].items():
+            print(f"  ~ {family}: {', '.join(fields)}")
+    print(f"Manifest written to {output}")
+
+
+if __name__ == '__main__':
+    main()
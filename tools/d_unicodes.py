@@ -1,29 +1,144 @@
 #!/usr/bin/env python3
 import argparse
 import io
+import os
+import re
 import sys
 import unicodedata
 
+try:
+    from fontTools.unicodedata import Blocks, Scripts, script_code
+except ImportError:
+    print("Error: fonttools is required. Install with: pip install fonttools")
+    sys.exit(1)
+
 SURROGATE_START = 0xD800
 SURROGATE_END = 0xDFFF
 UNICODE_MAX = 0x10FFFF
 
+# General categories excluded by --assigned-only: unassigned, private use and
+# controls (the code points that have no character name).
+UNASSIGNED_CATEGORIES = {"Cn", "Co", "Cc"}
+
+
+def category_runs():
+    """
+    Split the code space into maximal runs sharing one general category.
+    Computed once per run; every filter below works on these ranges instead
+    of on individual code points. Surrogates are never included.
+    """
+    runs = []
+    start = 0
+    current = unicodedata.category(chr(0))
+    for cp in range(1, UNICODE_MAX + 2):
+        cat = unicodedata.category(chr(cp)) if cp <= UNICODE_MAX else None
+        if cat != current:
+            if current != "Cs":
+                runs.append((start, cp - 1, current))
+            start, current = cp, cat
+    return runs
+
+
+def table_ranges(table, wanted):
+    """(start, end) ranges of a fontTools RANGES/VALUES table whose value is in `wanted`."""
+    ranges = []
+    for i, value in enumerate(table.VALUES):
+        if value in wanted:
+            end = table.RANGES[i + 1] - 1 if i + 1 < len(table.RANGES) else UNICODE_MAX
+            ranges.append((table.RANGES[i], end))
+    return ranges
+
+
+def intersect(ranges_a, ranges_b):
+    """Intersection of two sorted, non-overlapping lists of inclusive ranges."""
+    result = []
+    i = j = 0
+    while i < len(ranges_a) and j < len(ranges_b):
+        start = max(ranges_a[i][0], ranges_b[j][0])
+        end = min(ranges_a[i][1], ranges_b[j][1])
+        if start <= end:
+            result.append((start, end))
+        if ranges_a[i][1] < ranges_b[j][1]:
+            i += 1
+        else:
+            j += 1
+    return result
+
+
+def merge(ranges):
+    """Coalesce adjacent ranges, e.g. consecutive runs of different categories."""
+    merged = []
+    for start, end in ranges:
+        if merged and start == merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
 
-def iter_codepoints(assigned_only: bool):
-    for cp in range(0, UNICODE_MAX + 1):
-        # Skip UTF-16 surrogate code points: not valid Unicode scalar values
-        if SURROGATE_START <= cp <= SURROGATE_END:
+
+def normalize_block_name(name):
+    return re.sub(r"[\s_-]+", " ", name).strip().lower()
+
+
+def resolve_blocks(names):
+    known = {normalize_block_name(v): v for v in set(Blocks.VALUES) if v != "No_Block"}
+    blocks = set()
+    for name in names:
+        block = known.get(normalize_block_name(name))
+        if block is None:
+            raise SystemExit(f"Unknown Unicode block: {name!r}")
+        blocks.add(block)
+    return blocks
+
+
+def resolve_scripts(names):
+    scripts = set()
+    for name in names:
+        # Accept ISO 15924 codes ("Latn") as well as names ("Latin", "Old_Italic").
+        code = name.title() if len(name) == 4 and name.isalpha() else None
+        if code is None or code not in set(Scripts.VALUES):
+            code = script_code(name.replace("-", "_").replace(" ", "_"), default=None)
+        if code is None:
+            raise SystemExit(f"Unknown Unicode script: {name!r}")
+        scripts.add(code)
+    return scripts
+
+
+def select_ranges(assigned_only, categories=None, blocks=None, scripts=None):
+    """Inclusive code point ranges matching every given filter, in code point order."""
+    runs = category_runs()
+    selected = []
+    for start, end, cat in runs:
+        if assigned_only and cat in UNASSIGNED_CATEGORIES:
             continue
-        ch = chr(cp)
-        if assigned_only:
-            # unicodedata.name(...) raises for surrogates (already skipped)
-            # Returns None for unassigned in Python 3.11+ via default; older versions need try/except
-            try:
-                # If name lookup fails, it's unassigned
-                unicodedata.name(ch)
-            except ValueError:
-                continue
-        yield ch
+        # A category filter matches either the full value ("Lu") or its major class ("L").
+        if categories and cat not in categories and cat[0] not in categories:
+            continue
+        selected.append((start, end))
+    selected = merge(selected)
+    if blocks:
+        selected = intersect(selected, table_ranges(Blocks, blocks))
+    if scripts:
+        selected = intersect(selected, table_ranges(Scripts, scripts))
+    return selected
+
+
+def write_ranges(f, ranges, sep, chunk):
+    """Write every code point of `ranges` in slices of `chunk` characters. Returns the count."""
+    count = 0
+    for start, end in ranges:
+        for slice_start in range(start, end + 1, chunk):
+            slice_end = min(slice_start + chunk, end + 1)
+            text = "".join(map(chr, range(slice_start, slice_end)))
+            if sep:
+                text = sep.join(text) + sep
+            f.write(text)
+            count += slice_end - slice_start
+    return count
+
+
+def block_slug(block):
+    return re.sub(r"[^a-z0-9]+", "-", block.lower()).strip("-")
 
 
 def main():
@@ -32,7 +147,7 @@ def main():
     )
     parser.add_argument(
         "--out", default="unicodes.utf8",
-        help="Output file path (default: unicodes.utf8)"
+        help="Output file path, or '-' for stdout (default: unicodes.utf8)"
     )
     parser.add_argument(
         "--encoding", choices=["utf-8", "utf-16", "utf-32"], default="utf-8",
@@ -40,7 +155,23 @@ def main():
     )
     parser.add_argument(
         "--assigned-only", action="store_true",
-        help="Include only assigned characters (skip unassigned)."
+        help="Include only assigned characters (skip unassigned, private-use and control code points)."
+    )
+    parser.add_argument(
+        "--block", action="append", default=[],
+        help="Only include this Unicode block, e.g. 'Basic Latin' (repeatable)."
+    )
+    parser.add_argument(
+        "--script", action="append", default=[],
+        help="Only include this Unicode script, as a name or ISO 15924 code, e.g. 'Greek' or 'Grek' (repeatable)."
+    )
+    parser.add_argument(
+        "--category", action="append", default=[],
+        help="Only include this general category, e.g. 'Lu' or the major class 'L' (repeatable)."
+    )
+    parser.add_argument(
+        "--split-blocks", metavar="DIR",
+        help="Write one file per Unicode block into DIR instead of a single output."
     )
     parser.add_argument(
         "--separator", choices=["none", "newline", "null"], default="none",
@@ -56,23 +187,40 @@ def main():
     sep = "" if args.separator == "none" else (
         "\n" if args.separator == "newline" else "\x00")
 
-    # Use a text stream so UTF-16/32 write the BOM once at the start
-    with io.open(args.out, "w", encoding=args.encoding, newline="") as f:
-        buf = []
+    blocks = resolve_blocks(args.block) if args.block else None
+    scripts = resolve_scripts(args.script) if args.script else None
+    ranges = select_ranges(args.assigned_only, set(args.category), blocks, scripts)
+
+    if args.split_blocks:
+        os.makedirs(args.split_blocks, exist_ok=True)
         count = 0
-        for ch in iter_codepoints(args.assigned_only):
-            buf.append(ch)
-            if sep:
-                buf.append(sep)
-            if len(buf) >= args.chunk:
-                f.write("".join(buf))
-                buf.clear()
-            count += 1
-        if buf:
-            f.write("".join(buf))
+        files = 0
+        for block in sorted(blocks or set(Blocks.VALUES) - {"No_Block"}):
+            block_ranges = intersect(ranges, table_ranges(Blocks, {block}))
+            if not block_ranges:
+                continue
+            path = os.path.join(args.split_blocks, f"{block_slug(block)}.txt")
+            with io.open(path, "w", encoding=args.encoding, newline="") as f:
+                count += write_ranges(f, block_ranges, sep, args.chunk)
+            files += 1
+        print(
+            f"Done. Wrote {count} characters to {files} files in {args.split_blocks} "
+            f"(encoding={args.encoding}, separator={args.separator}).", file=sys.stderr)
+        return
+
+    if args.out == "-":
+        # Use a text stream so UTF-16/32 write the BOM once at the start
+        f = io.TextIOWrapper(sys.stdout.buffer, encoding=args.encoding, newline="")
+        count = write_ranges(f, ranges, sep, args.chunk)
+        f.flush()
+        f.detach()
+    else:
+        with io.open(args.out, "w", encoding=args.encoding, newline="") as f:
+            count = write_ranges(f, ranges, sep, args.chunk)
 
     print(
-        f"Done. Wrote {count} characters to {args.out} (encoding={args.encoding}, separator={args.separator}).")
+        f"Done. Wrote {count} characters to {args.out} (encoding={args.encoding}, separator={args.separator}).",
+        file=sys.stderr if args.out == "-" else sys.stdout)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,35 @@
+"""
+Family ids.
+
+Two id forms are derived from a family name:
+
+- the folder id, used for vendor/google/<license>/<id>/ and the SVG preview
+  file names: lower-cased with all whitespace removed ("Open Sans" ->
+  "opensans");
+- the URL id, used by www routes (www/lib/fontid.ts `familyToId`):
+  lower-cased, runs of anything but [a-z0-9] collapsed to "-" ("Open Sans"
+  -> "open-sans").
+"""
+
+import re
+
+
+def normalize_family_name(family_name: str) -> str:
+    """
+    Convert family name to family id (folder id) format:
+    - Remove all spaces
+    - Convert to lowercase
+    """
+    if not family_name:
+        return ""
+
+    # Remove all spaces and convert to lowercase
+    normalized = re.sub(r'\s+', '', family_name.lower())
+    return normalized
+
+
+def family_to_id(family_name: str) -> str:
+    """URL id for a family name; must match familyToId in www/lib/fontid.ts."""
+    normalized = re.sub(r'[^a-z0-9\s]', ' ', family_name.lower().strip())
+    normalized = re.sub(r'\s+', '-', normalized)
+    return normalized.strip('-')
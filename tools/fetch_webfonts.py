@@ -5,26 +5,42 @@ Requires a Google Fonts API key. Supply via --api-key or GOOGLE_FONTS_API_KEY en
 
 Refuses to overwrite the output file if the API returns fewer than MIN_ITEMS items
 (sanity gate against a bad/empty response wiping the committed data).
+
+Both targets are fetched concurrently and conditionally: the ETag /
+Last-Modified of each response and the digest of the file written from it
+are kept in .cache/fetch-webfonts.json. A 304, or a payload that serializes
+to the bytes already on disk, leaves the file untouched, so the pipeline
+skips the stages downstream of it.
 """
 
+import hashlib
 import json
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
 
 import click
 import requests
 
+from run_ledger import ledger_stage
+
 API = "https://www.googleapis.com/webfonts/v1/webfonts"
 MIN_ITEMS = 1500
-DEFAULT_OUT_DIR = os.path.join(
-    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
-    "www",
-    "public",
-)
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_OUT_DIR = os.path.join(PROJECT_ROOT, "www", "public")
+DEFAULT_STATE = os.path.join(PROJECT_ROOT, ".cache", "fetch-webfonts.json")
+
 
+class NotModified(Exception):
+    """The server answered 304 to a conditional request."""
 
-def fetch(params: dict) -> dict:
-    r = requests.get(API, params=params, timeout=60)
+
+def fetch(params: dict, api: str = API, headers: Optional[dict] = None) -> tuple:
+    """Returns (data, response size in bytes, response headers). Raises NotModified on 304."""
+    r = requests.get(api, params=params, headers=headers or {}, timeout=60)
+    if r.status_code == 304:
+        raise NotModified()
     r.raise_for_status()
     data = r.json()
     items = data.get("items")
@@ -39,7 +55,78 @@ def fetch(params: dict) -> dict:
     for key in ("family", "variants", "files", "subsets"):
         if key not in sample:
             raise RuntimeError(f"sample item missing required key '{key}': {sample}")
-    return data
+    return data, len(r.content), r.headers
+
+
+def serialize(data: dict) -> bytes:
+    # Sort items by family so diffs are stable across runs; consumers
+    # always look up by family name, so array order is never load-bearing.
+    data["items"].sort(key=lambda item: item["family"])
+    return json.dumps(data, indent=2, sort_keys=True).encode("utf-8")
+
+
+def file_digest(path: str) -> Optional[str]:
+    if not os.path.exists(path):
+        return None
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def load_state(path: str) -> Dict[str, dict]:
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except ValueError:
+        return {}
+
+
+def save_state(path: str, state: Dict[str, dict]):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+
+
+def conditional_headers(entry: dict, path: str) -> dict:
+    """Validators from the last fetch, but only while the file they describe is still on disk unchanged."""
+    if not entry or entry.get("digest") != file_digest(path):
+        return {}
+    headers = {}
+    if entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+    if entry.get("last_modified"):
+        headers["If-Modified-Since"] = entry["last_modified"]
+    return headers
+
+
+def fetch_target(api: str, params: dict, path: str, entry: dict) -> dict:
+    """
+    Fetch one target and write it if it changed.
+
+    Returns {status: 'not-modified' | 'unchanged' | 'written', entry, items, bytes}.
+    """
+    try:
+        data, size, headers = fetch(params, api, conditional_headers(entry, path))
+    except NotModified:
+        return {"status": "not-modified", "entry": entry, "items": 0, "bytes": 0}
+
+    payload = serialize(data)
+    digest = hashlib.sha256(payload).hexdigest()
+    status = "unchanged" if digest == file_digest(path) else "written"
+    if status == "written":
+        # Write next to the target and rename, so readers never see a partial file
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+
+    entry = {
+        "etag": headers.get("ETag"),
+        "last_modified": headers.get("Last-Modified"),
+        "digest": digest,
+    }
+    return {"status": status, "entry": entry, "items": len(data["items"]), "bytes": size}
 
 
 @click.command()
@@ -48,30 +135,51 @@ def fetch(params: dict) -> dict:
 @click.option("--out-dir", default=DEFAULT_OUT_DIR, type=click.Path(file_okay=False),
               help="Directory to write webfonts.json and webfonts-vf.json into.")
 @click.option("--sort", default="popularity", help="API sort parameter.")
-def main(api_key: str, out_dir: str, sort: str):
+@click.option("--api-url", default=API, show_default=True, help="Webfonts API endpoint.")
+@click.option("--state", "state_path", default=DEFAULT_STATE, type=click.Path(dir_okay=False),
+              help="File keeping the ETag/Last-Modified/digest of each target.")
+@click.option("--force", is_flag=True, help="Fetch unconditionally, ignoring stored validators.")
+def main(api_key: str, out_dir: str, sort: str, api_url: str, state_path: str, force: bool):
     os.makedirs(out_dir, exist_ok=True)
 
     targets = [
         ("webfonts.json", {"key": api_key, "sort": sort}),
         ("webfonts-vf.json", {"key": api_key, "sort": sort, "capability": "VF"}),
     ]
+    state = {} if force else load_state(state_path)
 
-    for filename, params in targets:
-        click.echo(f"Fetching {filename} ...", err=True)
-        try:
-            data = fetch(params)
-        except Exception as e:
-            click.echo(f"ERROR fetching {filename}: {e}", err=True)
-            sys.exit(1)
+    with ledger_stage("fetch_webfonts") as record:
+        click.echo(f"Fetching {', '.join(name for name, _ in targets)} ...", err=True)
+        with ThreadPoolExecutor(max_workers=len(targets)) as executor:
+            futures = {
+                filename: executor.submit(fetch_target, api_url, params,
+                                          os.path.join(out_dir, filename), state.get(filename, {}))
+                for filename, params in targets
+            }
 
-        # Sort items by family so diffs are stable across runs; consumers
-        # always look up by family name, so array order is never load-bearing.
-        data["items"].sort(key=lambda item: item["family"])
+        failed = False
+        for filename, future in futures.items():
+            path = os.path.join(out_dir, filename)
+            try:
+                result = future.result()
+            except Exception as e:
+                record.failure(filename, str(e))
+                click.echo(f"ERROR fetching {filename}: {e}", err=True)
+                failed = True
+                continue
 
-        path = os.path.join(out_dir, filename)
-        with open(path, "w") as f:
-            json.dump(data, f, indent=2, sort_keys=True)
-        click.echo(f"  wrote {path} ({len(data['items'])} items)", err=True)
+            state[filename] = result["entry"]
+            record.add(items=result["items"], bytes_read=result["bytes"],
+                       cache_hits=int(result["status"] != "written"))
+            if result["status"] == "written":
+                click.echo(f"  wrote {path} ({result['items']} items)", err=True)
+            else:
+                click.echo(f"  {path} unchanged ({result['status']})", err=True)
+
+        # Validators of the targets that did succeed are still worth keeping
+        save_state(state_path, state)
+        if failed:
+            sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -1,21 +1,8 @@
 import click
 import json
-import re
 from pathlib import Path
 
-
-def normalize_family_name(family_name: str) -> str:
-    """
-    Convert family name to font ID format:
-    - Remove all spaces
-    - Convert to lowercase
-    """
-    if not family_name:
-        return ""
-
-    # Remove all spaces and convert to lowercase
-    normalized = re.sub(r'\s+', '', family_name.lower())
-    return normalized
+from family_id import normalize_family_name
 
 
 @click.command()
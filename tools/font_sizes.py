@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Font Size Analytics
+
+Walks the Google Fonts repository once and reports where the payload bytes
+go: the N smallest and largest font files, and totals per sfnt table (glyf,
+CFF, GPOS, cmap, name, ...), per family, per license directory and per file
+format. Table sizes come from the table directory only; no font is parsed.
+
+Replaces find_smallest_fonts.py (its report is `--top 100` smallest files).
+
+@see https://gist.github.com/softmarshmallow/11902f1ef4676e02c85ff796639cef58
+
+Usage:
+    python font_sizes.py [--fonts-dir vendor/google] [--top 100] [--output sizes.json]
+"""
+
+import csv
+import heapq
+import json
+import os
+import sys
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Tuple
+
+import click
+
+from sfnt import SfntError, read_table_sizes
+
+FONT_EXTENSIONS = ('.ttf', '.otf', '.woff', '.woff2')
+
+# Tables given their own column in the per-file CSV; everything else is summed into "other".
+CSV_TABLES = ['glyf', 'loca', 'CFF ', 'CFF2', 'gvar', 'GPOS', 'GSUB', 'GDEF', 'HVAR',
+              'cmap', 'hmtx', 'name', 'post', 'COLR', 'CBDT', 'SVG ']
+
+
+def walk_fonts(fonts_dir: str) -> Iterator[Tuple[str, int]]:
+    """Yield (path, size) for every font file below fonts_dir, in a single scandir walk."""
+    stack = [fonts_dir]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if not entry.name.startswith('.'):
+                            stack.append(entry.path)
+                    elif entry.name.lower().endswith(FONT_EXTENSIONS):
+                        yield entry.path, entry.stat().st_size
+        except OSError as e:
+            print(f"Warning: cannot read {directory}: {e}", file=sys.stderr)
+
+
+def classify(fonts_dir: str, path: str) -> Tuple[str, str]:
+    """(license, family) for a path laid out as <fonts_dir>/<license>/<family>/..."""
+    parts = os.path.relpath(path, fonts_dir).split(os.sep)
+    if len(parts) >= 3:
+        return parts[0], parts[1]
+    if len(parts) == 2:
+        return '', parts[0]
+    return '', ''
+
+
+class BoundedHeap:
+    """Keeps the n largest items pushed (by key) using a fixed-size min-heap."""
+
+    def __init__(self, n: int):
+        self.n = n
+        self.heap: List = []
+
+    def push(self, key, item):
+        if len(self.heap) < self.n:
+            heapq.heappush(self.heap, (key, item))
+        elif key > self.heap[0][0]:
+            heapq.heapreplace(self.heap, (key, item))
+
+    def items(self) -> List:
+        return [item for _, item in self.heap]
+
+
+def add_to(group: Dict, size: int, tables: Dict[str, int]):
+    group['files'] = group.get('files', 0) + 1
+    group['bytes'] = group.get('bytes', 0) + size
+    group_tables = group.setdefault('tables', {})
+    for tag, length in tables.items():
+        group_tables[tag] = group_tables.get(tag, 0) + length
+
+
+def analyze(fonts_dir: str, top_n: int) -> Tuple[Dict, List[Dict]]:
+    """Aggregate sizes across the corpus. Returns (report, per-file rows)."""
+    smallest = BoundedHeap(top_n)
+    largest = BoundedHeap(top_n)
+    totals: Dict = {}
+    by_format: Dict[str, Dict] = {}
+    by_license: Dict[str, Dict] = {}
+    by_family: Dict[str, Dict] = {}
+    by_table: Dict[str, Dict] = {}
+    rows = []
+    unreadable = []
+
+    for path, size in walk_fonts(fonts_dir):
+        try:
+            tables = read_table_sizes(path)
+        except (OSError, SfntError) as e:
+            unreadable.append({'path': path, 'error': str(e)})
+            tables = {}
+
+        license_dir, family = classify(fonts_dir, path)
+        fmt = os.path.splitext(path)[1].lower().lstrip('.')
+        record = {'path': path, 'family': family, 'license': license_dir, 'format': fmt, 'size': size}
+
+        # Negate for the smallest heap so a min-heap keeps the n smallest sizes
+        smallest.push((-size, path), record)
+        largest.push((size, path), record)
+
+        add_to(totals, size, tables)
+        add_to(by_format.setdefault(fmt, {}), size, tables)
+        add_to(by_license.setdefault(license_dir, {}), size, tables)
+        family_group = by_family.setdefault(family, {'license': license_dir})
+        add_to(family_group, size, tables)
+        for tag, length in tables.items():
+            table_group = by_table.setdefault(tag, {'fonts': 0, 'bytes': 0})
+            table_group['fonts'] += 1
+            table_group['bytes'] += length
+
+        rows.append(dict(record, tables=tables))
+
+    report = {
+        'generated_at': datetime.now(timezone.utc).isoformat(),
+        'fonts_dir': fonts_dir,
+        'totals': totals,
+        'by_table': dict(sorted(by_table.items(), key=lambda kv: kv[1]['bytes'], reverse=True)),
+        'by_format': by_format,
+        'by_license': by_license,
+        'by_family': dict(sorted(by_family.items())),
+        'smallest': sorted(smallest.items(), key=lambda r: (r['size'], r['path'])),
+        'largest': sorted(largest.items(), key=lambda r: (-r['size'], r['path'])),
+        'unreadable': unreadable,
+    }
+    return report, rows
+
+
+def write_csv(output: str, rows: List[Dict]):
+    """One row per font file, with a column per common table."""
+    with open(output, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['path', 'family', 'license', 'format', 'size_bytes']
+                        + [tag.strip() for tag in CSV_TABLES] + ['other_tables'])
+        for row in sorted(rows, key=lambda r: r['path']):
+            tables = row['tables']
+            other = sum(length for tag, length in tables.items() if tag not in CSV_TABLES)
+            writer.writerow([row['path'], row['family'], row['license'], row['format'], row['size']]
+                            + [tables.get(tag, 0) for tag in CSV_TABLES] + [other])
+
+
+@click.command()
+@click.option('--fonts-dir', default='vendor/google', help='Directory containing font files (default: vendor/google)')
+@click.option('--top', 'top_n', default=100, type=int, help='Number of smallest/largest files to report (default: 100)')
+@click.option('--output', help='Output file (JSON report, or per-file CSV if it ends in .csv)')
+def main(fonts_dir: str, top_n: int, output: str):
+    """Break down font payload sizes by file, table, family, license and format."""
+    if not os.path.isdir(fonts_dir):
+        print(f"Error: Directory {fonts_dir} does not exist")
+        sys.exit(1)
+
+    report, rows = analyze(fonts_dir, top_n)
+    totals = report['totals']
+    if not rows:
+        print(f"No font files found in {fonts_dir}")
+        sys.exit(1)
+
+    print(f"Found {totals['files']} font files ({totals['bytes'] / (1024 * 1024):.1f} MB)")
+
+    print(f"\nBytes by table:")
+    for tag, group in list(report['by_table'].items())[:15]:
+        share = group['bytes'] / totals['bytes']
+        print(f"  {tag:<5} {group['bytes'] / (1024 * 1024):>9.1f} MB  {share:>6.1%}  ({group['fonts']} fonts)")
+
+    print(f"\nBytes by license:")
+    for license_dir, group in sorted(report['by_license'].items()):
+        print(f"  {license_dir or '-':<8} {group['files']:>6} files {group['bytes'] / (1024 * 1024):>9.1f} MB")
+
+    print(f"\nBytes by format:")
+    for fmt, group in sorted(report['by_format'].items()):
+        print(f"  {fmt:<8} {group['files']:>6} files {group['bytes'] / (1024 * 1024):>9.1f} MB")
+
+    print(f"\nTop 10 smallest fonts:")
+    for i, record in enumerate(report['smallest'][:10], 1):
+        print(f"{i:2d}. {record['size'] / 1024:6.1f} KB - {record['path']}")
+
+    print(f"\nTop 10 largest fonts:")
+    for i, record in enumerate(report['largest'][:10], 1):
+        print(f"{i:2d}. {record['size'] / 1024:8.1f} KB - {record['path']}")
+
+    if report['unreadable']:
+        print(f"\nWarning: {len(report['unreadable'])} files have no readable table directory")
+
+    if output:
+        if output.endswith('.csv'):
+            write_csv(output, rows)
+        else:
+            with open(output, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"\nResults written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 import requests
+import hashlib
 import json
 from fontTools.ttLib import TTFont
 from fontTools.pens.svgPathPen import SVGPathPen
@@ -10,56 +11,242 @@ from tqdm import tqdm
 from scour import scour
 import re
 
-
-def normalize_family_name(family_name: str) -> str:
+from catalog_delta import load_changed_families
+from family_id import normalize_family_name
+from run_ledger import StageRecord
+from sample_texts import SampleCoverage, build_samples, load_subset_names
+
+# Bump whenever a change to the rendering code alters the SVG output. Every
+# manifest entry records the version it was rendered with, so a bump
+# invalidates all previews on the next run.
+RENDERER_VERSION = 2
+
+
+# Font names in their native scripts - checked before the generic subset samples
+NATIVE_NAMES = {
+    'Chenla': 'ចេនឡា',  # Khmer (Chenla)
+    'Content': 'មាតិការ',  # Khmer (Content)
+    'Karla Tamil Inclined': 'கரளா தமிழ் சாய்ந்த',  # Tamil
+    'Karla Tamil Upright': 'கரளா தமிழ் நிமிர்ந்த',  # Tamil
+    'Khmer': 'ខ្មែរ',  # Khmer
+    'Noto Color Emoji': '🎨😀📝',  # Emoji
+    'Noto Emoji': '😀🎨📝',  # Emoji
+    'Noto Sans Lycian': '𐊀𐊁𐊂',  # Lycian characters
+    'Noto Sans Myanmar': 'နိုတို စန်းမြန်မာ',  # Myanmar
+    'Noto Serif Myanmar': 'နိုတို စဲရစ် မြန်မာ',  # Myanmar
+    'Phetsarath': 'ເພັດສະລາດ',  # Lao
+    'Siemreap': 'សៀមរាប',  # Khmer
+}
+
+
+def get_sample_text_for_font(font_info, subset, cmap_codepoints, coverage: SampleCoverage):
     """
-    Convert family name to font ID format:
-    - Remove all spaces
-    - Convert to lowercase
+    Get a sample text the font can fully render, for fonts that cannot render
+    their own family name.
+    Tries the family's name in its native script, then a sample for the
+    requested subset and each subset the family declares, then every other
+    known subset (declared subsets are not always accurate).
+    Returns None only if the font covers none of the samples.
     """
-    if not family_name:
-        return ""
+    family = font_info.get('family', '')
+
+    native_name = NATIVE_NAMES.get(family)
+    if native_name and all(ord(char) in cmap_codepoints for char in native_name):
+        return native_name
+
+    return coverage.first_covered(
+        cmap_codepoints, [subset] + font_info.get('subsets', []))
+
 
-    # Remove all spaces and convert to lowercase
-    normalized = re.sub(r'\s+', '', family_name.lower())
-    return normalized
+def load_font_from_url(url):
+    if os.path.isfile(url):
+        with open(url, 'rb') as f:
+            return io.BytesIO(f.read())
+    response = requests.get(url)
+    response.raise_for_status()
+    return io.BytesIO(response.content)
 
 
-def get_sample_text_for_font(font_info, subset):
+def source_fingerprint(font_url: str) -> str:
     """
-    Get appropriate sample text based on the font's subsets.
-    Returns the font's name in its native script when possible.
+    Identify the font binary a preview was rendered from.
+    Remote URLs are versioned by gstatic, so the URL itself is the fingerprint;
+    local files are hashed since their path does not change with the content.
     """
-    family = font_info.get('family', '')
+    if os.path.isfile(font_url):
+        digest = hashlib.sha256()
+        with open(font_url, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+        return f"sha256:{digest.hexdigest()}"
+    return font_url
 
-    # Font names in their native scripts - no latin support at all
-    native_names = {
-        'Chenla': 'ចេនឡា',  # Khmer (Chenla)
-        'Content': 'មាតិការ',  # Khmer (Content)
-        'Karla Tamil Inclined': 'கரளா தமிழ் சாய்ந்த',  # Tamil
-        'Karla Tamil Upright': 'கரளா தமிழ் நிமிர்ந்த',  # Tamil
-        'Khmer': 'ខ្មែរ',  # Khmer
-        'Noto Color Emoji': '🎨😀📝',  # Emoji
-        'Noto Emoji': '😀🎨📝',  # Emoji
-        'Noto Sans Lycian': '𐊀𐊁𐊂',  # Lycian characters
-        'Noto Sans Myanmar': 'နိုတို စန်းမြန်မာ',  # Myanmar
-        'Noto Serif Myanmar': 'နိုတို စဲရစ် မြန်မာ',  # Myanmar
-        'Phetsarath': 'ເພັດສະລາດ',  # Lao
-        'Siemreap': 'សៀមរាប',  # Khmer
+
+def render_inputs(font_info, variant: str, font_url: str, font_size: int) -> dict:
+    """
+    Everything that determines the content of a preview SVG.
+    Two runs with equal inputs produce the same file, so the render can be skipped.
+    """
+    return {
+        'text': font_info['family'],
+        'version': font_info.get('version'),
+        'last_modified': font_info.get('lastModified'),
+        'variant': variant,
+        'source': source_fingerprint(font_url),
+        'font_size': font_size,
+        'renderer': RENDERER_VERSION,
     }
 
-    # Only return native name if explicitly supported
-    if family in native_names:
-        return native_names[family]
 
-    # Return None if no native name mapping exists
-    return None
+def default_manifest_path(output_folder: str) -> str:
+    """The manifest lives beside the output folder, e.g. www/public/svg.manifest.json."""
+    return os.path.normpath(output_folder) + '.manifest.json'
 
 
-def load_font_from_url(url):
-    response = requests.get(url)
-    response.raise_for_status()
-    return io.BytesIO(response.content)
+def load_manifest(path: str) -> dict:
+    """font_id -> recorded render inputs. Missing or empty manifests load as {}."""
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r') as f:
+        content = f.read().strip()
+    if not content:
+        return {}
+    return json.loads(content).get('entries', {})
+
+
+def save_manifest(path: str, entries: dict):
+    # Write to a temp file first so an interrupted run never leaves a
+    # truncated manifest behind (which would force a full re-render).
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump({'renderer': RENDERER_VERSION, 'entries': entries},
+                  f, indent=2, sort_keys=True, ensure_ascii=False)
+        f.write('\n')
+    os.replace(tmp_path, path)
+
+
+def is_up_to_date(entry, inputs: dict) -> bool:
+    """True when a manifest entry was produced from exactly these inputs."""
+    if not entry:
+        return False
+    return all(entry.get(key) == value for key, value in inputs.items())
+
+
+def load_failed_log(path: str) -> list:
+    """Entries of a previous failed_fonts.log, or [] if there is none."""
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r') as f:
+        content = f.read().strip()
+    return json.loads(content) if content else []
+
+
+def prune_orphans(output_folder: str, manifest: dict, font_ids: set, verbose: bool = False) -> int:
+    """
+    Delete SVGs (and their manifest entries) for families no longer in the catalog.
+    Returns the number of files removed.
+    """
+    removed = 0
+    for filename in os.listdir(output_folder):
+        stem, ext = os.path.splitext(filename)
+        if ext != '.svg' or stem in font_ids:
+            continue
+        os.remove(os.path.join(output_folder, filename))
+        removed += 1
+        if verbose:
+            tqdm.write(f"Pruned orphan SVG {filename}")
+    for font_id in list(manifest):
+        if font_id not in font_ids:
+            del manifest[font_id]
+    return removed
+
+
+def _value_x_advance(value_record) -> int:
+    if value_record is None:
+        return 0
+    return getattr(value_record, 'XAdvance', 0) or 0
+
+
+def _pair_pos_subtables(gpos):
+    """Yield the PairPos subtables of every `kern` feature lookup, one list per lookup, in lookup order."""
+    if gpos.FeatureList is None or gpos.LookupList is None:
+        return
+    lookup_indices = set()
+    for record in gpos.FeatureList.FeatureRecord:
+        if record.FeatureTag == 'kern':
+            lookup_indices.update(record.Feature.LookupListIndex)
+    for index in sorted(lookup_indices):
+        lookup = gpos.LookupList.Lookup[index]
+        subtables = []
+        for subtable in lookup.SubTable:
+            if lookup.LookupType == 9:
+                if subtable.ExtensionLookupType != 2:
+                    continue
+                subtable = subtable.ExtSubTable
+            elif lookup.LookupType != 2:
+                continue
+            subtables.append(subtable)
+        yield subtables
+
+
+def get_gpos_kerning_pairs(font, glyphs: set):
+    """
+    Flatten the GPOS `kern` PairPos lookups (format 1 glyph pairs and format 2
+    class pairs) into {(left, right): x_advance} for the given glyphs only.
+    Returns None when the font has no GPOS kern feature.
+
+    Within a lookup the first subtable covering a pair wins; adjustments of
+    separate lookups are added, as a shaper would apply them.
+    """
+    if 'GPOS' not in font:
+        return None
+    lookups = list(_pair_pos_subtables(font['GPOS'].table))
+    if not lookups:
+        return None
+
+    pairs = {}
+    for subtables in lookups:
+        lookup_pairs = {}
+        for subtable in subtables:
+            coverage = {glyph: i for i, glyph in enumerate(subtable.Coverage.glyphs)}
+            lefts = [glyph for glyph in glyphs if glyph in coverage]
+            if not lefts:
+                continue
+            if subtable.Format == 1:
+                for left in lefts:
+                    for record in subtable.PairSet[coverage[left]].PairValueRecord:
+                        if record.SecondGlyph in glyphs:
+                            lookup_pairs.setdefault(
+                                (left, record.SecondGlyph), _value_x_advance(record.Value1))
+            elif subtable.Format == 2:
+                class_defs1 = subtable.ClassDef1.classDefs if subtable.ClassDef1 else {}
+                class_defs2 = subtable.ClassDef2.classDefs if subtable.ClassDef2 else {}
+                for left in lefts:
+                    class2_records = subtable.Class1Record[class_defs1.get(left, 0)].Class2Record
+                    for right in glyphs:
+                        value = class2_records[class_defs2.get(right, 0)].Value1
+                        lookup_pairs.setdefault((left, right), _value_x_advance(value))
+        for pair, value in lookup_pairs.items():
+            if value:
+                pairs[pair] = pairs.get(pair, 0) + value
+    return pairs
+
+
+def build_kerning_pairs(font, glyph_names) -> dict:
+    """
+    Precompute every kerning adjustment needed to draw `glyph_names`, so the
+    draw loop does a single dict lookup per glyph pair. GPOS is preferred;
+    the legacy `kern` table is only consulted for fonts without GPOS kerning.
+    """
+    pairs = get_gpos_kerning_pairs(font, set(glyph_names))
+    if pairs is not None:
+        return pairs
+    pairs = {}
+    for left, right in zip(glyph_names, glyph_names[1:]):
+        kerning = get_kerning(font, left, right)
+        if kerning:
+            pairs[(left, right)] = kerning
+    return pairs
 
 
 def get_kerning(font, left_glyph, right_glyph):
@@ -72,14 +259,54 @@ def get_kerning(font, left_glyph, right_glyph):
     return 0
 
 
-def text_to_svg_path(text, font_url, font_size=16):
+def load_font(font_url) -> TTFont:
+    """
+    Open a font lazily: tables are decoded on first access and glyf/CFF
+    outlines only when a glyph is drawn, so rendering a short preview string
+    never decodes the thousands of other glyphs in large (e.g. CJK) fonts.
+    Local files are read through the file handle instead of being copied
+    into memory. Callers should close() the returned font.
+    """
+    if os.path.isfile(font_url):
+        return TTFont(font_url, lazy=True)
+    return TTFont(load_font_from_url(font_url), lazy=True)
+
+
+def font_source_size(font: TTFont) -> int:
+    """Size in bytes of the file or buffer a font was opened from."""
+    source = font.reader.file
+    position = source.tell()
+    source.seek(0, io.SEEK_END)
+    size = source.tell()
+    source.seek(position)
+    return size
+
+
+def text_to_svg_path(text, font, font_size=16, kern=True):
     """
     Convert text to SVG path content.
+    `font` is an opened TTFont (see load_font) or a font URL / local path.
+    Pass kern=False to lay glyphs out on their advance widths only.
     Returns the SVG content as string, or None if any character is missing.
     """
-    font_file = load_font_from_url(font_url)
-    font = TTFont(font_file)
+    if not isinstance(font, TTFont):
+        with load_font(font) as opened:
+            return text_to_svg_path(text, opened, font_size=font_size, kern=kern)
+
+    # Resolve the cmap once and map the whole string before decoding any
+    # outline, so a missing character bails out without touching glyf/CFF.
+    cmap = font.getBestCmap()
+    glyph_names = []
+    for char in text:
+        char_code = ord(char)
+        if char_code not in cmap:
+            # Return None if any character is missing
+            return None
+        glyph_names.append(cmap[char_code])
+
     glyph_set = font.getGlyphSet()
+    hmtx = font['hmtx']
+    kerning_pairs = build_kerning_pairs(font, glyph_names) if kern else {}
 
     # Calculate scale for specified font size
     scale = font_size / font['head'].unitsPerEm
@@ -90,22 +317,12 @@ def text_to_svg_path(text, font_url, font_size=16):
     text_group = svgwrite.container.Group()
     previous_glyph_name = None
 
-    for char in text:
-        cmap = font.getBestCmap()
-        char_code = ord(char)
-        if char_code not in cmap:
-            # Return None if any character is missing
-            return None
-
-        glyph_name = cmap[char_code]
+    for glyph_name in glyph_names:
         glyph = glyph_set[glyph_name]
 
-        advance_width, _ = font['hmtx'][glyph_name]
+        advance_width, _ = hmtx[glyph_name]
 
-        if previous_glyph_name is not None:
-            kerning = get_kerning(font, previous_glyph_name, glyph_name)
-        else:
-            kerning = 0
+        kerning = kerning_pairs.get((previous_glyph_name, glyph_name), 0)
 
         pen = SVGPathPen(glyph_set)
         glyph.draw(pen)
@@ -164,21 +381,57 @@ def text_to_svg_path(text, font_url, font_size=16):
 @click.command()
 @click.argument('fonts_json', type=click.Path(exists=True), default='./webfonts.json')
 @click.argument('output_folder', type=click.Path(exists=True), default='./www/public/svg')
-@click.option('--overwrite', is_flag=True, help="Overwrite existing SVG files. By default, existing files are skipped.")
+@click.option('--overwrite', is_flag=True, help="Re-render every SVG, ignoring the manifest.")
 @click.option('--font-size', default=16, help="Set the font size for SVG rendering.", type=int)
 @click.option('--subset', default='latin', help="Specify the subset to use. Defaults to 'latin'.")
 @click.option('--log-file', default='./failed_fonts.log', help="Log file for failed fonts. Defaults to './failed_fonts.log'.")
+@click.option('--manifest', 'manifest_path', default=None,
+              help="Render manifest path. Defaults to '<output_folder>.manifest.json'.")
+@click.option('--adopt-existing', is_flag=True,
+              help="Record existing SVGs that have no manifest entry instead of re-rendering them. "
+                   "Adopted entries carry no renderer version, so a later run without this flag re-renders them.")
+@click.option('--no-prune', is_flag=True, help="Keep SVGs of families that are no longer in the catalog.")
+@click.option('--only-changed', is_flag=True,
+              help="Only render families added or modified in the catalog delta manifest (see catalog_delta.py).")
 @click.option('--verbose', '-v', is_flag=True, help="Show verbose output including skip messages.")
-def generate_svgs(fonts_json, output_folder, overwrite, font_size, subset, log_file, verbose):
+def generate_svgs(fonts_json, output_folder, overwrite, font_size, subset, log_file, manifest_path,
+                  adopt_existing, no_prune, only_changed, verbose):
     with open(fonts_json, 'r') as file:
         webfontlist = json.load(file)
         fonts_data = webfontlist.get('items')
 
+    # Sample texts for every subset we know of, with codepoint sets computed once per run
+    catalog_subsets = {name for font_info in fonts_data for name in font_info.get('subsets', [])}
+    coverage = SampleCoverage(build_samples(
+        list(load_subset_names()) + sorted(catalog_subsets)))
+
+    manifest_path = manifest_path or default_manifest_path(output_folder)
+    manifest = load_manifest(manifest_path)
+
+    record = StageRecord('fonts2svg')
+
+    # Generate font ids from family names using the same logic as the assertion script
+    font_ids = {normalize_family_name(font_info['family']) for font_info in fonts_data}
+    todo = fonts_data
+    carried_failures = []
+    if only_changed:
+        changed = load_changed_families()
+        if changed is None:
+            tqdm.write("No catalog delta manifest; rendering the full catalog.")
+        else:
+            todo = [font_info for font_info in fonts_data if font_info['family'] in changed]
+            # Earlier failures of families that are not re-rendered still stand
+            catalog = {font_info['family'] for font_info in fonts_data}
+            carried_failures = [entry for entry in load_failed_log(log_file)
+                                if entry.get('family') in catalog and entry.get('family') not in changed]
+            tqdm.write(f"Rendering {len(todo)} changed families of {len(fonts_data)}.")
+
     # Initialize log file
-    failed_fonts = []
+    failed_fonts = list(carried_failures)
+    rendered = 0
+    unchanged = 0
 
-    for font_info in tqdm(fonts_data, desc="Processing fonts"):
-        # Generate font_id from family name using the same logic as the assertion script
+    for font_info in tqdm(todo, desc="Processing fonts"):
         family = font_info['family']
         font_id = normalize_family_name(family)
 
@@ -214,49 +467,76 @@ def generate_svgs(fonts_json, output_folder, overwrite, font_size, subset, log_f
                 continue
 
             output_path = os.path.join(output_folder, f"{font_id}.svg")
+            inputs = render_inputs(font_info, selected_variant, font_url, font_size)
 
             if not overwrite and os.path.exists(output_path):
-                if verbose:
-                    tqdm.write(f"Skipping {font_id}, SVG already exists.")
-                continue
+                if is_up_to_date(manifest.get(font_id), inputs):
+                    unchanged += 1
+                    if verbose:
+                        tqdm.write(f"Skipping {font_id}, SVG is up to date.")
+                    continue
+                if adopt_existing and font_id not in manifest:
+                    # The renderer that drew an adopted SVG is unknown, so it
+                    # is not recorded as the current one: the next run
+                    # without --adopt-existing re-renders it.
+                    manifest[font_id] = dict(inputs, renderer=None)
+                    unchanged += 1
+                    if verbose:
+                        tqdm.write(f"Adopted existing SVG for {font_id}.")
+                    continue
 
-            # Try to render the family name first
-            svg_content = text_to_svg_path(
-                family, font_url, font_size=font_size)
+            # Download and open the font once; the sample-text fallback
+            # reuses the same (lazily decoded) font object.
+            font = load_font(font_url)
+            record.add(bytes_read=font_source_size(font))
+            try:
+                # Try to render the family name first
+                svg_content = text_to_svg_path(
+                    family, font, font_size=font_size)
+                sample_text = None
+
+                if svg_content is None:
+                    # If family name fails, try with a sample text that the font supports
+                    cmap_codepoints = font.getBestCmap().keys()
+                    sample_text = get_sample_text_for_font(
+                        font_info, subset, cmap_codepoints, coverage)
+                    if sample_text:
+                        svg_content = text_to_svg_path(
+                            sample_text, font, font_size=font_size)
+            finally:
+                font.close()
 
             if svg_content is None:
-                # If family name fails, try with a sample text that the font supports
-                sample_text = get_sample_text_for_font(font_info, subset)
                 if sample_text:
-                    svg_content = text_to_svg_path(
-                        sample_text, font_url, font_size=font_size)
-                    if svg_content:
-                        tqdm.write(
-                            f"Font '{font_id}' rendered with sample text: '{sample_text}'")
-                    else:
-                        error_msg = f"Font '{font_id}' cannot render any sample text"
-                        tqdm.write(error_msg)
-                        failed_fonts.append({
-                            'font_id': font_id,
-                            'family': family,
-                            'error': f"Font cannot render family name '{family}' or any sample text",
-                            'timestamp': __import__('datetime').datetime.now().isoformat()
-                        })
-                        continue
+                    error_msg = f"Font '{font_id}' cannot render any sample text"
+                    tqdm.write(error_msg)
+                    failed_fonts.append({
+                        'font_id': font_id,
+                        'family': family,
+                        'error': f"Font cannot render family name '{family}' or any sample text",
+                        'timestamp': __import__('datetime').datetime.now().isoformat()
+                    })
+                    continue
                 else:
-                    error_msg = f"Font '{font_id}' does not support family name and no sample text available"
+                    error_msg = f"Font '{font_id}' does not support family name or any known sample text"
                     tqdm.write(error_msg)
                     failed_fonts.append({
                         'font_id': font_id,
                         'family': family,
-                        'error': f"Font does not support family name '{family}' and no sample text available",
+                        'error': f"Font does not support family name '{family}' and covers no known sample text",
                         'timestamp': __import__('datetime').datetime.now().isoformat()
                     })
                     continue
 
+            if sample_text:
+                tqdm.write(
+                    f"Font '{font_id}' rendered with sample text: '{sample_text}'")
+
             # Write the SVG content to file
             with open(output_path, "w") as f:
                 f.write(svg_content)
+            manifest[font_id] = dict(inputs, sample_text=sample_text)
+            rendered += 1
             tqdm.write(f"SVG saved for {font_id} at {output_path}")
         except Exception as e:
             error_msg = f"Error processing {font_id}: {e}"
@@ -268,6 +548,19 @@ def generate_svgs(fonts_json, output_folder, overwrite, font_size, subset, log_f
                 'timestamp': __import__('datetime').datetime.now().isoformat()
             })
 
+    pruned = 0
+    # An empty catalog would prune every preview; never treat that as real.
+    if not no_prune and font_ids:
+        pruned = prune_orphans(output_folder, manifest, font_ids, verbose)
+
+    save_manifest(manifest_path, manifest)
+    tqdm.write(f"\nRendered {rendered}, unchanged {unchanged}, pruned {pruned}. Manifest: {manifest_path}")
+
+    record.add(items=len(todo), cache_hits=unchanged)
+    for failure in failed_fonts[len(carried_failures):]:
+        record.failure(failure['family'], failure['error'])
+    record.end()
+
     # Write failed fonts to log file as a JSON array — consumed by
     # tools/build_lockfile.py to produce broken.lock.json.
     if failed_fonts:
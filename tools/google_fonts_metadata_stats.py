@@ -20,6 +20,7 @@ import csv
 import sys
 from typing import List, Dict, Any
 import click
+from run_ledger import ledger_stage
 
 try:
     import requests
@@ -151,17 +152,19 @@ def main(output_format: str, output_file: str):
 
     Extracts only: family, rate, total_views, year_views, and year_change (from viewsByDateRange).
     """
-    # Fetch data
-    data_text = fetch_data(URL)
-
-    # Parse and extract relevant fields
-    extracted_data = parse_and_extract(data_text)
-
-    # Output in requested format
-    if output_format.lower() == "csv":
-        output_csv(extracted_data, output_file)
-    else:
-        output_json(extracted_data, output_file)
+    with ledger_stage("google_fonts_metadata_stats") as record:
+        # Fetch data
+        data_text = fetch_data(URL)
+
+        # Parse and extract relevant fields
+        extracted_data = parse_and_extract(data_text)
+        record.add(items=len(extracted_data), bytes_read=len(data_text.encode("utf-8")))
+
+        # Output in requested format
+        if output_format.lower() == "csv":
+            output_csv(extracted_data, output_file)
+        else:
+            output_json(extracted_data, output_file)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+METADATA.pb Binary Cache
+
+Parsing METADATA.pb text format is far slower than parsing the same
+FamilyProto from protobuf wire format. This cache stores each parsed
+FamilyProto serialized as binary, keyed by the SHA-256 of the METADATA.pb
+contents, so later runs only hash the file and decode the binary message.
+
+Entries live under <cache-dir>/<schema>/, where <schema> is derived from the
+gftools FamilyProto descriptor: a gftools upgrade that changes the message
+starts a fresh cache instead of reading entries parsed with the old schema.
+
+The whole cache can be packed into one file (e.g. for a CI cache) and
+unpacked again.
+
+Usage:
+    python metadata_cache.py warm [--fonts-dir ./vendor/google]
+    python metadata_cache.py pack metadata-cache.pack
+    python metadata_cache.py unpack metadata-cache.pack
+"""
+
+import hashlib
+import os
+import struct
+import sys
+import tempfile
+from typing import Optional
+
+import click
+
+try:
+    from gftools import fonts_public_pb2 as pb
+    from google.protobuf import text_format
+    from google.protobuf.message import DecodeError
+except ImportError:
+    print("Error: gftools not found. Please install it with: pip install gftools")
+    sys.exit(1)
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_CACHE_DIR = os.path.join(PROJECT_ROOT, '.cache', 'metadata-pb')
+PACK_MAGIC = b'GFMC'
+PACK_VERSION = 1
+LICENSE_DIRS = ['ofl', 'apache', 'ufl']
+
+
+def schema_key() -> str:
+    return hashlib.sha256(pb.DESCRIPTOR.serialized_pb).hexdigest()[:16]
+
+
+def parse_text(text: str):
+    metadata = pb.FamilyProto()
+    text_format.Parse(text, metadata, allow_unknown_field=True)
+    return metadata
+
+
+class MetadataCache:
+    """Content-addressed store of serialized FamilyProto messages."""
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR):
+        self.schema = schema_key()
+        self.directory = os.path.join(cache_dir, self.schema)
+        self.hits = 0
+        self.misses = 0
+
+    def entry_path(self, digest: str) -> str:
+        return os.path.join(self.directory, digest[:2], f"{digest}.binpb")
+
+    def load(self, metadata_path: str):
+        """The FamilyProto for a METADATA.pb file, from the cache when its contents are unchanged."""
+        with open(metadata_path, 'rb') as f:
+            data = f.read()
+        digest = hashlib.sha256(data).hexdigest()
+        entry = self.entry_path(digest)
+
+        try:
+            with open(entry, 'rb') as f:
+                metadata = pb.FamilyProto()
+                # ParseFromString does not check proto2 required fields, so partial messages load too
+                metadata.ParseFromString(f.read())
+            self.hits += 1
+            return metadata
+        except (OSError, DecodeError):
+            # Missing or corrupt entry: parse the text format and overwrite it
+            pass
+
+        metadata = parse_text(data.decode('utf-8'))
+        self.misses += 1
+        # text_format.Parse does not enforce required fields, so neither may the cache
+        self.store(digest, metadata.SerializePartialToString())
+        return metadata
+
+    def store(self, digest: str, payload: bytes):
+        entry = self.entry_path(digest)
+        os.makedirs(os.path.dirname(entry), exist_ok=True)
+        # Write atomically: several worker processes may share one cache directory
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(entry), suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+        os.replace(tmp_path, entry)
+
+    def entries(self):
+        """Yield (digest, payload) for every entry of the current schema."""
+        if not os.path.isdir(self.directory):
+            return
+        for shard in sorted(os.listdir(self.directory)):
+            shard_dir = os.path.join(self.directory, shard)
+            for name in sorted(os.listdir(shard_dir)):
+                if name.endswith('.binpb'):
+                    with open(os.path.join(shard_dir, name), 'rb') as f:
+                        yield name[:-len('.binpb')], f.read()
+
+
+def load_metadata(metadata_path: str, cache: Optional[MetadataCache] = None):
+    """Parse a METADATA.pb file into a FamilyProto, through the cache if one is given."""
+    if cache is not None:
+        return cache.load(metadata_path)
+    with open(metadata_path, 'r', encoding='utf-8') as f:
+        return parse_text(f.read())
+
+
+def pack_cache(cache: MetadataCache, pack_path: str) -> int:
+    """
+    Write every entry to one file: magic, version, schema key, then
+    (32-byte digest, uint32 length, payload) records. Returns the entry count.
+    """
+    count = 0
+    with open(pack_path, 'wb') as f:
+        f.write(PACK_MAGIC + struct.pack('>H', PACK_VERSION) + cache.schema.encode('ascii'))
+        for digest, payload in cache.entries():
+            f.write(bytes.fromhex(digest) + struct.pack('>I', len(payload)) + payload)
+            count += 1
+    return count
+
+
+def unpack_cache(cache: MetadataCache, pack_path: str) -> int:
+    """Restore a packed cache. A pack made with another schema is ignored. Returns the entry count."""
+    with open(pack_path, 'rb') as f:
+        header = f.read(len(PACK_MAGIC) + 2 + len(cache.schema))
+        if header[:4] != PACK_MAGIC or struct.unpack('>H', header[4:6])[0] != PACK_VERSION:
+            raise click.ClickException(f"{pack_path} is not a metadata cache pack")
+        if header[6:].decode('ascii') != cache.schema:
+            print(f"Skipping {pack_path}: packed with a different FamilyProto schema")
+            return 0
+        count = 0
+        while True:
+            record = f.read(36)
+            if len(record) < 36:
+                break
+            length = struct.unpack('>I', record[32:])[0]
+            payload = f.read(length)
+            if len(payload) < length:
+                print(f"Skipping truncated record in {pack_path}")
+                break
+            cache.store(record[:32].hex(), payload)
+            count += 1
+    return count
+
+
+@click.group()
+@click.option('--cache-dir', default=DEFAULT_CACHE_DIR, help=f'Cache directory (default: {DEFAULT_CACHE_DIR})')
+@click.pass_context
+def cli(ctx, cache_dir):
+    """Binary cache of parsed METADATA.pb files."""
+    ctx.obj = MetadataCache(cache_dir)
+
+
+@cli.command()
+@click.option('--fonts-dir', default='./vendor/google',
+              help='Base directory containing font directories (default: ./vendor/google)')
+@click.pass_obj
+def warm(cache, fonts_dir):
+    """Parse every METADATA.pb once so later runs hit the cache."""
+    for subdir in LICENSE_DIRS:
+        subdir_path = os.path.join(fonts_dir, subdir)
+        if not os.path.isdir(subdir_path):
+            continue
+        with os.scandir(subdir_path) as entries:
+            for entry in entries:
+                metadata_path = os.path.join(entry.path, 'METADATA.pb')
+                if entry.is_dir() and os.path.exists(metadata_path):
+                    try:
+                        cache.load(metadata_path)
+                    except Exception as e:
+                        print(f"Error parsing {metadata_path}: {e}")
+    print(f"Cache warmed: {cache.hits} already cached, {cache.misses} parsed ({cache.directory})")
+
+
+@cli.command()
+@click.argument('pack_path')
+@click.pass_obj
+def pack(cache, pack_path):
+    """Pack the cache into a single file."""
+    count = pack_cache(cache, pack_path)
+    print(f"Packed {count} entries into {pack_path} ({os.path.getsize(pack_path) / 1024:.1f} KB)")
+
+
+@cli.command()
+@click.argument('pack_path', type=click.Path(exists=True))
+@click.pass_obj
+def unpack(cache, pack_path):
+    """Restore the cache from a packed file."""
+    count = unpack_cache(cache, pack_path)
+    print(f"Unpacked {count} entries into {cache.directory}")
+
+
+if __name__ == '__main__':
+    cli()
@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+"""
+Refresh Pipeline
+
+Runs the refresh stages (fetch, catalog delta, family ids, metadata chain,
+subset checks, SVGs, font slices, preview fonts, stats, sort orders, search
+and facet indexes, SDK catalogs, family records, lockfile, artifact
+manifest) as a DAG. Each stage declares the files it reads and writes; a
+stage runs after every earlier stage that writes one of its inputs (and
+after the stages it names explicitly), and independent branches run
+concurrently. The lockfile waits for every other stage but the artifact
+manifest, so its performance section covers the whole run.
+
+A stage is skipped when its command, the digests of its inputs and the
+digests of its outputs all match its last successful run (recorded in
+.cache/pipeline-state.json). Stages without declared inputs (network
+fetches) always run. The stage's own script is always one of its inputs.
+
+Digests: files are SHA-256 of their contents; a directory that is a git
+checkout (the vendor/google submodule) is its HEAD commit plus its
+`git status` output; any other directory is a hash of its file listing
+with sizes and modification times.
+
+Exit codes are those of tools/refresh.sh: 10/11 for a broken vendor/google
+layout, 12 when fetching without GOOGLE_FONTS_API_KEY, 13 for --skip-fetch
+without a webfonts.json, 2 for bad flags, and the failing stage's exit code
+otherwise.
+
+With --only-changed, the map and svg stages only redo the families that
+the catalog delta (tools/catalog_delta.py) lists as added or modified.
+
+Usage:
+    python tools/pipeline.py [--skip-fetch] [--skip-svg] [--skip-stats] [--skip-previews] [--with-slices]
+                             [--only-changed] [--force] [--jobs 4]
+"""
+
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, List, Optional
+
+import click
+
+from run_ledger import append_event, current_run_id, ledger_path
+
+VENDOR_DIR = 'vendor/google'
+LICENSE_DIRS = ['apache', 'ofl', 'ufl']
+MIN_METADATA_PB = 1500
+STATE_FILE = '.cache/pipeline-state.json'
+
+WEBFONTS = 'www/public/webfonts.json'
+WEBFONTS_VF = 'www/public/webfonts-vf.json'
+METADATA_JSON = 'www/public/webfonts.metadata.json'
+INVALID_CSV = 'metadata/invalid.csv'
+STATS_JSON = 'www/app/api/popular/stats.json'
+CATALOG_DELTA = '.cache/catalog-delta.json'
+# Stages that accept --only-changed
+DELTA_STAGES = ('map', 'svg')
+
+
+class Stage:
+    def __init__(self, name: str, command: List[str], inputs: List[str] = (), outputs: List[str] = (),
+                 allow_failure: bool = False, after: List[str] = ()):
+        self.name = name
+        self.command = command
+        # The script itself is an input, so editing a tool re-runs its stage
+        script = command[1] if len(command) > 1 and command[0] == 'python' else None
+        self.inputs = list(inputs) + ([script] if script and inputs else [])
+        self.outputs = list(outputs)
+        self.allow_failure = allow_failure
+        # Earlier stages to wait for without reading their outputs
+        self.after = list(after)
+
+
+STAGES = [
+    Stage('fetch', ['python', 'tools/fetch_webfonts.py'],
+          outputs=[WEBFONTS, WEBFONTS_VF]),
+    Stage('delta', ['python', 'tools/catalog_delta.py'],
+          inputs=[WEBFONTS, WEBFONTS_VF], outputs=[CATALOG_DELTA]),
+    Stage('ids', ['python', 'tools/build_family_ids.py'],
+          inputs=[WEBFONTS, WEBFONTS_VF], outputs=['www/public/family-ids.json']),
+    Stage('pre-validate', ['python', 'metadata/cli.py', 'pre-validate'],
+          inputs=[WEBFONTS, VENDOR_DIR], outputs=[INVALID_CSV]),
+    Stage('map', ['python', 'metadata/cli.py', 'map'],
+          inputs=[WEBFONTS, INVALID_CSV, VENDOR_DIR], outputs=[METADATA_JSON]),
+    Stage('polyfill', ['python', 'metadata/cli.py', 'polyfill'],
+          inputs=[WEBFONTS, METADATA_JSON], outputs=[METADATA_JSON]),
+    Stage('post-validate', ['python', 'metadata/cli.py', 'post-validate'],
+          inputs=[WEBFONTS, METADATA_JSON, INVALID_CSV, VENDOR_DIR], outputs=['metadata/validation.log']),
+    Stage('subsets', ['python', 'tools/verify_subsets.py'],
+          inputs=[WEBFONTS, VENDOR_DIR], outputs=['failed_subsets.log']),
+    Stage('svg', ['python', 'tools/fonts2svg.py'],
+          inputs=[WEBFONTS, VENDOR_DIR],
+          outputs=['failed_fonts.log', 'www/public/svg', 'www/public/svg.manifest.json']),
+    # Stats come from an unofficial Google endpoint that may break without notice.
+    # Failure here must not kill the weekly refresh — the lockfile flags staleness.
+    Stage('stats', ['python', 'tools/google_fonts_metadata_stats.py', '--output', STATS_JSON],
+          outputs=[STATS_JSON], allow_failure=True),
+    # Slices are build output for self-hosting, not committed (dist/ is ignored), so they
+    # only run with --with-slices: in the weekly refresh they would be built and discarded
+    Stage('slices', ['python', 'tools/slice_fonts.py'],
+          inputs=[WEBFONTS, VENDOR_DIR, 'www/public/subsets.json'], outputs=['dist/slices']),
+    Stage('previews', ['python', 'tools/build_preview_fonts.py'],
+          inputs=[WEBFONTS, VENDOR_DIR], outputs=['www/public/preview-fonts']),
+    Stage('orders', ['python', 'tools/build_sort_orders.py'],
+          inputs=[WEBFONTS_VF, STATS_JSON, VENDOR_DIR], outputs=['www/public/sort-orders.json']),
+    Stage('search', ['python', 'tools/build_search_index.py'],
+          inputs=[WEBFONTS_VF], outputs=['www/public/search-index.json']),
+    Stage('facets', ['python', 'tools/build_facet_index.py'],
+          inputs=[WEBFONTS, WEBFONTS_VF, VENDOR_DIR], outputs=['www/public/facet-index.json']),
+    Stage('columnar', ['python', 'tools/build_columnar_catalog.py'],
+          inputs=[WEBFONTS], outputs=['sdks/google-fonts-js/google-fonts-latest.columnar.json']),
+    Stage('binary', ['python', 'tools/build_binary_catalog.py'],
+          inputs=[WEBFONTS], outputs=['www/public/webfonts.bin']),
+    Stage('records', ['python', 'tools/build_family_records.py'],
+          inputs=[WEBFONTS, WEBFONTS_VF, METADATA_JSON, STATS_JSON, 'www/public/svg'],
+          outputs=['www/public/families']),
+    # The run ledger changes every run, so the lockfile's performance section is always rebuilt.
+    # It waits for every other stage (but the manifest), so that section covers the whole run.
+    Stage('lockfile', ['python', 'tools/build_lockfile.py'],
+          inputs=[WEBFONTS, METADATA_JSON, INVALID_CSV, 'failed_fonts.log', 'failed_subsets.log', ledger_path()],
+          outputs=['broken.lock.json'],
+          after=['fetch', 'delta', 'ids', 'pre-validate', 'map', 'polyfill', 'post-validate', 'subsets', 'svg',
+                 'stats', 'slices', 'previews', 'orders', 'search', 'facets', 'columnar', 'binary', 'records']),
+    # Last: hashes every artifact above
+    Stage('manifest', ['python', 'tools/build_artifact_manifest.py'],
+          inputs=[WEBFONTS, WEBFONTS_VF, METADATA_JSON, STATS_JSON, 'www/public/svg', 'www/public/webfonts.bin',
+                  'www/public/family-ids.json', 'www/public/sort-orders.json', 'www/public/search-index.json',
+                  'www/public/facet-index.json', 'sdks/google-fonts-js/google-fonts-latest.columnar.json',
+                  'www/public/preview-fonts', 'www/public/svg.manifest.json', 'www/public/families',
+                  'broken.lock.json'],
+          outputs=['www/public/artifacts.json']),
+]
+
+
+def file_digest(path: str) -> str:
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            sha.update(block)
+    return sha.hexdigest()
+
+
+def dir_digest(path: str) -> str:
+    if os.path.exists(os.path.join(path, '.git')):
+        head = subprocess.run(['git', '-C', path, 'rev-parse', 'HEAD'],
+                              capture_output=True, text=True).stdout.strip()
+        status = subprocess.run(['git', '-C', path, 'status', '--porcelain'],
+                                capture_output=True, text=True).stdout
+        return f"git:{head}:{hashlib.sha256(status.encode()).hexdigest()[:16]}"
+    sha = hashlib.sha256()
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        for name in sorted(files):
+            st = os.stat(os.path.join(root, name))
+            sha.update(f"{os.path.relpath(os.path.join(root, name), path)}\0{st.st_size}\0{st.st_mtime_ns}\n".encode())
+    return f"tree:{sha.hexdigest()}"
+
+
+def digest(path: str) -> Optional[str]:
+    if os.path.isdir(path):
+        return dir_digest(path)
+    if os.path.isfile(path):
+        return file_digest(path)
+    return None
+
+
+def load_state() -> Dict:
+    try:
+        with open(STATE_FILE, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(state: Dict):
+    os.makedirs(os.path.dirname(STATE_FILE), exist_ok=True)
+    tmp_path = STATE_FILE + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, STATE_FILE)
+
+
+def dependencies(stages: List[Stage]) -> Dict[str, List[str]]:
+    """Each stage depends on every earlier stage that writes one of its inputs, and on those it runs after."""
+    deps = {}
+    for i, stage in enumerate(stages):
+        earlier_names = [earlier.name for earlier in stages[:i]]
+        unknown = set(stage.after) - set(earlier_names)
+        if unknown:
+            raise ValueError(f"{stage.name} runs after unknown or later stages: {sorted(unknown)}")
+        deps[stage.name] = [earlier.name for earlier in stages[:i]
+                            if set(earlier.outputs) & set(stage.inputs) or earlier.name in stage.after]
+    return deps
+
+
+def preflight(skip_fetch: bool):
+    print(f"==> preflight: checking {VENDOR_DIR} layout")
+    for d in LICENSE_DIRS:
+        if not os.path.isdir(os.path.join(VENDOR_DIR, d)):
+            print(f"FATAL: expected directory '{VENDOR_DIR}/{d}' not found.", file=sys.stderr)
+            print("       google/fonts upstream layout may have changed; aborting.", file=sys.stderr)
+            sys.exit(10)
+    count = 0
+    for d in LICENSE_DIRS:
+        with os.scandir(os.path.join(VENDOR_DIR, d)) as entries:
+            count += sum(1 for e in entries if e.is_dir() and os.path.exists(os.path.join(e.path, 'METADATA.pb')))
+    if count < MIN_METADATA_PB:
+        print(f"FATAL: only {count} METADATA.pb files found (expected >={MIN_METADATA_PB}).", file=sys.stderr)
+        print(f"       {VENDOR_DIR} submodule may be corrupt or upstream restructured; aborting.", file=sys.stderr)
+        sys.exit(11)
+    print(f"    OK ({count} METADATA.pb files)")
+
+    if not skip_fetch and not os.environ.get('GOOGLE_FONTS_API_KEY'):
+        print("FATAL: GOOGLE_FONTS_API_KEY is required (or pass --skip-fetch).", file=sys.stderr)
+        sys.exit(12)
+    if skip_fetch and not (os.path.isfile(WEBFONTS) and os.path.getsize(WEBFONTS) > 0):
+        print(f"FATAL: --skip-fetch but {WEBFONTS} is missing/empty.", file=sys.stderr)
+        sys.exit(13)
+
+
+class Runner:
+    def __init__(self, stages: List[Stage], state: Dict, force: bool):
+        self.stages = stages
+        self.state = state
+        self.force = force
+        self.results: Dict[str, Dict] = {}
+        self.print_lock = threading.Lock()
+        # Paths no stage writes (vendor/google, the tool scripts) are digested once per run
+        self.written = {path for stage in stages for path in stage.outputs}
+        self.source_digests: Dict[str, Optional[str]] = {}
+        self.digest_lock = threading.Lock()
+
+    def log(self, message: str):
+        with self.print_lock:
+            print(message, flush=True)
+
+    def input_digest(self, path: str) -> Optional[str]:
+        if path in self.written:
+            return digest(path)
+        with self.digest_lock:
+            if path not in self.source_digests:
+                self.source_digests[path] = digest(path)
+            return self.source_digests[path]
+
+    def up_to_date(self, stage: Stage, inputs: Dict[str, Optional[str]]) -> bool:
+        previous = self.state.get(stage.name)
+        if self.force or not stage.inputs or not previous or previous.get('command') != stage.command:
+            return False
+        if previous.get('inputs') != inputs:
+            return False
+        return all(previous.get('outputs', {}).get(path) == digest(path) for path in stage.outputs)
+
+    def run_stage(self, stage: Stage) -> Dict:
+        append_event({'event': 'stage_start', 'stage': stage.name, 'tool': 'pipeline'})
+        result = self.execute(stage)
+        append_event({'event': 'stage_end', 'stage': stage.name, 'tool': 'pipeline',
+                      'status': result['status'], 'seconds': round(result['seconds'], 3)})
+        return result
+
+    def execute(self, stage: Stage) -> Dict:
+        start = time.monotonic()
+        inputs = {path: self.input_digest(path) for path in stage.inputs}
+        if self.up_to_date(stage, inputs):
+            self.log(f"==> {stage.name}: up to date, skipped")
+            return {'status': 'up-to-date', 'seconds': time.monotonic() - start}
+
+        self.log(f"==> {stage.name}: {' '.join(stage.command)}")
+        command = [sys.executable if stage.command[0] == 'python' else stage.command[0]] + stage.command[1:]
+        proc = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+                              env=dict(os.environ, PIPELINE_STAGE=stage.name))
+        seconds = time.monotonic() - start
+        with self.print_lock:
+            for line in proc.stdout.splitlines():
+                print(f"    [{stage.name}] {line}")
+            print(f"==> {stage.name}: exit {proc.returncode} in {seconds:.1f}s", flush=True)
+
+        if proc.returncode != 0:
+            if stage.allow_failure:
+                self.log(f"WARN: {stage.name} failed; keeping previous outputs")
+                return {'status': 'failed-allowed', 'seconds': seconds, 'returncode': proc.returncode}
+            return {'status': 'failed', 'seconds': seconds, 'returncode': proc.returncode}
+
+        outputs = {path: digest(path) for path in stage.outputs}
+        # Files a stage rewrites in place are recorded as it left them
+        inputs.update({path: outputs[path] for path in inputs if path in outputs})
+        self.state[stage.name] = {'command': stage.command, 'inputs': inputs, 'outputs': outputs,
+                                  'seconds': round(seconds, 2)}
+        return {'status': 'ok', 'seconds': seconds}
+
+    def run(self, disabled: set, jobs: int) -> Optional[int]:
+        """Run every stage; returns the exit code of the first failed stage, or None."""
+        deps = dependencies(self.stages)
+        pending = [s for s in self.stages if s.name not in disabled]
+        for name in disabled:
+            self.log(f"==> {name}: SKIPPED")
+            self.results[name] = {'status': 'disabled', 'seconds': 0.0}
+
+        failure = None
+        running = {}
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            while pending or running:
+                if failure is None:
+                    for stage in [s for s in pending if all(d in self.results for d in deps[s.name])]:
+                        pending.remove(stage)
+                        running[pool.submit(self.run_stage, stage)] = stage
+                elif not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage = running.pop(future)
+                    self.results[stage.name] = future.result()
+                    if self.results[stage.name]['status'] == 'failed' and failure is None:
+                        failure = self.results[stage.name]['returncode']
+        return failure
+
+    def critical_path(self) -> List[str]:
+        """Longest chain of dependent stages by measured duration."""
+        deps = dependencies(self.stages)
+        finish: Dict[str, float] = {}
+        previous: Dict[str, Optional[str]] = {}
+        for stage in self.stages:
+            if self.results.get(stage.name, {}).get('status', 'disabled') == 'disabled':
+                continue
+            best = max((d for d in deps[stage.name] if d in finish), key=lambda d: finish[d], default=None)
+            finish[stage.name] = (finish[best] if best else 0.0) + self.results[stage.name]['seconds']
+            previous[stage.name] = best
+        if not finish:
+            return []
+        path = [max(finish, key=finish.get)]
+        while previous[path[-1]]:
+            path.append(previous[path[-1]])
+        return path[::-1]
+
+
+@click.command()
+@click.option('--skip-fetch', is_flag=True, help='Use existing webfonts.json / webfonts-vf.json')
+@click.option('--skip-svg', is_flag=True, help='Skip SVG preview generation')
+@click.option('--skip-stats', is_flag=True, help='Skip popular stats refresh')
+@click.option('--with-slices', is_flag=True, help='Also build the unicode-range font slices (dist/slices)')
+@click.option('--skip-previews', is_flag=True, help='Skip family-name preview fonts')
+@click.option('--only-changed', is_flag=True, help='Limit map and svg to families changed in the catalog delta')
+@click.option('--force', is_flag=True, help='Run every stage even if its inputs are unchanged')
+@click.option('--jobs', '-j', default=4, type=int, help='Stages to run concurrently (default: 4)')
+def main(skip_fetch, skip_svg, skip_stats, skip_previews, with_slices, only_changed, force, jobs):
+    """Refresh all generated fonts data in-place."""
+    root = subprocess.run(['git', 'rev-parse', '--show-toplevel'], capture_output=True, text=True,
+                          cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    os.chdir(root)
+    print(f"==> refresh: running from {root}")
+
+    preflight(skip_fetch)
+
+    # Every stage's ledger events are filed under this run
+    os.environ['RUN_ID'] = current_run_id()
+    append_event({'event': 'run_start', 'tool': 'pipeline'})
+
+    if only_changed:
+        for stage in STAGES:
+            if stage.name in DELTA_STAGES:
+                stage.command.append('--only-changed')
+                stage.inputs.append(CATALOG_DELTA)
+
+    disabled = {name for name, skip in (('fetch', skip_fetch), ('svg', skip_svg), ('stats', skip_stats),
+                                        ('slices', not with_slices), ('previews', skip_previews)) if skip}
+    runner = Runner(STAGES, load_state(), force)
+    wall_start = time.monotonic()
+    failure = runner.run(disabled, jobs)
+    wall = time.monotonic() - wall_start
+    save_state(runner.state)
+
+    print(f"\n{'Stage':<16} {'Status':<15} {'Time':>8}")
+    print("-" * 41)
+    for stage in STAGES:
+        result = runner.results.get(stage.name, {'status': 'not run', 'seconds': 0.0})
+        print(f"{stage.name:<16} {result['status']:<15} {result['seconds']:>7.1f}s")
+    path = runner.critical_path()
+    path_seconds = sum(runner.results[name]['seconds'] for name in path)
+    print(f"\nCritical path: {' -> '.join(path)} ({path_seconds:.1f}s of {wall:.1f}s wall)")
+    append_event({'event': 'run_end', 'tool': 'pipeline', 'status': 'failed' if failure is not None else 'ok',
+                  'seconds': round(wall, 3), 'critical_path': path})
+
+    if failure is not None:
+        sys.exit(failure)
+    print("\n==> done. review changes with: git status && git diff --stat")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+"""
+Run ledger.
+
+Pipeline tools append structured events, one JSON object per line, to
+.cache/run-ledger.jsonl (or $RUN_LEDGER): the start and end of each stage
+with its timing and counters (items processed, bytes read, cache hits,
+failures), and one event per failed item. tools/pipeline.py sets $RUN_ID
+and $PIPELINE_STAGE for every stage it runs, so the events of one refresh
+share a run id and are filed under the pipeline's stage names.
+build_lockfile.py rolls the latest run up into the `performance` section of
+broken.lock.json.
+
+    with ledger_stage('verify_subsets') as record:
+        record.add(items=1, bytes_read=size)
+        record.failure(family, error)
+
+Long tool bodies can instead create a StageRecord directly and call end().
+"""
+
+import json
+import os
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_LEDGER = os.path.join(PROJECT_ROOT, '.cache', 'run-ledger.jsonl')
+COUNTERS = ('items', 'bytes_read', 'cache_hits', 'failures')
+
+# Standalone tool runs get a run id of their own
+_PROCESS_RUN_ID = f"{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')}-{os.getpid()}"
+
+
+def ledger_path() -> str:
+    return os.environ.get('RUN_LEDGER', DEFAULT_LEDGER)
+
+
+def current_run_id() -> str:
+    return os.environ.get('RUN_ID', _PROCESS_RUN_ID)
+
+
+def append_event(event: Dict):
+    """Append one event. Lines are written with a single O_APPEND write, so concurrent stages can share the file."""
+    event = dict(event, run_id=current_run_id(), ts=datetime.now(timezone.utc).isoformat())
+    path = ledger_path()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(event, ensure_ascii=False) + '\n')
+
+
+class StageRecord:
+    """Counters for one tool run, written as a stage_start / stage_end event pair."""
+
+    def __init__(self, tool: str):
+        self.stage = os.environ.get('PIPELINE_STAGE', tool)
+        self.tool = tool
+        self.counters = {name: 0 for name in COUNTERS}
+        self.start_time = time.monotonic()
+        append_event({'event': 'stage_start', 'stage': self.stage, 'tool': tool})
+
+    def add(self, **counts: int):
+        for name, value in counts.items():
+            self.counters[name] += value
+
+    def failure(self, item: str, error: str):
+        self.counters['failures'] += 1
+        append_event({'event': 'failure', 'stage': self.stage, 'tool': self.tool,
+                      'item': item, 'error': error})
+
+    def end(self, status: str = 'ok'):
+        append_event(dict({'event': 'stage_end', 'stage': self.stage, 'tool': self.tool, 'status': status,
+                           'seconds': round(time.monotonic() - self.start_time, 3)}, **self.counters))
+
+
+@contextmanager
+def ledger_stage(tool: str) -> Iterator[StageRecord]:
+    """Record a tool run as one stage, filed under $PIPELINE_STAGE when run by the pipeline."""
+    record = StageRecord(tool)
+    status = 'error'
+    try:
+        yield record
+        status = 'ok'
+    finally:
+        record.end(status)
+
+
+def read_events(path: Optional[str] = None) -> List[Dict]:
+    path = path or ledger_path()
+    if not os.path.exists(path):
+        return []
+    events = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                events.append(json.loads(line))
+            except ValueError:
+                continue  # a line cut short by an interrupted run
+    return events
+
+
+def summarize_run(events: List[Dict], run_id: Optional[str] = None) -> Optional[Dict]:
+    """
+    Per-stage roll-up of one run (default: the most recent). Timing and
+    status come from the pipeline's own events when present, counters from
+    the tools' stage_end events.
+    """
+    if not events:
+        return None
+    run_id = run_id or events[-1]['run_id']
+    run_events = [e for e in events if e.get('run_id') == run_id]
+    if not run_events:
+        return None
+
+    stages: Dict[str, Dict] = {}
+    for event in run_events:
+        if event.get('event') != 'stage_end':
+            continue
+        stage = stages.setdefault(event['stage'], dict({'seconds': 0.0, 'status': None}, **{c: 0 for c in COUNTERS}))
+        if event.get('tool') == 'pipeline' or stage['status'] is None:
+            stage['seconds'] = event.get('seconds', 0.0)
+            stage['status'] = event.get('status')
+        if event.get('tool') != 'pipeline':
+            for name in COUNTERS:
+                stage[name] += event.get(name, 0)
+
+    return {
+        'run_id': run_id,
+        'started_at': run_events[0]['ts'],
+        'stages': dict(sorted(stages.items())),
+    }
@@ -0,0 +1,148 @@
+"""
+Per-subset sample strings for preview rendering.
+
+Keys are the Google Fonts subset names used in webfonts.json and
+www/public/subsets.json. Common scripts get a hand-picked native word;
+every other subset that names a Unicode script (e.g. "lycian",
+"canadian-aboriginal") gets the first few characters of that script, derived
+from the Unicode Scripts data bundled with fontTools. Subsets that are not
+scripts (e.g. "math", "latin-ext") are listed explicitly.
+"""
+
+import json
+import os
+from typing import Dict, FrozenSet, Iterable, Optional
+
+from fontTools import unicodedata
+from fontTools.unicodedata import Scripts
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SUBSETS_JSON = os.path.join(PROJECT_ROOT, 'www', 'public', 'subsets.json')
+
+# Number of characters taken from a script when no sample is listed below.
+DERIVED_SAMPLE_LENGTH = 5
+
+SUBSET_SAMPLES = {
+    # Scripts with a native word
+    'latin': 'Hamburgefonstiv',
+    'arabic': 'العربية',
+    'armenian': 'Հայերեն',
+    'bengali': 'বাংলা',
+    'cherokee': 'ᏣᎳᎩ',
+    'cyrillic': 'Кириллица',
+    'devanagari': 'देवनागरी',
+    'ethiopic': 'ግዕዝ',
+    'georgian': 'ქართული',
+    'greek': 'Ελληνικά',
+    'gujarati': 'ગુજરાતી',
+    'gurmukhi': 'ਗੁਰਮੁਖੀ',
+    'hebrew': 'עברית',
+    'kannada': 'ಕನ್ನಡ',
+    'khmer': 'ខ្មែរ',
+    'lao': 'ພາສາລາວ',
+    'malayalam': 'മലയാളം',
+    'myanmar': 'မြန်မာ',
+    'oriya': 'ଓଡ଼ିଆ',
+    'sinhala': 'සිංහල',
+    'tamil': 'தமிழ்',
+    'telugu': 'తెలుగు',
+    'thaana': 'ދިވެހި',
+    'thai': 'ภาษาไทย',
+    'tibetan': 'བོད་ཡིག',
+    # Subsets that are not a single Unicode script
+    'chinese-hongkong': '香港字體',
+    'chinese-simplified': '简体中文',
+    'chinese-traditional': '繁體中文',
+    'cyrillic-ext': 'ѠѢѤѦѨ',
+    'emoji': '😀🎨📝',
+    'greek-ext': 'ἀἐἠἰὀ',
+    'indic-siyaq-numbers': '𞱱𞱲𞱳',
+    'japanese': 'あいうえお',
+    'kana-extended': '𛀀𛀁𛀂',
+    'korean': '한국어',
+    'latin-ext': 'ĀĂĄĆĈ',
+    'math': '∀∂∃∑√',
+    'mayan-numerals': '𝋠𝋡𝋢',
+    'meroitic': '𐦠𐦡𐦢',
+    'music': '𝄞𝄢𝄪',
+    'ottoman-siyaq-numbers': '𞴁𞴂𞴃',
+    'symbols': '☀☁☂★♠',
+    'symbols2': '⬀⬁⬂⬃⬄',
+    'tamil-supplement': '𑿀𑿁𑿂',
+    'vietnamese': 'Tiếng Việt',
+    'znamenny': '𜽐𜽑𜽒',
+}
+
+
+def _subset_name(script_code: str) -> str:
+    """ISO 15924 code -> subset-style name, e.g. 'Cans' -> 'canadian-aboriginal'."""
+    return unicodedata.script_name(script_code).lower().replace(' ', '-')
+
+
+def _script_characters(script_code: str, length: int) -> str:
+    """
+    The first `length` base characters (letters, numbers or symbols, never
+    combining marks) assigned to a script, in codepoint order.
+    """
+    characters = []
+    ranges = Scripts.RANGES
+    for i, value in enumerate(Scripts.VALUES):
+        if value != script_code:
+            continue
+        end = ranges[i + 1] if i + 1 < len(ranges) else 0x110000
+        for codepoint in range(ranges[i], end):
+            if unicodedata.category(chr(codepoint))[0] in 'LNS':
+                characters.append(chr(codepoint))
+                if len(characters) == length:
+                    return ''.join(characters)
+    return ''.join(characters)
+
+
+def load_subset_names(path: str = SUBSETS_JSON) -> Iterable[str]:
+    if not os.path.exists(path):
+        return list(SUBSET_SAMPLES)
+    with open(path, 'r') as f:
+        return list(json.load(f))
+
+
+def build_samples(subsets: Optional[Iterable[str]] = None) -> Dict[str, str]:
+    """subset -> sample string, for every subset a sample is known or derivable for."""
+    scripts_by_subset = {_subset_name(code): code for code in set(Scripts.VALUES)}
+    samples = {}
+    for subset in (subsets if subsets is not None else load_subset_names()):
+        if subset in SUBSET_SAMPLES:
+            samples[subset] = SUBSET_SAMPLES[subset]
+        elif subset in scripts_by_subset:
+            text = _script_characters(scripts_by_subset[subset], DERIVED_SAMPLE_LENGTH)
+            if text:
+                samples[subset] = text
+    for subset, text in SUBSET_SAMPLES.items():
+        samples.setdefault(subset, text)
+    return samples
+
+
+class SampleCoverage:
+    """
+    Sample strings with their codepoint sets precomputed, so checking a font
+    is one subset test per candidate against the font's cmap keys.
+    """
+
+    def __init__(self, samples: Dict[str, str]):
+        self.samples = samples
+        self.codepoints: Dict[str, FrozenSet[int]] = {
+            subset: frozenset(ord(char) for char in text) for subset, text in samples.items()
+        }
+
+    def first_covered(self, cmap_codepoints, preferred_subsets: Iterable[str] = ()) -> Optional[str]:
+        """
+        Return the first sample fully covered by the font, trying the
+        preferred subsets (in order) before every other known subset.
+        """
+        tried = set()
+        for subset in list(preferred_subsets) + list(self.samples):
+            if subset in tried or subset not in self.codepoints:
+                continue
+            tried.add(subset)
+            if self.codepoints[subset] <= cmap_codepoints:
+                return self.samples[subset]
+        return None
@@ -0,0 +1,117 @@
+"""
+Minimal sfnt container reader.
+
+Reads only the header and table directory of a font file (TTF/OTF, WOFF or
+WOFF2), or the bytes of a single table, without parsing the font. Used by
+tools that need table sizes or one small table (e.g. fvar) across the whole
+corpus, where loading every font with fontTools would be far too slow.
+"""
+
+import struct
+import zlib
+from typing import BinaryIO, Dict, NamedTuple, Optional
+
+SFNT_VERSIONS = {b'\x00\x01\x00\x00', b'OTTO', b'true', b'typ1'}
+WOFF_SIGNATURE = b'wOFF'
+WOFF2_SIGNATURE = b'wOF2'
+
+# WOFF2 encodes well-known tags as a 6-bit index into this table.
+WOFF2_KNOWN_TAGS = (
+    'cmap', 'head', 'hhea', 'hmtx', 'maxp', 'name', 'OS/2', 'post', 'cvt ',
+    'fpgm', 'glyf', 'loca', 'prep', 'CFF ', 'VORG', 'EBDT', 'EBLC', 'gasp',
+    'hdmx', 'kern', 'LTSH', 'PCLT', 'VDMX', 'vhea', 'vmtx', 'BASE', 'GDEF',
+    'GPOS', 'GSUB', 'EBSC', 'JSTF', 'MATH', 'CBDT', 'CBLC', 'COLR', 'CPAL',
+    'SVG ', 'sbix', 'acnt', 'avar', 'bdat', 'bloc', 'bsln', 'cvar', 'fdsc',
+    'feat', 'fmtx', 'fvar', 'gvar', 'hsty', 'just', 'lcar', 'mort', 'morx',
+    'opbd', 'prop', 'trak', 'Zapf', 'Silf', 'Glat', 'Gloc', 'Feat', 'Sill',
+)
+
+
+class TableRecord(NamedTuple):
+    offset: Optional[int]  # None inside a WOFF2 compressed stream
+    length: int            # bytes stored in the file (compressed length for WOFF)
+    orig_length: int       # uncompressed table length
+
+
+class SfntError(ValueError):
+    pass
+
+
+def _read_base128(f: BinaryIO) -> int:
+    value = 0
+    for _ in range(5):
+        byte = f.read(1)[0]
+        value = (value << 7) | (byte & 0x7F)
+        if not byte & 0x80:
+            return value
+    raise SfntError("invalid UIntBase128 in WOFF2 table directory")
+
+
+def read_table_directory(f: BinaryIO) -> Dict[str, TableRecord]:
+    """tag -> TableRecord for the font in the open binary file `f`."""
+    header = f.read(12)
+    if len(header) < 12:
+        raise SfntError("file too short for an sfnt header")
+    signature = header[:4]
+
+    if signature in SFNT_VERSIONS:
+        num_tables = struct.unpack('>H', header[4:6])[0]
+        data = f.read(16 * num_tables)
+        tables = {}
+        for i in range(num_tables):
+            tag, _, offset, length = struct.unpack('>4sLLL', data[16 * i:16 * i + 16])
+            tables[tag.decode('latin-1')] = TableRecord(offset, length, length)
+        return tables
+
+    if signature == WOFF_SIGNATURE:
+        # The rest of the 44-byte WOFF header; numTables comes first.
+        num_tables = struct.unpack('>H', f.read(32)[:2])[0]
+        data = f.read(20 * num_tables)
+        tables = {}
+        for i in range(num_tables):
+            tag, offset, comp_length, orig_length, _ = struct.unpack('>4sLLLL', data[20 * i:20 * i + 20])
+            tables[tag.decode('latin-1')] = TableRecord(offset, comp_length, orig_length)
+        return tables
+
+    if signature == WOFF2_SIGNATURE:
+        # The rest of the 48-byte WOFF2 header; numTables comes first.
+        num_tables = struct.unpack('>H', f.read(36)[:2])[0]
+        tables = {}
+        for _ in range(num_tables):
+            flags = f.read(1)[0]
+            tag_index = flags & 0x3F
+            tag = f.read(4).decode('latin-1') if tag_index == 0x3F else WOFF2_KNOWN_TAGS[tag_index]
+            orig_length = _read_base128(f)
+            transform_version = (flags >> 6) & 0x03
+            # glyf/loca use transform 0 as "transformed"; every other table uses 0 as "null".
+            transformed = (transform_version == 0) if tag in ('glyf', 'loca') else (transform_version != 0)
+            length = _read_base128(f) if transformed else orig_length
+            tables[tag] = TableRecord(None, length, orig_length)
+        return tables
+
+    raise SfntError(f"unrecognised font signature {signature[:4]!r}")
+
+
+def read_table_sizes(path: str) -> Dict[str, int]:
+    """tag -> stored table size in bytes, reading only the table directory."""
+    with open(path, 'rb') as f:
+        return {tag: record.length for tag, record in read_table_directory(f).items()}
+
+
+def read_table(path: str, tag: str) -> Optional[bytes]:
+    """
+    The decompressed bytes of one table, or None if the font has no such
+    table. WOFF2 is not supported, since its tables share one Brotli stream.
+    """
+    with open(path, 'rb') as f:
+        tables = read_table_directory(f)
+        record = tables.get(tag)
+        if record is None:
+            return None
+        if record.offset is None:
+            raise SfntError(f"cannot read individual tables from WOFF2 ({path})")
+        f.seek(record.offset)
+        data = f.read(record.length)
+    if record.length < record.orig_length:
+        data = zlib.decompress(data)
+    return data
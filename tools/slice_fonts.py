@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Unicode-Range Slicing
+
+Cuts every font file in vendor/google into one file per subset the family
+declares in webfonts.json, so a self-hosted page only downloads the scripts
+it uses (CSS `unicode-range`). Subset names are those of
+www/public/subsets.json; their codepoints come from the glyphsets namelists
+(see subset_codepoints.py).
+
+Subset namelists overlap (punctuation, digits), so each of a font's
+codepoints goes to exactly one slice: latin first, then latin-ext, then the
+other declared subsets from the smallest to the largest, which keeps shared
+characters out of large (CJK) slices. Codepoints outside every declared
+subset (control characters aside) end up in an `other` slice.
+
+Slices are written to <output-dir>/<family id>/<font stem>.<subset>.woff2
+(or .ttf with --format ttf), with layout features kept. The manifest,
+<output-dir>/manifest.json, lists each slice with its CSS unicode-range:
+
+    {
+      "version": 1,
+      "format": "woff2",
+      "families": {
+        "abel": {
+          "family": "Abel",
+          "files": {
+            "Abel-Regular.ttf": {
+              "source": "sha256:...",
+              "inputs": "sha256:...",
+              "slices": [
+                {"subset": "latin", "file": "abel/Abel-Regular.latin.woff2",
+                 "unicode_range": "U+0020-007E, U+00A0-00FF, ...", "codepoints": 224, "size": 10240},
+                ...
+              ]
+            }
+          }
+        }
+      }
+    }
+
+Files are sliced in a process pool. A file whose source hash and slicing
+inputs (subsets, their codepoints, format, slicer version) match its
+manifest entry, and whose slices are all on disk, is never re-subset.
+
+Usage:
+    python slice_fonts.py [--webfonts ./www/public/webfonts.json] [--fonts-dir ./vendor/google]
+                          [--output-dir ./dist/slices] [--format woff2] [--jobs 8]
+"""
+
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+import click
+from tqdm import tqdm
+
+try:
+    from fontTools import subset
+    from fontTools.ttLib import TTFont
+except ImportError:
+    print("Error: fonttools is required. Install with: pip install fonttools")
+    sys.exit(1)
+
+from family_id import normalize_family_name
+from run_ledger import StageRecord
+from sample_texts import load_subset_names
+from subset_codepoints import FIRST_PRINTABLE, load_subset_codepoints
+from verify_subsets import FONT_EXTENSIONS, find_family_dirs
+
+# Bump whenever a change to the slicing code alters the output files
+SLICER_VERSION = 1
+MANIFEST_VERSION = 1
+OTHER_SLICE = 'other'
+PRIORITY_SUBSETS = ['latin', 'latin-ext']
+
+# Loaded once per worker process by _init_worker.
+_SUBSET_CODEPOINTS: Dict[str, FrozenSet[int]] = {}
+
+
+def css_unicode_range(codepoints: Iterable[int]) -> str:
+    """Codepoints -> CSS unicode-range ("U+0020-007E, U+00A0")."""
+    ranges: List[List[int]] = []
+    for codepoint in sorted(codepoints):
+        if ranges and codepoint == ranges[-1][1] + 1:
+            ranges[-1][1] = codepoint
+        else:
+            ranges.append([codepoint, codepoint])
+    return ', '.join(f"U+{start:04X}" if start == end else f"U+{start:04X}-{end:04X}" for start, end in ranges)
+
+
+def assign_slices(cmap: Iterable[int], subsets: List[str],
+                  subset_codepoints: Dict[str, FrozenSet[int]]) -> List[Tuple[str, List[int]]]:
+    """Split a font's codepoints into disjoint (subset, codepoints) slices, in slice order."""
+    known = [s for s in dict.fromkeys(subsets) if s in subset_codepoints]
+    ordered = ([s for s in PRIORITY_SUBSETS if s in known]
+               + sorted((s for s in known if s not in PRIORITY_SUBSETS),
+                        key=lambda s: (len(subset_codepoints[s]), s)))
+    remaining = {codepoint for codepoint in cmap if codepoint >= FIRST_PRINTABLE}
+    slices = []
+    for name in ordered:
+        codepoints = remaining & subset_codepoints[name]
+        if codepoints:
+            slices.append((name, sorted(codepoints)))
+            remaining -= codepoints
+    if remaining:
+        slices.append((OTHER_SLICE, sorted(remaining)))
+    return slices
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return f"sha256:{digest.hexdigest()}"
+
+
+def slicing_inputs(subsets: List[str], subset_codepoints: Dict[str, FrozenSet[int]], font_format: str) -> str:
+    """Digest of everything besides the source file that determines a file's slices."""
+    definitions = {s: sorted(subset_codepoints.get(s, ())) for s in subsets}
+    payload = json.dumps({'subsets': subsets, 'definitions': definitions, 'format': font_format,
+                          'slicer': SLICER_VERSION}, sort_keys=True)
+    return f"sha256:{hashlib.sha256(payload.encode()).hexdigest()}"
+
+
+def is_up_to_date(entry: Optional[Dict], source: str, inputs: str, output_dir: str) -> bool:
+    if not entry or entry.get('source') != source or entry.get('inputs') != inputs:
+        return False
+    return all(os.path.exists(os.path.join(output_dir, s['file'])) for s in entry.get('slices', []))
+
+
+def subset_font(path: str, codepoints: List[int], font_format: str, output: str):
+    options = subset.Options()
+    options.layout_features = ['*']
+    options.name_IDs = ['*']
+    options.notdef_outline = True
+    options.flavor = 'woff2' if font_format == 'woff2' else None
+    font = TTFont(path)
+    try:
+        subsetter = subset.Subsetter(options)
+        subsetter.populate(unicodes=codepoints)
+        subsetter.subset(font)
+        subset.save_font(font, output, options)
+    finally:
+        font.close()
+
+
+def _init_worker():
+    global _SUBSET_CODEPOINTS
+    _SUBSET_CODEPOINTS = load_subset_codepoints()
+
+
+def slice_file(task: Tuple) -> Tuple[str, str, str, Optional[Dict], Optional[str]]:
+    """
+    Slice one font file, unless its manifest entry is current.
+    Returns (family id, file name, status, entry, error) with status 'cached', 'sliced' or 'failed'.
+    """
+    family_id, path, subsets, previous, output_dir, font_format = task
+    filename = os.path.basename(path)
+    try:
+        source = file_sha256(path)
+        inputs = slicing_inputs(subsets, _SUBSET_CODEPOINTS, font_format)
+        if is_up_to_date(previous, source, inputs, output_dir):
+            return family_id, filename, 'cached', previous, None
+
+        with TTFont(path, lazy=True) as font:
+            cmap = set(font.getBestCmap() or {})
+        stem = os.path.splitext(filename)[0]
+        os.makedirs(os.path.join(output_dir, family_id), exist_ok=True)
+        slices = []
+        for name, codepoints in assign_slices(cmap, subsets, _SUBSET_CODEPOINTS):
+            relative = f"{family_id}/{stem}.{name}.{font_format}"
+            output = os.path.join(output_dir, relative)
+            subset_font(path, codepoints, font_format, output)
+            slices.append({
+                'subset': name,
+                'file': relative,
+                'unicode_range': css_unicode_range(codepoints),
+                'codepoints': len(codepoints),
+                'size': os.path.getsize(output),
+            })
+        return family_id, filename, 'sliced', {'source': source, 'inputs': inputs, 'slices': slices}, None
+    except Exception as e:
+        return family_id, filename, 'failed', None, str(e)
+
+
+def load_manifest(path: str) -> Dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def save_manifest(path: str, manifest: Dict):
+    # Temp file first: an interrupted run never leaves a truncated manifest
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True, ensure_ascii=False)
+        f.write('\n')
+    os.replace(tmp_path, path)
+
+
+def prune_slices(output_dir: str, previous: Dict, current: Dict) -> int:
+    """Delete slice files the previous manifest listed and the current one does not."""
+    keep = {s['file'] for family in current.values() for entry in family['files'].values() for s in entry['slices']}
+    pruned = 0
+    for family in previous.values():
+        for entry in family.get('files', {}).values():
+            for s in entry.get('slices', []):
+                path = os.path.join(output_dir, s['file'])
+                if s['file'] not in keep and os.path.exists(path):
+                    os.remove(path)
+                    pruned += 1
+    return pruned
+
+
+@click.command()
+@click.option('--webfonts', default='./www/public/webfonts.json', type=click.Path(exists=True),
+              help='Path to webfonts.json (default: ./www/public/webfonts.json)')
+@click.option('--fonts-dir', default='./vendor/google',
+              help='Base directory containing font directories (default: ./vendor/google)')
+@click.option('--subsets', 'subsets_json', default='./www/public/subsets.json', type=click.Path(exists=True),
+              help='Subset names (default: ./www/public/subsets.json)')
+@click.option('--output-dir', default='./dist/slices', help='Output directory (default: ./dist/slices)')
+@click.option('--format', 'font_format', default='woff2', type=click.Choice(['woff2', 'ttf']),
+              help='Slice file format (default: woff2)')
+@click.option('--family', 'families', multiple=True, help='Only slice these families (repeatable)')
+@click.option('--jobs', '-j', default=os.cpu_count(), type=int, help='Worker processes (default: CPU count)')
+def main(webfonts, fonts_dir, subsets_json, output_dir, font_format, families, jobs):
+    """Slice the vendor fonts into unicode-range subsets for self-hosting."""
+    with open(webfonts, 'r') as f:
+        items = json.load(f).get('items', [])
+    subset_names = set(load_subset_names(subsets_json))
+
+    family_dirs = find_family_dirs(fonts_dir)
+    if not family_dirs:
+        print(f"Error: No font directories found in {fonts_dir}")
+        print("Expected structure: vendor/google/{ofl,apache,ufl}/*/")
+        sys.exit(1)
+
+    manifest_path = os.path.join(output_dir, 'manifest.json')
+    previous = load_manifest(manifest_path)
+    previous_families = previous.get('families', {}) if previous.get('format') == font_format else {}
+    os.makedirs(output_dir, exist_ok=True)
+
+    tasks = []
+    names = {}
+    for item in items:
+        if families and item['family'] not in families:
+            continue
+        family_id = normalize_family_name(item['family'])
+        font_dir = family_dirs.get(family_id)
+        if font_dir is None:
+            continue
+        names[family_id] = item['family']
+        subsets = [s for s in item.get('subsets', []) if s in subset_names]
+        for filename in sorted(os.listdir(font_dir)):
+            if filename.lower().endswith(FONT_EXTENSIONS):
+                entry = previous_families.get(family_id, {}).get('files', {}).get(filename)
+                tasks.append((family_id, os.path.join(font_dir, filename), subsets, entry, output_dir, font_format))
+
+    print(f"Slicing {len(tasks)} font files of {len(names)} families into {output_dir} ({font_format})...")
+    record = StageRecord('slice_fonts')
+
+    current: Dict[str, Dict] = {}
+    counts = {'cached': 0, 'sliced': 0, 'failed': 0}
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker) as pool:
+        for family_id, filename, status, entry, error in tqdm(pool.map(slice_file, tasks, chunksize=4),
+                                                              total=len(tasks), desc="Slicing fonts"):
+            counts[status] += 1
+            if status == 'failed':
+                tqdm.write(f"Error slicing {family_id}/{filename}: {error}")
+                record.failure(f"{family_id}/{filename}", error)
+                continue
+            family = current.setdefault(family_id, {'family': names[family_id], 'files': {}})
+            family['files'][filename] = entry
+
+    if families:
+        # A partial run keeps the other families' entries
+        for family_id, family in previous_families.items():
+            current.setdefault(family_id, family)
+    pruned = prune_slices(output_dir, previous_families, current)
+    save_manifest(manifest_path, {'version': MANIFEST_VERSION, 'format': font_format, 'families': current})
+
+    slices = [s for family in current.values() for entry in family['files'].values() for s in entry['slices']]
+    print(f"\nSliced {counts['sliced']}, unchanged {counts['cached']}, failed {counts['failed']}, "
+          f"pruned {pruned} stale slices")
+    print(f"{len(slices)} slices, {sum(s['size'] for s in slices) / 1024 / 1024:.1f} MB. Manifest: {manifest_path}")
+
+    record.add(items=len(tasks), cache_hits=counts['cached'])
+    record.end()
+
+
+if __name__ == '__main__':
+    main()
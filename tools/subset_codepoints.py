@@ -0,0 +1,56 @@
+"""
+Codepoints of the Google Fonts subsets.
+
+The subset names in webfonts.json and www/public/subsets.json are defined by
+the `<subset>_unique-glyphs.nam` namelist files shipped with glyphsets (a
+gftools dependency). Each file lists the codepoints unique to that subset,
+one `0xXXXX  NAME` entry per line.
+"""
+
+import importlib.util
+import os
+from typing import Dict, FrozenSet, Iterable, Optional
+
+# .null, CR and other control entries in the namelists are never mapped in cmaps.
+FIRST_PRINTABLE = 0x20
+
+
+def nam_dir() -> Optional[str]:
+    """The glyphsets `encodings` directory, located without importing the package."""
+    spec = importlib.util.find_spec('glyphsets')
+    if spec is None or not spec.submodule_search_locations:
+        return None
+    return os.path.join(list(spec.submodule_search_locations)[0], 'encodings')
+
+
+def read_nam(path: str) -> FrozenSet[int]:
+    codepoints = set()
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.startswith('0x'):
+                codepoint = int(line.split(None, 1)[0], 16)
+                if codepoint >= FIRST_PRINTABLE:
+                    codepoints.add(codepoint)
+    return frozenset(codepoints)
+
+
+def load_subset_codepoints(subsets: Optional[Iterable[str]] = None) -> Dict[str, FrozenSet[int]]:
+    """
+    subset -> codepoints, for the requested subsets (default: every defined one).
+    Subsets without a namelist (e.g. scripts newer than the installed
+    glyphsets) are left out.
+    """
+    directory = nam_dir()
+    if directory is None or not os.path.isdir(directory):
+        raise RuntimeError("glyphsets namelists not found. Please install gftools: pip install gftools")
+
+    suffix = '_unique-glyphs.nam'
+    if subsets is None:
+        subsets = [name[:-len(suffix)] for name in os.listdir(directory) if name.endswith(suffix)]
+
+    result = {}
+    for subset in subsets:
+        path = os.path.join(directory, f"{subset}{suffix}")
+        if os.path.exists(path):
+            result[subset] = read_nam(path)
+    return result
@@ -0,0 +1,80 @@
+import os
+import sys
+
+import pytest
+from fontTools.fontBuilder import FontBuilder
+from fontTools.pens.ttGlyphPen import TTGlyphPen
+
+# The tools are flat scripts that import their siblings by module name
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(autouse=True)
+def run_ledger(tmp_path, monkeypatch):
+    """Keep ledger events of the tools under test out of the repo's .cache."""
+    path = tmp_path / 'run-ledger.jsonl'
+    monkeypatch.setenv('RUN_LEDGER', str(path))
+    return path
+
+
+@pytest.fixture
+def webfonts_json():
+    """The committed www/public/webfonts.json."""
+    return os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                        'www', 'public', 'webfonts.json')
+
+
+@pytest.fixture
+def make_item():
+    """Factory for webfonts.json items with gstatic-style URLs; fields override the defaults."""
+    def make(family='Open Sans', **fields):
+        stem = family.replace(' ', '')
+        path = f"https://fonts.gstatic.com/s/{stem.lower()}/v40/{stem}"
+        item = {
+            'family': family,
+            'variants': ['regular', 'italic'],
+            'subsets': ['latin', 'cyrillic'],
+            'version': 'v40',
+            'lastModified': '2024-08-01',
+            'files': {'regular': f'{path}-Regular.ttf', 'italic': f'{path}-Italic.ttf'},
+            'category': 'sans-serif',
+            'kind': 'webfonts#webfont',
+            'menu': f'{path}-Menu.ttf',
+        }
+        item.update(fields)
+        return item
+    return make
+
+
+@pytest.fixture
+def build_font():
+    """
+    Writes a minimal TrueType font mapping the codepoints (ints, or the
+    characters of a string) to triangle glyphs; variable=True adds a
+    wght/wdth fvar.
+    """
+    def build(path, codepoints, variable=False):
+        if isinstance(codepoints, str):
+            codepoints = {ord(char) for char in codepoints}
+        codepoints = sorted(set(codepoints))
+        names = ['.notdef'] + [f'uni{cp:04X}' for cp in codepoints]
+        builder = FontBuilder(1000, isTTF=True)
+        builder.setupGlyphOrder(names)
+        builder.setupCharacterMap({cp: f'uni{cp:04X}' for cp in codepoints})
+        pen = TTGlyphPen(None)
+        pen.moveTo((0, 0))
+        pen.lineTo((0, 500))
+        pen.lineTo((500, 0))
+        pen.closePath()
+        glyph = pen.glyph()
+        builder.setupGlyf({name: glyph for name in names})
+        builder.setupHorizontalMetrics({name: (600, 0) for name in names})
+        builder.setupHorizontalHeader(ascent=800, descent=-200)
+        builder.setupNameTable({'familyName': 'Test', 'styleName': 'Regular'})
+        builder.setupOS2()
+        builder.setupPost()
+        if variable:
+            builder.setupFvar([('wght', 100, 400, 900, 'Weight'), ('wdth', 75, 100, 125, 'Width')], [])
+            builder.setupGvar({})
+        builder.save(str(path))
+    return build
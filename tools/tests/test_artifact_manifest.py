@@ -0,0 +1,46 @@
+import json
+
+from click.testing import CliRunner
+
+import build_artifact_manifest
+from build_artifact_manifest import build_manifest, hashed_alias
+
+
+def make_tree(root):
+    (root / 'www' / 'public' / 'svg').mkdir(parents=True)
+    (root / 'www' / 'public' / 'webfonts.json').write_text('{"items": []}')
+    (root / 'www' / 'public' / 'svg' / 'abel.svg').write_text('<svg/>')
+    (root / 'broken.lock.json').write_text('{}')
+
+
+def test_hashes_contents_and_aliases_public_files(tmp_path):
+    make_tree(tmp_path)
+    artifacts = build_manifest(str(tmp_path))['artifacts']
+    assert sorted(artifacts) == ['broken.lock.json', 'www/public/svg/abel.svg', 'www/public/webfonts.json']
+    entry = artifacts['www/public/svg/abel.svg']
+    assert entry['size'] == 6
+    assert entry['url'] == f"/artifacts/svg/abel.{entry['sha256'][:12]}.svg"
+    assert 'url' not in artifacts['broken.lock.json']
+
+
+def test_alias_keeps_inner_dots():
+    assert hashed_alias('www/public/webfonts.metadata.json', 'ab' * 32) == '/artifacts/webfonts.metadata.abababababab.json'
+
+
+def test_unchanged_artifacts_keep_their_hashes(tmp_path):
+    make_tree(tmp_path)
+    output = tmp_path / 'www' / 'public' / 'artifacts.json'
+    args = ['--root', str(tmp_path), '--output', str(output)]
+    CliRunner().invoke(build_artifact_manifest.main, args)
+    first = output.read_bytes()
+
+    result = CliRunner().invoke(build_artifact_manifest.main, args)
+    assert result.exit_code == 0, result.output
+    assert output.read_bytes() == first
+    assert 'changed: 0' in result.output
+
+    (tmp_path / 'www' / 'public' / 'svg' / 'abel.svg').write_text('<svg></svg>')
+    CliRunner().invoke(build_artifact_manifest.main, args)
+    before, after = json.loads(first)['artifacts'], json.loads(output.read_bytes())['artifacts']
+    assert after['www/public/webfonts.json'] == before['www/public/webfonts.json']
+    assert after['www/public/svg/abel.svg']['sha256'] != before['www/public/svg/abel.svg']['sha256']
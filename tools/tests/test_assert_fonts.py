@@ -0,0 +1,56 @@
+from click.testing import CliRunner
+
+import assert_fonts
+from assert_fonts import check_max_vf, validate_family
+
+METADATA = '''name: "{family}"
+designer: "Test"
+license: "OFL"
+category: "SANS_SERIF"
+date_added: "2024-01-01"
+'''
+
+
+def make_family_dir(root, folder, family, vf_files, build_font, metadata=None):
+    path = root / 'ofl' / folder
+    path.mkdir(parents=True)
+    (path / 'METADATA.pb').write_text(metadata if metadata is not None else METADATA.format(family=family))
+    for filename in vf_files:
+        build_font(path / filename, 'A', variable=True)
+    return str(path)
+
+
+def test_max_vf_counts_per_family_across_directories(tmp_path, build_font):
+    dirs = [
+        make_family_dir(tmp_path, 'testsans', 'Test Sans', ['TestSans[wght].ttf', 'TestSans-Italic[wght].ttf'],
+                        build_font),
+        make_family_dir(tmp_path, 'testsanssc', 'Test Sans', ['TestSansSC[wght].ttf'], build_font),
+        make_family_dir(tmp_path, 'other', 'Other', ['Other[wght].ttf', 'Other-Italic[wght].ttf'], build_font),
+    ]
+    results = [validate_family((d, ['max-vf'])) for d in dirs]
+    check_max_vf(results)
+    assert [r['family'] for r in results] == ['Test Sans', 'Test Sans', 'Other']
+    assert results[0]['issues'] == results[1]['issues'] == [
+        ('max-vf', 'ERROR', '3 variable font files (max 2): testsans/TestSans-Italic[wght].ttf, '
+                            'testsans/TestSans[wght].ttf, testsanssc/TestSansSC[wght].ttf')]
+    assert results[2]['issues'] == []
+
+
+def test_max_vf_still_runs_when_metadata_does_not_parse(tmp_path, build_font):
+    font_dir = make_family_dir(tmp_path, 'broken', 'Broken', ['A[wght].ttf', 'B[wght].ttf', 'C[wght].ttf'],
+                               build_font, metadata='name: "Broken"\nfonts {\n')
+    result = CliRunner().invoke(assert_fonts.main, ['--fonts-dir', str(tmp_path), '--no-cache', '--jobs', '1'])
+    assert result.exit_code == 1
+    assert 'Failed to parse METADATA.pb' in result.output
+    assert '3 variable font files (max 2)' in result.output
+    assert validate_family((font_dir, ['style', 'max-vf']))['family'] == 'Broken'
+
+
+def test_unreadable_font_is_a_warning(tmp_path, build_font):
+    font_dir = make_family_dir(tmp_path, 'testsans', 'Test Sans', ['TestSans[wght].ttf'], build_font)
+    with open(f'{font_dir}/TestSans-Italic[wght].ttf', 'wb') as f:
+        f.write(b'\x00\x01\x00\x00\x00')
+    result = CliRunner().invoke(assert_fonts.main, ['--fonts-dir', str(tmp_path), '--rule', 'max-vf',
+                                                    '--no-cache', '--jobs', '1'])
+    assert result.exit_code == 0, result.output
+    assert '[WARNING] (max-vf) TestSans-Italic[wght].ttf' in result.output
@@ -0,0 +1,57 @@
+import json
+import struct
+
+import pytest
+
+from build_binary_catalog import HEADER_SIZE, MAGIC, BinaryCatalog, encode_catalog
+
+
+def write_catalog(tmp_path, items):
+    path = tmp_path / 'webfonts.bin'
+    path.write_bytes(encode_catalog(items))
+    return str(path)
+
+
+def test_round_trips_webfonts_json(tmp_path, webfonts_json):
+    with open(webfonts_json, 'r') as f:
+        items = json.load(f)['items']
+    with BinaryCatalog(write_catalog(tmp_path, items)) as catalog:
+        assert len(catalog) == len(items)
+        assert [catalog.item(i) for i in range(len(catalog))] == items
+
+
+def test_looks_up_by_id_or_name(tmp_path, make_item):
+    items = [make_item('Zilla Slab'), make_item('Open Sans'), make_item('Ópen Sàns Ü')]
+    with BinaryCatalog(write_catalog(tmp_path, items)) as catalog:
+        assert catalog.find('open-sans') == 1
+        assert catalog.find('Zilla Slab') == 0
+        assert catalog.lookup('Open Sans') == items[1]
+        assert catalog.find('Roboto') is None
+        assert catalog.find('zzz') is None
+
+
+def test_round_trips_optional_fields(tmp_path, make_item):
+    items = [
+        make_item('Nabla', menu='https://example.com/menu.ttf', colorCapabilities=['COLRv1', 'SVG'],
+                  axes=[{'tag': 'EDPT', 'start': 0, 'end': 200}, {'tag': 'wght', 'start': 100.5, 'end': 900}]),
+        make_item('Sparse', files={'italic': 'https://example.com/sparse-italic.ttf'}),
+    ]
+    with BinaryCatalog(write_catalog(tmp_path, items)) as catalog:
+        assert [catalog.item(i) for i in range(2)] == items
+
+
+def test_sections_are_aligned(tmp_path, make_item):
+    data = encode_catalog([make_item('Abel')])
+    magic, version, header_size = struct.unpack_from('<4sHH', data)
+    assert (magic, version, header_size) == (MAGIC, 1, HEADER_SIZE)
+    offsets = struct.unpack_from('<7I', data, 16)
+    assert all(offset % 8 == 0 for offset in offsets)
+
+
+def test_rejects_other_files_and_fields(tmp_path, make_item):
+    path = tmp_path / 'other.bin'
+    path.write_bytes(b'\0' * HEADER_SIZE)
+    with pytest.raises(ValueError, match='not a version 1'):
+        BinaryCatalog(str(path))
+    with pytest.raises(ValueError, match='menuSubset'):
+        encode_catalog([make_item('Abel', menuSubset='latin')])
@@ -0,0 +1,70 @@
+import json
+
+import pytest
+from click.testing import CliRunner
+
+import build_columnar_catalog
+from build_columnar_catalog import decode_catalog, encode_catalog
+
+
+def round_trip(items):
+    catalog = {'kind': 'webfonts#webfontList', 'items': items}
+    encoded = json.loads(json.dumps(encode_catalog(catalog)))
+    return encoded, decode_catalog(encoded)
+
+
+def test_round_trips_webfonts_json(webfonts_json):
+    with open(webfonts_json, 'r') as f:
+        catalog = json.load(f)
+    encoded, decoded = round_trip(catalog['items'])
+    assert decoded == catalog
+    assert len(json.dumps(encoded)) < len(json.dumps(catalog)) / 2
+
+
+def test_factors_out_url_paths_and_dictionary_encodes_strings(make_item):
+    encoded, decoded = round_trip([make_item()])
+    columns = encoded['columns']
+    assert columns['dir'] == [None]
+    assert columns['files'] == [['OpenSans-Regular', 'OpenSans-Italic']]
+    assert columns['menu'] == ['OpenSans-Menu']
+    assert columns['subsets'] == [[1, 0]]  # tables sorted by frequency, then name
+    assert encoded['tables']['subsets'] == ['cyrillic', 'latin']
+    assert decoded['items'] == [make_item()]
+
+
+def test_round_trips_irregular_items(make_item):
+    items = [
+        # Directory that is not the family name, and an otf family
+        make_item('Noto Sans JP', files={'regular': 'https://fonts.gstatic.com/s/notosansjapanese/v40/a.otf'},
+                  menu='https://fonts.gstatic.com/s/notosansjapanese/v40/m.otf'),
+        # A variant without a file, a URL outside the path, no menu, color fonts
+        make_item('Bungee', files={'italic': 'https://example.com/bungee/italic.woff2'},
+                  colorCapabilities=['COLRv1', 'SVG']),
+    ]
+    del items[1]['menu']
+    encoded, decoded = round_trip(items)
+    assert encoded['columns']['dir'] == ['notosansjapanese', None]
+    assert encoded['columns']['files'][1] == [None, 'https://example.com/bungee/italic.woff2']
+    assert decoded['items'] == items
+
+
+def test_rejects_fields_it_cannot_encode(make_item):
+    with pytest.raises(ValueError, match='axes'):
+        encode_catalog({'items': [make_item(axes=[{'tag': 'wght', 'start': 300, 'end': 800}])]})
+
+
+def test_decoder_rejects_other_formats(make_item):
+    encoded, _ = round_trip([make_item()])
+    with pytest.raises(ValueError, match='Unsupported'):
+        decode_catalog(dict(encoded, version=2))
+
+
+def test_cli_writes_catalog_and_size_report(tmp_path, make_item):
+    webfonts = tmp_path / 'webfonts.json'
+    webfonts.write_text(json.dumps({'kind': 'webfonts#webfontList', 'items': [make_item()]}))
+    output = tmp_path / 'columnar.json'
+    result = CliRunner().invoke(build_columnar_catalog.main,
+                                ['--webfonts', str(webfonts), '--output', str(output)])
+    assert result.exit_code == 0, result.output
+    assert 'Gzip' in result.output
+    assert decode_catalog(json.loads(output.read_text()))['items'] == [make_item()]
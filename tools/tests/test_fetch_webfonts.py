@@ -0,0 +1,177 @@
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+from click.testing import CliRunner
+
+import fetch_webfonts
+
+
+def make_catalog(count=fetch_webfonts.MIN_ITEMS, prefix='Family'):
+    items = [
+        {'family': f'{prefix} {i:04d}', 'variants': ['regular'], 'files': {}, 'subsets': ['latin']}
+        for i in reversed(range(count))
+    ]
+    return {'kind': 'webfonts#webfontList', 'items': items}
+
+
+class StubApi:
+    """Local stand-in for the webfonts API, with ETag support and a request log."""
+
+    def __init__(self):
+        self.catalogs = {'static': make_catalog(), 'vf': make_catalog(prefix='Variable')}
+        self.etags = {'static': '"static-1"', 'vf': '"vf-1"'}
+        self.send_etags = True
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.barrier = threading.Barrier(2, timeout=2)
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                query = parse_qs(urlparse(self.path).query)
+                target = 'vf' if query.get('capability') == ['VF'] else 'static'
+                stub.requests.append((target, dict(self.headers)))
+                stub.in_flight += 1
+                stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+                try:
+                    # Both targets must be in flight at once to get past here
+                    stub.barrier.wait()
+                except threading.BrokenBarrierError:
+                    pass
+                stub.in_flight -= 1
+
+                etag = stub.etags[target]
+                if stub.send_etags and self.headers.get('If-None-Match') == etag:
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                body = json.dumps(stub.catalogs[target]).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                if stub.send_etags:
+                    self.send_header('ETag', etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self.server.server_port}/webfonts/v1/webfonts'
+        self.thread = threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def api():
+    with StubApi() as stub:
+        yield stub
+
+
+def run(api, tmp_path, *args):
+    out_dir = tmp_path / 'public'
+    result = CliRunner().invoke(fetch_webfonts.main, [
+        '--api-key', 'test', '--api-url', api.url, '--out-dir', str(out_dir),
+        '--state', str(tmp_path / 'state.json'), *args,
+    ])
+    return result, out_dir
+
+
+def mtimes(out_dir):
+    return {name: os.stat(out_dir / name).st_mtime_ns for name in ('webfonts.json', 'webfonts-vf.json')}
+
+
+def test_fetches_both_targets_concurrently(api, tmp_path):
+    result, out_dir = run(api, tmp_path)
+
+    assert result.exit_code == 0, result.output
+    assert api.max_in_flight == 2
+    data = json.loads((out_dir / 'webfonts.json').read_text())
+    families = [item['family'] for item in data['items']]
+    assert families == sorted(families)
+    assert json.loads((out_dir / 'webfonts-vf.json').read_text())['items'][0]['family'] == 'Variable 0000'
+
+
+def test_sends_stored_etag_and_skips_write_on_304(api, tmp_path):
+    run(api, tmp_path)
+    before = mtimes(tmp_path / 'public')
+
+    result, out_dir = run(api, tmp_path)
+
+    assert result.exit_code == 0, result.output
+    assert 'not-modified' in result.output
+    assert {headers.get('If-None-Match') for _, headers in api.requests[2:]} == {'"static-1"', '"vf-1"'}
+    assert mtimes(out_dir) == before
+
+
+def test_skips_write_when_payload_is_unchanged_without_validators(api, tmp_path):
+    api.send_etags = False
+    run(api, tmp_path)
+    before = mtimes(tmp_path / 'public')
+
+    result, out_dir = run(api, tmp_path)
+
+    assert result.exit_code == 0, result.output
+    assert '(unchanged)' in result.output
+    assert mtimes(out_dir) == before
+
+
+def test_rewrites_only_the_changed_target(api, tmp_path):
+    run(api, tmp_path)
+    before = mtimes(tmp_path / 'public')
+    api.catalogs['vf'] = make_catalog(prefix='Renamed')
+    api.etags['vf'] = '"vf-2"'
+
+    result, out_dir = run(api, tmp_path)
+
+    assert result.exit_code == 0, result.output
+    after = mtimes(out_dir)
+    assert after['webfonts.json'] == before['webfonts.json']
+    assert after['webfonts-vf.json'] != before['webfonts-vf.json']
+    assert json.loads((out_dir / 'webfonts-vf.json').read_text())['items'][0]['family'] == 'Renamed 0000'
+
+
+def test_drops_validators_when_the_file_was_edited(api, tmp_path):
+    run(api, tmp_path)
+    (tmp_path / 'public' / 'webfonts.json').write_text('{}')
+
+    result, out_dir = run(api, tmp_path)
+
+    assert result.exit_code == 0, result.output
+    static_headers = [headers for target, headers in api.requests[2:] if target == 'static']
+    assert 'If-None-Match' not in static_headers[0]
+    assert len(json.loads((out_dir / 'webfonts.json').read_text())['items']) == fetch_webfonts.MIN_ITEMS
+
+
+def test_refuses_a_short_response_and_keeps_the_file(api, tmp_path):
+    run(api, tmp_path)
+    api.catalogs['static'] = make_catalog(count=10)
+    api.etags['static'] = '"static-2"'
+
+    result, out_dir = run(api, tmp_path)
+
+    assert result.exit_code == 1
+    assert 'too few items' in result.output
+    assert len(json.loads((out_dir / 'webfonts.json').read_text())['items']) == fetch_webfonts.MIN_ITEMS
+
+
+def test_force_ignores_stored_validators(api, tmp_path):
+    run(api, tmp_path)
+
+    result, _ = run(api, tmp_path, '--force')
+
+    assert result.exit_code == 0, result.output
+    assert all('If-None-Match' not in headers for _, headers in api.requests[2:])
@@ -0,0 +1,54 @@
+import json
+
+import pytest
+from click.testing import CliRunner
+
+from fonts2svg import RENDERER_VERSION, generate_svgs, load_manifest
+
+
+@pytest.fixture
+def catalog(tmp_path, make_item, build_font):
+    """A one-family webfonts.json pointing at a local font, and an empty SVG folder."""
+    font_path = tmp_path / 'TestSans-Regular.ttf'
+    build_font(font_path, 'Test Sans')
+    fonts_json = tmp_path / 'webfonts.json'
+    item = make_item('Test Sans', variants=['regular'], subsets=['latin'],
+                     files={'regular': str(font_path)})
+    fonts_json.write_text(json.dumps({'items': [item]}))
+    output = tmp_path / 'svg'
+    output.mkdir()
+    return fonts_json, output
+
+
+def run(fonts_json, output, *args):
+    result = CliRunner().invoke(generate_svgs, [
+        str(fonts_json), str(output), '--log-file', str(output.parent / 'failed.log'), *args])
+    assert result.exit_code == 0, result.output
+    return load_manifest(f"{output}.manifest.json")
+
+
+def test_older_renderer_entry_is_rerendered(catalog):
+    fonts_json, output = catalog
+    entry = run(fonts_json, output)['testsans']
+    assert entry['renderer'] == RENDERER_VERSION
+
+    svg = output / 'testsans.svg'
+    svg.write_text('<svg>old</svg>')
+    manifest_path = f"{output}.manifest.json"
+    with open(manifest_path, 'w') as f:
+        json.dump({'entries': {'testsans': dict(entry, renderer=RENDERER_VERSION - 1)}}, f)
+
+    assert run(fonts_json, output)['testsans']['renderer'] == RENDERER_VERSION
+    assert svg.read_text() != '<svg>old</svg>'
+
+
+def test_adopted_svg_is_rerendered_by_the_next_run(catalog):
+    fonts_json, output = catalog
+    svg = output / 'testsans.svg'
+    svg.write_text('<svg>old</svg>')
+
+    assert run(fonts_json, output, '--adopt-existing')['testsans']['renderer'] is None
+    assert svg.read_text() == '<svg>old</svg>'
+
+    assert run(fonts_json, output)['testsans']['renderer'] == RENDERER_VERSION
+    assert svg.read_text() != '<svg>old</svg>'
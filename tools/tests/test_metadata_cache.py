@@ -0,0 +1,61 @@
+import os
+
+from metadata_cache import MetadataCache, pack_cache, unpack_cache
+
+METADATA = '''name: "Test Sans"
+designer: "Test"
+license: "OFL"
+category: "SANS_SERIF"
+date_added: "2024-01-01"
+fonts {
+  name: "Test Sans"
+  style: "normal"
+  weight: 400
+  filename: "TestSans-Regular.ttf"
+  post_script_name: "TestSans-Regular"
+  full_name: "Test Sans Regular"
+  copyright: "Copyright 2024 The Test Sans Project Authors"
+}
+subsets: "latin"
+'''
+
+
+def write_metadata(tmp_path):
+    path = tmp_path / 'METADATA.pb'
+    path.write_text(METADATA)
+    return str(path)
+
+
+def test_loads_from_cache_after_first_parse(tmp_path):
+    path = write_metadata(tmp_path)
+    cache = MetadataCache(str(tmp_path / 'cache'))
+    assert cache.load(path).name == 'Test Sans'
+    assert cache.load(path).fonts[0].filename == 'TestSans-Regular.ttf'
+    assert (cache.misses, cache.hits) == (1, 1)
+
+
+def test_reparses_and_overwrites_corrupt_entries(tmp_path):
+    path = write_metadata(tmp_path)
+    cache = MetadataCache(str(tmp_path / 'cache'))
+    cache.load(path)
+    digest, payload = next(cache.entries())
+    cache.store(digest, payload[:-10])
+
+    assert cache.load(path).fonts[0].copyright.startswith('Copyright')
+    assert cache.misses == 2
+    assert next(cache.entries())[1] == payload
+
+
+def test_unpack_skips_truncated_records(tmp_path):
+    path = write_metadata(tmp_path)
+    cache = MetadataCache(str(tmp_path / 'cache'))
+    cache.load(path)
+    pack = tmp_path / 'cache.pack'
+    assert pack_cache(cache, str(pack)) == 1
+    pack.write_bytes(pack.read_bytes()[:-10])
+
+    restored = MetadataCache(str(tmp_path / 'restored'))
+    assert unpack_cache(restored, str(pack)) == 0
+    assert list(restored.entries()) == []
+    assert restored.load(path).name == 'Test Sans'
+    assert os.path.isdir(restored.directory)
@@ -0,0 +1,133 @@
+import os
+
+import pytest
+from fontTools.ttLib import TTFont
+
+import build_preview_fonts
+from build_preview_fonts import build_preview, preview_variant, samples_digest, select_font_file, variant_style
+from sample_texts import SampleCoverage
+
+METADATA = '''name: "Test Sans"
+designer: "Test"
+license: "OFL"
+category: "SANS_SERIF"
+date_added: "2024-01-01"
+fonts {
+  name: "Test Sans"
+  style: "italic"
+  weight: 400
+  filename: "TestSans-Italic.ttf"
+  post_script_name: "TestSans-Italic"
+  full_name: "Test Sans Italic"
+  copyright: "Test"
+}
+fonts {
+  name: "Test Sans"
+  style: "normal"
+  weight: 400
+  filename: "TestSans[wght].ttf"
+  post_script_name: "TestSans-Regular"
+  full_name: "Test Sans Regular"
+  copyright: "Test"
+}
+subsets: "latin"
+'''
+
+
+@pytest.fixture(autouse=True)
+def worker_state(monkeypatch):
+    monkeypatch.setattr(build_preview_fonts, '_CACHE', None)
+    coverage = SampleCoverage({'latin': 'Abc'})
+    monkeypatch.setattr(build_preview_fonts, '_COVERAGE', coverage)
+    monkeypatch.setattr(build_preview_fonts, '_SAMPLES', samples_digest(coverage))
+
+
+def test_variant_selection():
+    assert preview_variant(['300', 'regular', 'italic']) == 'regular'
+    assert preview_variant(['700italic', '900']) == '700italic'
+    assert variant_style('regular') == ('normal', 400)
+    assert variant_style('italic') == ('italic', 400)
+    assert variant_style('700italic') == ('italic', 700)
+    assert variant_style('300') == ('normal', 300)
+
+
+def test_selects_variant_file_from_metadata(tmp_path):
+    (tmp_path / 'METADATA.pb').write_text(METADATA)
+    for name in ('TestSans-Italic.ttf', 'TestSans[wght].ttf'):
+        (tmp_path / name).write_bytes(b'')
+    assert select_font_file(str(tmp_path), 'regular') == 'TestSans[wght].ttf'
+    assert select_font_file(str(tmp_path), '700italic') == 'TestSans-Italic.ttf'
+    # Without METADATA.pb: the upright regular file
+    os.remove(tmp_path / 'METADATA.pb')
+    (tmp_path / 'TestSans-Bold.ttf').write_bytes(b'')
+    assert select_font_file(str(tmp_path), 'regular') == 'TestSans[wght].ttf'
+
+
+def test_builds_family_name_preview_and_caches(tmp_path, monkeypatch, build_font):
+    font_dir = tmp_path / 'testsans'
+    font_dir.mkdir()
+    build_font(font_dir / 'TestSans-Regular.ttf', 'Test Sans Abcdefghijklmnop')
+    output_dir = tmp_path / 'out'
+    output_dir.mkdir()
+    font_info = {'family': 'Test Sans', 'variants': ['regular'], 'subsets': ['latin']}
+
+    family_id, status, entry, error = build_preview(
+        ('testsans', font_info, str(font_dir), None, str(output_dir), 'ttf'))
+    assert (family_id, status, error) == ('testsans', 'built', None)
+    assert entry['text'] == 'Test Sans'
+    assert entry['font'] == 'TestSans-Regular.ttf'
+    font = TTFont(str(output_dir / entry['file']))
+    assert set(font.getBestCmap()) == {ord(char) for char in 'Test Sans'}
+
+    # A current entry is reused without opening the font
+    def no_parse(*args, **kwargs):
+        raise AssertionError('font parsed for a cached preview')
+
+    monkeypatch.setattr(build_preview_fonts, 'TTFont', no_parse)
+    _, status, cached, _ = build_preview(('testsans', font_info, str(font_dir), entry, str(output_dir), 'ttf'))
+    assert status == 'cached' and cached == entry
+
+
+def test_falls_back_to_sample_text_and_pins_variable_fonts(tmp_path, build_font):
+    font_dir = tmp_path / 'testsans'
+    font_dir.mkdir()
+    # Cannot render its own name ("S" is missing)
+    build_font(font_dir / 'TestSans[wdth,wght].ttf', 'Abc Test', variable=True)
+    output_dir = tmp_path / 'out'
+    output_dir.mkdir()
+    font_info = {'family': 'Test Sans', 'variants': ['700'], 'subsets': ['latin']}
+
+    _, status, entry, error = build_preview(('testsans', font_info, str(font_dir), None, str(output_dir), 'woff2'))
+    assert status == 'built', error
+    assert entry['text'] == 'Abc'
+    assert entry['file'] == 'testsans.woff2'
+    font = TTFont(str(output_dir / 'testsans.woff2'))
+    assert 'fvar' not in font
+    assert set(font.getBestCmap()) == {ord(char) for char in 'Abc'}
+
+
+def test_sample_text_preview_is_rebuilt_when_the_samples_change(tmp_path, monkeypatch, build_font):
+    font_dir = tmp_path / 'testsans'
+    font_dir.mkdir()
+    build_font(font_dir / 'TestSans-Regular.ttf', 'Abc Test')
+    font_info = {'family': 'Test Sans', 'variants': ['regular'], 'subsets': ['latin']}
+    task = ('testsans', font_info, str(font_dir), None, str(tmp_path), 'ttf')
+    _, _, entry, _ = build_preview(task)
+    assert entry['text'] == 'Abc'
+    assert build_preview(task[:3] + (entry,) + task[4:])[1] == 'cached'
+
+    coverage = SampleCoverage({'latin': 'Tb'})
+    monkeypatch.setattr(build_preview_fonts, '_COVERAGE', coverage)
+    monkeypatch.setattr(build_preview_fonts, '_SAMPLES', samples_digest(coverage))
+    _, status, rebuilt, _ = build_preview(task[:3] + (entry,) + task[4:])
+    assert status == 'built' and rebuilt['text'] == 'Tb'
+
+
+def test_reports_fonts_without_a_preview_text(tmp_path, build_font):
+    font_dir = tmp_path / 'testsans'
+    font_dir.mkdir()
+    build_font(font_dir / 'TestSans-Regular.ttf', 'xyz')
+    font_info = {'family': 'Test Sans', 'variants': ['regular'], 'subsets': ['latin']}
+    _, status, entry, error = build_preview(('testsans', font_info, str(font_dir), None, str(tmp_path), 'ttf'))
+    assert status == 'failed' and entry is None
+    assert 'covers neither' in error
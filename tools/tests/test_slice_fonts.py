@@ -0,0 +1,56 @@
+import os
+
+import pytest
+from fontTools.ttLib import TTFont
+
+import slice_fonts
+from slice_fonts import assign_slices, css_unicode_range, slice_file
+
+SUBSETS = {
+    'latin': frozenset(range(0x20, 0x7F)),
+    'latin-ext': frozenset(range(0x20, 0x30)) | frozenset(range(0x100, 0x180)),
+    'greek': frozenset(range(0x20, 0x30)) | frozenset(range(0x370, 0x400)),
+}
+
+
+@pytest.fixture(autouse=True)
+def subset_codepoints(monkeypatch):
+    monkeypatch.setattr(slice_fonts, '_SUBSET_CODEPOINTS', SUBSETS)
+
+
+def test_css_unicode_range():
+    assert css_unicode_range([0x41, 0x42, 0x43, 0x100, 0x10FFFF]) == 'U+0041-0043, U+0100, U+10FFFF'
+
+
+def test_assign_slices_gives_each_codepoint_one_slice():
+    cmap = [0x0D, 0x21, 0x41, 0x101, 0x3A9, 0x4E00]
+    slices = dict(assign_slices(cmap, ['greek', 'latin-ext', 'latin', 'unknown'], SUBSETS))
+    # latin first; shared punctuation never reaches the other slices; control characters are dropped
+    assert slices == {'latin': [0x21, 0x41], 'latin-ext': [0x101], 'greek': [0x3A9], 'other': [0x4E00]}
+
+
+def test_slices_font_and_reuses_unchanged_results(tmp_path, build_font):
+    source = tmp_path / 'Test-Regular.ttf'
+    build_font(source, [0x41, 0x42, 0x101, 0x3A9])
+    output_dir = tmp_path / 'out'
+    task = ('test', str(source), ['latin', 'greek'], None, str(output_dir), 'ttf')
+
+    family_id, filename, status, entry, error = slice_file(task)
+    assert (family_id, filename, status, error) == ('test', 'Test-Regular.ttf', 'sliced', None)
+    assert [(s['subset'], s['unicode_range']) for s in entry['slices']] == [
+        ('latin', 'U+0041-0042'), ('greek', 'U+03A9'), ('other', 'U+0101')]
+    with TTFont(os.path.join(output_dir, 'test/Test-Regular.greek.ttf')) as font:
+        assert set(font.getBestCmap()) == {0x3A9}
+
+    assert slice_file(task[:3] + (entry,) + task[4:])[2] == 'cached'
+    # A changed source, or changed subsets, is sliced again
+    assert slice_file(('test', str(source), ['latin'], entry, str(output_dir), 'ttf'))[2] == 'sliced'
+    build_font(source, [0x41])
+    assert slice_file(task[:3] + (entry,) + task[4:])[2] == 'sliced'
+
+
+def test_reports_unreadable_fonts(tmp_path):
+    source = tmp_path / 'Broken.ttf'
+    source.write_bytes(b'not a font')
+    status, entry, error = slice_file(('broken', str(source), ['latin'], None, str(tmp_path), 'ttf'))[2:]
+    assert status == 'failed' and entry is None and error
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Unicode Coverage Index
+
+Extracts the cmap of every font in vendor/google into one index file, storing
+each family's covered codepoints as a compressed list of ranges. The index
+answers "which families cover this string?" without opening any font.
+
+Usage:
+    python unicode_coverage.py build [--fonts-dir ./vendor/google] [--output unicode_coverage.json]
+    python unicode_coverage.py query "日本語テキスト" [--index unicode_coverage.json]
+"""
+
+import json
+import os
+import sys
+import time
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import click
+from tqdm import tqdm
+
+try:
+    from fontTools.ttLib import TTFont
+except ImportError:
+    print("Error: fonttools is required. Install with: pip install fonttools")
+    sys.exit(1)
+
+INDEX_VERSION = 1
+LICENSE_DIRS = ['ofl', 'apache', 'ufl']
+FONT_EXTENSIONS = ('.ttf', '.otf')
+
+
+def to_ranges(codepoints: Iterable[int]) -> List[int]:
+    """Sorted codepoints -> flat [start0, end0, start1, end1, ...] list of inclusive ranges."""
+    flat = []
+    for cp in sorted(codepoints):
+        if flat and cp == flat[-1] + 1:
+            flat[-1] = cp
+        else:
+            flat.extend((cp, cp))
+    return flat
+
+
+def read_family_name(font_dir: str) -> str:
+    """Family name from METADATA.pb, falling back to the directory name."""
+    metadata_path = os.path.join(font_dir, 'METADATA.pb')
+    if os.path.exists(metadata_path):
+        with open(metadata_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip().startswith('name:'):
+                    return line.split(':', 1)[1].strip().strip('"')
+    return os.path.basename(font_dir)
+
+
+def extract_family_coverage(font_dir: str) -> Optional[Dict]:
+    """Union of the cmaps of every font file in a family directory."""
+    codepoints = set()
+    files = 0
+    for filename in sorted(os.listdir(font_dir)):
+        if not filename.lower().endswith(FONT_EXTENSIONS):
+            continue
+        try:
+            with TTFont(os.path.join(font_dir, filename), lazy=True) as font:
+                codepoints.update(font.getBestCmap() or {})
+            files += 1
+        except Exception as e:
+            print(f"Error reading {os.path.join(font_dir, filename)}: {e}", file=sys.stderr)
+    if not files:
+        return None
+    return {
+        'family': read_family_name(font_dir),
+        'domain': os.path.basename(os.path.dirname(font_dir)),
+        'codepoints': len(codepoints),
+        'ranges': to_ranges(codepoints),
+    }
+
+
+def find_family_dirs(fonts_dir: str) -> List[str]:
+    font_dirs = []
+    for subdir in LICENSE_DIRS:
+        subdir_path = os.path.join(fonts_dir, subdir)
+        if not os.path.isdir(subdir_path):
+            continue
+        with os.scandir(subdir_path) as entries:
+            font_dirs.extend(entry.path for entry in entries if entry.is_dir())
+    return sorted(font_dirs)
+
+
+class CoverageIndex:
+    """
+    In-memory view of a coverage index. Each family's ranges are kept as two
+    parallel lists of starts and ends, so a codepoint test is one bisect.
+    """
+
+    def __init__(self, families: Dict[str, Dict]):
+        self.families = families
+        self._starts: List[Tuple[str, List[int], List[int]]] = []
+        for family_id, entry in families.items():
+            ranges = entry['ranges']
+            self._starts.append((family_id, ranges[0::2], ranges[1::2]))
+
+    @classmethod
+    def load(cls, path: str) -> 'CoverageIndex':
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') != INDEX_VERSION:
+            raise RuntimeError(f"unsupported coverage index version {data.get('version')} in {path}")
+        return cls(data['families'])
+
+    @staticmethod
+    def _covers(starts: List[int], ends: List[int], codepoint: int) -> bool:
+        i = bisect_right(starts, codepoint) - 1
+        return i >= 0 and codepoint <= ends[i]
+
+    def families_covering(self, text: str) -> List[str]:
+        """
+        Ids of the families whose fonts cover every character of `text`.
+        Whitespace is ignored, since previews and queries rarely care whether a
+        font ships its own space glyph.
+        """
+        codepoints = sorted({ord(char) for char in text if not char.isspace()})
+        return [
+            family_id for family_id, starts, ends in self._starts
+            if all(self._covers(starts, ends, cp) for cp in codepoints)
+        ]
+
+
+@click.group()
+def cli():
+    """Corpus-wide Unicode coverage index."""
+    pass
+
+
+@cli.command()
+@click.option('--fonts-dir', default='./vendor/google',
+              help='Base directory containing font directories (default: ./vendor/google)')
+@click.option('--output', default='unicode_coverage.json', help='Index file to write (default: unicode_coverage.json)')
+@click.option('--jobs', '-j', default=os.cpu_count(), type=int, help='Worker processes (default: CPU count)')
+def build(fonts_dir: str, output: str, jobs: int):
+    """Extract every family's cmap into a single range-compressed index."""
+    font_dirs = find_family_dirs(fonts_dir)
+    if not font_dirs:
+        print(f"Error: No font directories found in {fonts_dir}")
+        print("Expected structure: vendor/google/{ofl,apache,ufl}/*/")
+        sys.exit(1)
+
+    families = {}
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        results = pool.map(extract_family_coverage, font_dirs, chunksize=16)
+        for font_dir, entry in tqdm(zip(font_dirs, results), total=len(font_dirs), desc="Extracting cmaps"):
+            if entry is not None:
+                families[os.path.basename(font_dir)] = entry
+
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({'version': INDEX_VERSION, 'families': families},
+                  f, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+
+    total_ranges = sum(len(entry['ranges']) // 2 for entry in families.values())
+    print(f"\nIndexed {len(families)} families ({total_ranges} ranges)")
+    print(f"Index written to: {output} ({os.path.getsize(output) / 1024:.0f} KB)")
+
+
+@cli.command()
+@click.argument('text')
+@click.option('--index', 'index_path', default='unicode_coverage.json', help='Index file (default: unicode_coverage.json)')
+def query(text: str, index_path: str):
+    """List the families covering every character of TEXT."""
+    index = CoverageIndex.load(index_path)
+    started = time.perf_counter()
+    family_ids = index.families_covering(text)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    for family_id in family_ids:
+        print(f"{family_id}\t{index.families[family_id]['family']}")
+    print(f"\n{len(family_ids)} of {len(index.families)} families cover the text ({elapsed_ms:.1f} ms)",
+          file=sys.stderr)
+
+
+if __name__ == '__main__':
+    cli()
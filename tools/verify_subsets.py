@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Subset Coverage Verification
+
+Checks the `subsets` each family declares in webfonts.json against the cmaps
+of its local font files in vendor/google. For every (family, subset) pair it
+reports the share of the subset's codepoints the fonts cover and which ones
+are missing. Pairs below --min-coverage are written to failed_subsets.log,
+which tools/build_lockfile.py folds into broken.lock.json.
+
+Subset codepoints come from the glyphsets namelists (see subset_codepoints.py).
+
+Usage:
+    python verify_subsets.py [--webfonts ./webfonts.json] [--fonts-dir ./vendor/google] [--output report.json]
+"""
+
+import csv
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, List, Tuple
+
+import click
+from tqdm import tqdm
+
+try:
+    from fontTools.ttLib import TTFont
+except ImportError:
+    print("Error: fonttools is required. Install with: pip install fonttools")
+    sys.exit(1)
+
+from family_id import normalize_family_name
+from run_ledger import StageRecord
+from subset_codepoints import load_subset_codepoints
+
+LICENSE_DIRS = ['ofl', 'apache', 'ufl']
+FONT_EXTENSIONS = ('.ttf', '.otf')
+
+# Loaded once per worker process by _init_worker.
+_SUBSET_CODEPOINTS: Dict[str, frozenset] = {}
+
+
+def find_family_dirs(fonts_dir: str) -> Dict[str, str]:
+    """family id (folder name) -> directory, across the license directories."""
+    family_dirs = {}
+    for subdir in LICENSE_DIRS:
+        subdir_path = os.path.join(fonts_dir, subdir)
+        if not os.path.isdir(subdir_path):
+            continue
+        with os.scandir(subdir_path) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    family_dirs.setdefault(entry.name, entry.path)
+    return family_dirs
+
+
+def format_ranges(codepoints) -> List[str]:
+    """Sorted codepoints -> compact 'U+0041' / 'U+0041-U+005A' strings."""
+    ranges = []
+    for cp in sorted(codepoints):
+        if ranges and cp == ranges[-1][1] + 1:
+            ranges[-1][1] = cp
+        else:
+            ranges.append([cp, cp])
+    return [f"U+{start:04X}" if start == end else f"U+{start:04X}-U+{end:04X}" for start, end in ranges]
+
+
+def _init_worker():
+    global _SUBSET_CODEPOINTS
+    _SUBSET_CODEPOINTS = load_subset_codepoints()
+
+
+def verify_family(task: Tuple[str, str, List[str]]) -> List[Dict]:
+    """Compare one family's declared subsets against the union of its fonts' cmaps."""
+    family, font_dir, subsets = task
+    cmap = set()
+    for filename in os.listdir(font_dir):
+        if filename.lower().endswith(FONT_EXTENSIONS):
+            try:
+                with TTFont(os.path.join(font_dir, filename), lazy=True) as font:
+                    cmap.update(font.getBestCmap() or {})
+            except Exception as e:
+                print(f"Error reading {os.path.join(font_dir, filename)}: {e}", file=sys.stderr)
+
+    results = []
+    for subset in subsets:
+        expected = _SUBSET_CODEPOINTS.get(subset)
+        if not expected:
+            continue
+        missing = expected - cmap
+        results.append({
+            'family': family,
+            'subset': subset,
+            'codepoints': len(expected),
+            'covered': len(expected) - len(missing),
+            'coverage': round((len(expected) - len(missing)) / len(expected), 4),
+            'missing': format_ranges(missing),
+        })
+    return results
+
+
+@click.command()
+@click.option('--webfonts', default='./webfonts.json', type=click.Path(exists=True),
+              help='Path to webfonts.json (default: ./webfonts.json)')
+@click.option('--fonts-dir', default='./vendor/google',
+              help='Base directory containing font directories (default: ./vendor/google)')
+@click.option('--min-coverage', default=0.5, type=float,
+              help='Coverage below which a declared subset counts as a failure (default: 0.5)')
+@click.option('--output', help='Output file for the full report (JSON, or CSV if it ends in .csv)')
+@click.option('--log-file', default='./failed_subsets.log',
+              help="Log file for failed subsets, consumed by build_lockfile.py. Defaults to './failed_subsets.log'.")
+@click.option('--jobs', '-j', default=os.cpu_count(), type=int, help='Worker processes (default: CPU count)')
+@click.option('--verbose', '-v', is_flag=True, help='Verbose output')
+def main(webfonts, fonts_dir, min_coverage, output, log_file, jobs, verbose):
+    """Verify declared subsets against the cmaps of the local font files."""
+    with open(webfonts, 'r') as f:
+        items = json.load(f).get('items', [])
+
+    family_dirs = find_family_dirs(fonts_dir)
+    if not family_dirs:
+        print(f"Error: No font directories found in {fonts_dir}")
+        print("Expected structure: vendor/google/{ofl,apache,ufl}/*/")
+        sys.exit(1)
+
+    tasks = []
+    not_found = []
+    for item in items:
+        font_dir = family_dirs.get(normalize_family_name(item['family']))
+        if font_dir is None:
+            not_found.append(item['family'])
+            continue
+        tasks.append((item['family'], font_dir, item.get('subsets', [])))
+
+    print(f"Verifying subsets of {len(tasks)} families ({len(not_found)} without local files)...")
+    record = StageRecord('verify_subsets')
+
+    results = []
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker) as pool:
+        for family_results in tqdm(pool.map(verify_family, tasks, chunksize=8),
+                                   total=len(tasks), desc="Verifying families"):
+            results.extend(family_results)
+
+    failures = [r for r in results if r['coverage'] < min_coverage]
+    partial = [r for r in results if min_coverage <= r['coverage'] < 1]
+
+    print(f"\nSubset Verification Results:")
+    print(f"  (family, subset) pairs checked: {len(results)}")
+    print(f"  Fully covered: {len(results) - len(failures) - len(partial)}")
+    print(f"  Partially covered: {len(partial)}")
+    print(f"  Below {min_coverage:.0%} coverage: {len(failures)}")
+
+    if failures or verbose:
+        print(f"\n{'Family':<30} {'Subset':<22} {'Coverage':>9} {'Missing':>8}")
+        print("-" * 72)
+        for r in sorted(failures if not verbose else failures + partial,
+                        key=lambda r: (r['family'], r['subset'])):
+            print(f"{r['family']:<30} {r['subset']:<22} {r['coverage']:>9.1%} {r['codepoints'] - r['covered']:>8}")
+
+    if output:
+        if output.endswith('.csv'):
+            with open(output, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                writer.writerow(['family', 'subset', 'codepoints', 'covered', 'coverage', 'missing'])
+                for r in results:
+                    writer.writerow([r['family'], r['subset'], r['codepoints'], r['covered'],
+                                     r['coverage'], ' '.join(r['missing'])])
+        else:
+            with open(output, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'generated_at': datetime.now(timezone.utc).isoformat(),
+                    'min_coverage': min_coverage,
+                    'families_without_files': sorted(not_found),
+                    'results': results,
+                }, f, indent=2, ensure_ascii=False)
+        print(f"\nReport written to: {output}")
+
+    # Write failures as a JSON array — consumed by tools/build_lockfile.py
+    # to produce broken.lock.json. An empty array clears stale failures.
+    with open(log_file, 'w') as f:
+        json.dump([{
+            'family': r['family'],
+            'subset': r['subset'],
+            'coverage': r['coverage'],
+            'missing_count': r['codepoints'] - r['covered'],
+        } for r in failures], f, indent=2, ensure_ascii=False)
+    print(f"Failed subsets logged to: {log_file} ({len(failures)} failures)")
+
+    record.add(items=len(tasks))
+    for r in failures:
+        record.failure(f"{r['family']}:{r['subset']}", f"coverage {r['coverage']:.1%}")
+    record.end()
+
+
+if __name__ == '__main__':
+    main()
@@ -6,6 +6,7 @@ import { Header } from "@/components/header";
 import { InteractiveSection } from "./interactive-section";
 import { FontStylesheet } from "@/components/font-stylesheet";
 import { getFontData } from "@/lib/fonts-actions";
+import { immutableUrl } from "@/lib/artifacts";
 
 interface FontDetailProps {
   params: Promise<{ id: string }>;
@@ -42,9 +43,9 @@ export default async function FontDetail({ params }: FontDetailProps) {
             {/* Font Preview */}
             <div className="rounded-lg mb-6">
               <Image
-                src={`/svg/${font.family
-                  .toLowerCase()
-                  .replace(/\s+/g, "")}.svg`}
+                src={immutableUrl(
+                  `/svg/${font.family.toLowerCase().replace(/\s+/g, "")}.svg`
+                )}
                 alt={`${font.family} font preview`}
                 width={600}
                 height={160}
@@ -3,6 +3,51 @@ import fs from "fs";
 import path from "path";
 import { StaticFont, VfFont, CombinedFont, WebfontsResponse } from "@/types";
 import { idToFamily } from "@/lib/fontid";
+import { lookupFamilyId, itemAt } from "@/lib/family-index";
+import {
+  loadFamilyIndex,
+  readFamilyRecord,
+  recordToFont,
+} from "@/lib/family-records";
+
+interface Catalog {
+  webfonts: WebfontsResponse;
+  webfontsVf: WebfontsResponse;
+}
+
+// Fallback for ids without a family record; parsed once per server process
+let catalog: Catalog | null = null;
+
+function readJson<T>(file: string): T {
+  return JSON.parse(
+    fs.readFileSync(path.join(process.cwd(), "public", file), "utf8")
+  );
+}
+
+function loadCatalog(): Catalog {
+  if (!catalog) {
+    catalog = {
+      webfonts: readJson<WebfontsResponse>("webfonts.json"),
+      webfontsVf: readJson<WebfontsResponse>("webfonts-vf.json"),
+    };
+  }
+  return catalog;
+}
+
+/**
+ * Linear lookup by family name (exact, then substring match), used for ids
+ * the index does not know.
+ */
+function findByFamilyName<T extends { family: string }>(
+  items: T[],
+  familyName: string
+): T | undefined {
+  const name = familyName.toLowerCase();
+  return (
+    items.find((font) => font.family.toLowerCase() === name) ||
+    items.find((font) => font.family.toLowerCase().includes(name))
+  );
+}
 
 export async function GET(
   request: NextRequest,
@@ -11,47 +56,36 @@ export async function GET(
   try {
     const { id: fontId } = await params;
 
-    // Convert font ID back to family name
-    const familyName = idToFamily(fontId);
+    // A few KB per lookup through the precomputed family record
+    const record = readFamilyRecord(fontId);
+    const recordFont = record ? recordToFont(record) : null;
+    if (recordFont) {
+      return NextResponse.json(recordFont);
+    }
 
-    // Read both JSON files from public directory
-    const webfontsVfPath = path.join(
-      process.cwd(),
-      "public",
-      "webfonts-vf.json"
-    );
-    const webfontsPath = path.join(process.cwd(), "public", "webfonts.json");
+    const { webfonts, webfontsVf } = loadCatalog();
+    const index = loadFamilyIndex();
+    const vfItems = webfontsVf.items as VfFont[];
+    const staticItems = webfonts.items as StaticFont[];
 
-    const webfontsVfData: WebfontsResponse = JSON.parse(
-      fs.readFileSync(webfontsVfPath, "utf8")
-    );
-    const webfontsData: WebfontsResponse = JSON.parse(
-      fs.readFileSync(webfontsPath, "utf8")
-    );
+    // O(1) lookup through the family id index
+    const entry = index ? lookupFamilyId(index, fontId) : null;
+    let vfFont = entry ? itemAt(vfItems, entry.vf, entry.family) : undefined;
+    let staticFont = entry
+      ? itemAt(staticItems, entry.static, entry.family)
+      : undefined;
 
-    // Find font in webfonts-vf.json (primary lookup)
-    const vfFont =
-      webfontsVfData.items.find(
-        (font: VfFont) => font.family.toLowerCase() === familyName.toLowerCase()
-      ) ||
-      webfontsVfData.items.find((font: VfFont) =>
-        font.family.toLowerCase().includes(familyName.toLowerCase())
-      );
+    if (!vfFont) {
+      // Convert font ID back to family name and scan the catalogs
+      const familyName = entry?.family ?? idToFamily(fontId);
+      vfFont = findByFamilyName(vfItems, familyName);
+      staticFont = staticFont ?? findByFamilyName(staticItems, familyName);
+    }
 
     if (!vfFont) {
       return NextResponse.json({ error: "Font not found" }, { status: 404 });
     }
 
-    // Find corresponding font in webfonts.json
-    const staticFont =
-      webfontsData.items.find(
-        (font: StaticFont) =>
-          font.family.toLowerCase() === familyName.toLowerCase()
-      ) ||
-      webfontsData.items.find((font: StaticFont) =>
-        font.family.toLowerCase().includes(familyName.toLowerCase())
-      );
-
     // Combine the data
     const combinedFont: CombinedFont = {
       ...vfFont, // webfonts-vf.json data (primary)
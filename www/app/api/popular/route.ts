@@ -1,5 +1,6 @@
 import { NextRequest, NextResponse } from "next/server";
-import { getPopularStats } from "@/lib/popular-utils";
+import { getPopularStats, getSortedPopularStats } from "@/lib/popular-utils";
+import { getSortOrders } from "@/lib/fonts-utils";
 
 export async function GET(request: NextRequest) {
   try {
@@ -21,11 +22,7 @@ export async function GET(request: NextRequest) {
     const fontsData = getPopularStats();
 
     // Sort by the requested field (default: rate, descending)
-    const sortedStats = [...fontsData].sort((a, b) => {
-      const aValue = a[sortBy] as number;
-      const bValue = b[sortBy] as number;
-      return (bValue || 0) - (aValue || 0);
-    });
+    const sortedStats = getSortedPopularStats(sortBy, getSortOrders());
 
     // Apply limit
     const limitedStats = sortedStats.slice(0, limit);
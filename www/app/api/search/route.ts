@@ -1,12 +1,10 @@
 import { NextRequest, NextResponse } from "next/server";
 import {
   getWebfontsData,
-  filterFonts,
+  searchFonts,
   paginateFonts,
-  sortFonts,
   validateSort,
 } from "@/lib/fonts-utils";
-import { Font } from "@/types";
 
 export async function GET(request: NextRequest) {
   try {
@@ -14,6 +12,9 @@ export async function GET(request: NextRequest) {
     const query = searchParams.get("q");
     const property = searchParams.get("property"); // "variable" or "static"
     const category = searchParams.get("category"); // "sans-serif", "serif", etc.
+    const subset = searchParams.get("subset"); // "latin", "cyrillic,greek", etc.
+    const axis = searchParams.get("axis"); // "wght", "wdth,slnt", etc.
+    const license = searchParams.get("license"); // "ofl", "apache" or "ufl"
     const sort = validateSort(searchParams.get("sort"), "popular");
     const page = parseInt(searchParams.get("page") || "1");
     const limit = parseInt(searchParams.get("limit") || "100");
@@ -21,16 +22,20 @@ export async function GET(request: NextRequest) {
     // Get webfonts data
     const webfontsData = getWebfontsData();
 
-    // Filter fonts using shared utility
-    const filteredFonts = filterFonts(
-      webfontsData.items,
-      query || undefined,
-      property || undefined,
-      category || undefined
-    ) as Font[];
-
-    // Apply sorting BEFORE pagination using shared utility
-    sortFonts(filteredFonts, sort);
+    // Resolve the query and filters through the search and facet indexes
+    // over the precomputed ordering, so no per-request sort is needed
+    const filteredFonts = searchFonts(sort, {
+      query: query || undefined,
+      // Other property values never filtered anything
+      property:
+        property === "variable" || property === "static"
+          ? property
+          : undefined,
+      category: category || undefined,
+      subset: subset || undefined,
+      axis: axis || undefined,
+      license: license || undefined,
+    });
 
     // Paginate using shared utility
     const paginated = paginateFonts(filteredFonts, page, limit);
@@ -51,6 +56,9 @@ export async function GET(request: NextRequest) {
       filters: {
         property,
         category,
+        subset,
+        axis,
+        license,
       },
     });
   } catch (error) {
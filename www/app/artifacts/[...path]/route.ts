@@ -0,0 +1,70 @@
+import { NextRequest, NextResponse } from "next/server";
+import crypto from "crypto";
+import fs from "fs";
+import path from "path";
+import { Readable } from "stream";
+import { resolveAlias } from "@/lib/artifacts";
+
+const CONTENT_TYPES: Record<string, string> = {
+  ".json": "application/json; charset=utf-8",
+  ".svg": "image/svg+xml; charset=utf-8",
+  ".bin": "application/octet-stream",
+  ".woff2": "font/woff2",
+  ".ttf": "font/ttf",
+};
+
+// Public files whose contents were checked against the manifest
+const verified = new Set<string>();
+
+/**
+ * Serves the hashed aliases of artifacts.json. An alias answers only while
+ * the file still has the hash it names, so its response can be cached
+ * forever; a changed file is published under a new alias.
+ */
+export async function GET(
+  request: NextRequest,
+  { params }: { params: Promise<{ path: string[] }> }
+) {
+  const { path: segments } = await params;
+  const resolved = resolveAlias(segments.join("/"));
+  if (!resolved) {
+    return NextResponse.json({ error: "Unknown artifact" }, { status: 404 });
+  }
+
+  const file = path.join(process.cwd(), "public", resolved.file);
+  let body: Buffer | ReadableStream;
+  try {
+    if (verified.has(resolved.file)) {
+      // Checked before: stream it instead of reading it whole
+      fs.accessSync(file, fs.constants.R_OK);
+      body = Readable.toWeb(fs.createReadStream(file)) as ReadableStream;
+    } else {
+      const content = fs.readFileSync(file);
+      const sha256 = crypto.createHash("sha256").update(content).digest("hex");
+      if (sha256 !== resolved.entry.sha256) {
+        // The file changed after the manifest was written
+        return NextResponse.json(
+          { error: "Unknown artifact" },
+          { status: 404 }
+        );
+      }
+      verified.add(resolved.file);
+      body = content;
+    }
+  } catch {
+    return NextResponse.json({ error: "Unknown artifact" }, { status: 404 });
+  }
+
+  return new NextResponse(
+    body instanceof Buffer ? new Uint8Array(body) : body,
+    {
+      headers: {
+        "Content-Type":
+          CONTENT_TYPES[path.extname(resolved.file)] ??
+          "application/octet-stream",
+        "Cache-Control": "public, max-age=31536000, immutable",
+        ETag: `"${resolved.entry.sha256}"`,
+      },
+    }
+  );
+}
@@ -86,6 +86,15 @@ export default function DevelopersPage() {
                     Variable fonts metadata with axis information
                   </p>
                 </div>
+                <div className="bg-muted rounded-md p-3">
+                  <code className="text-sm text-foreground">
+                    /artifacts.json
+                  </code>
+                  <p className="text-xs text-muted-foreground mt-1">
+                    SHA-256 and size of every generated file, with a hashed
+                    URL (/artifacts/...) that can be cached forever
+                  </p>
+                </div>
               </div>
             </div>
 
@@ -0,0 +1,69 @@
+import { describe, test, expect } from "@jest/globals";
+import {
+  ArtifactManifest,
+  immutableUrl,
+  parseAlias,
+  resolveAlias,
+} from "../artifacts";
+
+const sha = "1a2b3c4d5e6f" + "0".repeat(52);
+const manifest: ArtifactManifest = {
+  version: 1,
+  artifacts: {
+    "www/public/webfonts.metadata.json": {
+      sha256: sha,
+      size: 10,
+      url: "/artifacts/webfonts.metadata.1a2b3c4d5e6f.json",
+    },
+    "www/public/svg/abel.svg": {
+      sha256: sha,
+      size: 20,
+      url: "/artifacts/svg/abel.1a2b3c4d5e6f.svg",
+    },
+    "broken.lock.json": { sha256: sha, size: 30 },
+  },
+};
+
+describe("parseAlias", () => {
+  test("should split the hash from the file name", () => {
+    expect(parseAlias("webfonts.metadata.1a2b3c4d5e6f.json")).toEqual({
+      file: "webfonts.metadata.json",
+      hash: "1a2b3c4d5e6f",
+    });
+    expect(parseAlias("svg/abel.1a2b3c4d5e6f.svg")).toEqual({
+      file: "svg/abel.svg",
+      hash: "1a2b3c4d5e6f",
+    });
+  });
+
+  test("should reject paths without a hash or outside public", () => {
+    expect(parseAlias("webfonts.json")).toBeNull();
+    expect(parseAlias("../secret.1a2b3c4d5e6f.json")).toBeNull();
+  });
+});
+
+describe("immutableUrl", () => {
+  test("should return the hashed alias of a public file", () => {
+    expect(immutableUrl("/svg/abel.svg", manifest)).toBe(
+      "/artifacts/svg/abel.1a2b3c4d5e6f.svg"
+    );
+  });
+
+  test("should fall back to the plain path", () => {
+    expect(immutableUrl("/svg/roboto.svg", manifest)).toBe("/svg/roboto.svg");
+    expect(immutableUrl("/svg/abel.svg", null)).toBe("/svg/abel.svg");
+  });
+});
+
+describe("resolveAlias", () => {
+  test("should resolve a current alias", () => {
+    expect(
+      resolveAlias("svg/abel.1a2b3c4d5e6f.svg", manifest)?.entry.size
+    ).toBe(20);
+  });
+
+  test("should reject an alias issued for other contents", () => {
+    expect(resolveAlias("svg/abel.ffffffffffff.svg", manifest)).toBeNull();
+    expect(resolveAlias("broken.lock.1a2b3c4d5e6f.json", manifest)).toBeNull();
+  });
+});
@@ -0,0 +1,78 @@
+import { describe, test, expect } from "@jest/globals";
+import {
+  bitmapDocs,
+  decodeBitmap,
+  facetBitmap,
+  hasDoc,
+  FacetIndex,
+} from "../facet-index";
+
+// Doc 0: "Open Sans", doc 1: "Roboto Mono", doc 2: "Roboto Serif",
+// bits: docs 0 and 2 -> 0b101 -> "BQ==", docs 0-2 -> 0b111 -> "Bw=="
+const index: FacetIndex = {
+  version: 1,
+  families: ["Open Sans", "Roboto Mono", "Roboto Serif"],
+  facets: {
+    category: {
+      "sans-serif": { ids: [0] },
+      monospace: { ids: [1] },
+      serif: { ids: [2] },
+    },
+    subset: { latin: { bits: "Bw==" }, cyrillic: { bits: "BQ==" } },
+    property: { variable: { bits: "BQ==" }, static: { ids: [1] } },
+    axis: { wght: { bits: "BQ==" }, wdth: { ids: [0] } },
+    license: { ofl: { bits: "Bw==" } },
+  },
+};
+
+const docs = (filters: Parameters<typeof facetBitmap>[1]) => {
+  const bits = facetBitmap(index, filters);
+  return bits && bitmapDocs(bits);
+};
+
+describe("decodeBitmap", () => {
+  test("should decode both encodings to the same bits", () => {
+    expect(decodeBitmap({ bits: "BQ==" }, 3)).toEqual(
+      decodeBitmap({ ids: [0, 2] }, 3)
+    );
+  });
+
+  test("should set the doc bits least significant first", () => {
+    const bits = decodeBitmap({ ids: [1, 9] }, 12);
+    expect(bits.length).toBe(2);
+    expect(hasDoc(bits, 1)).toBe(true);
+    expect(hasDoc(bits, 9)).toBe(true);
+    expect(hasDoc(bits, 0)).toBe(false);
+    expect(bitmapDocs(bits)).toEqual([1, 9]);
+  });
+});
+
+describe("facetBitmap", () => {
+  test("should return null without facet filters", () => {
+    expect(facetBitmap(index, {})).toBeNull();
+  });
+
+  test("should intersect facets", () => {
+    expect(docs({ subset: "cyrillic" })).toEqual([0, 2]);
+    expect(docs({ subset: "cyrillic", axis: "wdth" })).toEqual([0]);
+    expect(docs({ property: "variable", category: "serif" })).toEqual([2]);
+  });
+
+  test("should require every value of a list", () => {
+    expect(docs({ axis: "wght,wdth" })).toEqual([0]);
+    expect(docs({ subset: "Latin,Cyrillic" })).toEqual([0, 2]);
+  });
+
+  test("should match nothing for an unknown value", () => {
+    expect(docs({ subset: "klingon" })).toEqual([]);
+    expect(docs({ license: "apache" })).toEqual([]);
+  });
+
+  test("should ignore a facet that was not built", () => {
+    const unlicensed = {
+      ...index,
+      facets: { ...index.facets, license: {} },
+    };
+    expect(facetBitmap(unlicensed, { license: "ofl" })).toBeNull();
+  });
+});
@@ -0,0 +1,62 @@
+import { describe, test, expect } from "@jest/globals";
+import {
+  lookupFamilyId,
+  resolveFamilyId,
+  itemAt,
+  FamilyIndex,
+} from "../family-index";
+
+const index: FamilyIndex = {
+  version: 1,
+  ids: {
+    "open-sans": { family: "Open Sans", static: 1, vf: 0 },
+    roboto: { family: "Roboto", static: 0 },
+  },
+  aliases: { opensans: "open-sans" },
+};
+
+describe("lookupFamilyId", () => {
+  test("should resolve URL ids", () => {
+    expect(lookupFamilyId(index, "open-sans")?.family).toBe("Open Sans");
+    expect(lookupFamilyId(index, "roboto")?.family).toBe("Roboto");
+  });
+
+  test("should resolve folder ids through aliases", () => {
+    expect(lookupFamilyId(index, "opensans")?.family).toBe("Open Sans");
+  });
+
+  test("should be case-insensitive", () => {
+    expect(lookupFamilyId(index, "Open-Sans")?.family).toBe("Open Sans");
+  });
+
+  test("should return null for unknown ids", () => {
+    expect(lookupFamilyId(index, "unknown")).toBeNull();
+    expect(lookupFamilyId(index, "constructor")).toBeNull();
+  });
+});
+
+describe("resolveFamilyId", () => {
+  test("should return the canonical URL id", () => {
+    expect(resolveFamilyId(index, "open-sans")).toBe("open-sans");
+    expect(resolveFamilyId(index, "OpenSans")).toBe("open-sans");
+  });
+
+  test("should return null for unknown ids", () => {
+    expect(resolveFamilyId(index, "../family-ids")).toBeNull();
+    expect(resolveFamilyId(index, "constructor")).toBeNull();
+  });
+});
+
+describe("itemAt", () => {
+  const items = [{ family: "Roboto" }, { family: "Open Sans" }];
+
+  test("should return the item at the indexed position", () => {
+    expect(itemAt(items, 1, "Open Sans")).toEqual({ family: "Open Sans" });
+  });
+
+  test("should reject a stale position", () => {
+    expect(itemAt(items, 0, "Open Sans")).toBeUndefined();
+    expect(itemAt(items, 5, "Open Sans")).toBeUndefined();
+    expect(itemAt(items, undefined, "Open Sans")).toBeUndefined();
+  });
+});
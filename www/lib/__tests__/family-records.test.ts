@@ -0,0 +1,31 @@
+import { describe, test, expect } from "@jest/globals";
+import { recordToFont, FamilyRecord } from "../family-records";
+import { StaticFont, VfFont } from "@/types";
+
+const staticFont = { family: "Open Sans", variants: ["regular"] } as StaticFont;
+const vfFont = {
+  family: "Open Sans",
+  variants: ["regular"],
+  axes: [{ tag: "wght", start: 300, end: 800 }],
+} as VfFont;
+
+const record: FamilyRecord = {
+  version: 1,
+  id: "open-sans",
+  family: "Open Sans",
+  vf: vfFont,
+  static: staticFont,
+  post_script_names: { "OpenSans-Regular": "regular" },
+  stats: null,
+  preview: "/svg/opensans.svg",
+};
+
+describe("recordToFont", () => {
+  test("should attach the static item to the VF item", () => {
+    expect(recordToFont(record)).toEqual({ ...vfFont, static: staticFont });
+  });
+
+  test("should return null without a VF item", () => {
+    expect(recordToFont({ ...record, vf: null })).toBeNull();
+  });
+});
@@ -0,0 +1,72 @@
+import { describe, test, expect } from "@jest/globals";
+import { searchIndex, tokenize, SearchIndex } from "../search-index";
+
+// Doc 0: "Open Sans" (sans-serif), doc 1: "Roboto Mono" (monospace),
+// doc 2: "Roboto Serif" (serif); postings are gap-encoded
+const index: SearchIndex = {
+  version: 1,
+  families: ["Open Sans", "Roboto Mono", "Roboto Serif"],
+  terms: [
+    "monospace",
+    "mono",
+    "open",
+    "opensans",
+    "roboto",
+    "robotomono",
+    "robotoserif",
+    "sans",
+    "sansserif",
+    "serif",
+  ].sort(),
+  postings: [],
+};
+const docs: Record<string, number[]> = {
+  mono: [1],
+  monospace: [1],
+  open: [0],
+  opensans: [0],
+  roboto: [1, 2],
+  robotomono: [1],
+  robotoserif: [2],
+  sans: [0],
+  sansserif: [0],
+  serif: [2],
+};
+index.postings = index.terms.map((term) =>
+  docs[term].map((doc, i, all) => doc - (i > 0 ? all[i - 1] : 0))
+);
+
+const search = (query: string) => {
+  const result = searchIndex(index, query);
+  return result && [...result].sort();
+};
+
+describe("tokenize", () => {
+  test("should fold case and diacritics", () => {
+    expect(tokenize("Óptima Çà")).toEqual(["optima", "ca"]);
+  });
+
+  test("should split letters from digits", () => {
+    expect(tokenize("100italic")).toEqual(["100", "italic"]);
+  });
+});
+
+describe("searchIndex", () => {
+  test("should match token prefixes", () => {
+    expect(search("rob")).toEqual([1, 2]);
+    expect(search("rob mo")).toEqual([1]);
+  });
+
+  test("should match the space-stripped query", () => {
+    expect(search("opensans")).toEqual([0]);
+    expect(search("sans-serif")).toEqual([0]);
+  });
+
+  test("should return an empty set when nothing matches", () => {
+    expect(search("zzz")).toEqual([]);
+  });
+
+  test("should return null for a query without tokens", () => {
+    expect(searchIndex(index, " - ")).toBeNull();
+  });
+});
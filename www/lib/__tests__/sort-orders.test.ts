@@ -0,0 +1,43 @@
+import { describe, test, expect } from "@jest/globals";
+import { applyOrder, isSortKey, OrderedSection } from "../sort-orders";
+
+const items = [{ family: "Roboto" }, { family: "Abel" }, { family: "Inter" }];
+
+const section: OrderedSection<"popular" | "alphabetical"> = {
+  families: ["Roboto", "Abel", "Inter"],
+  orders: { popular: [0, 2, 1], alphabetical: [1, 2, 0] },
+};
+
+describe("applyOrder", () => {
+  test("should return the items in the precomputed order", () => {
+    expect(applyOrder(items, section, "popular")).toEqual([
+      { family: "Roboto" },
+      { family: "Inter" },
+      { family: "Abel" },
+    ]);
+    expect(applyOrder(items, section, "alphabetical")?.[0]).toEqual({
+      family: "Abel",
+    });
+  });
+
+  test("should reject orders built from other items", () => {
+    expect(applyOrder(items.slice(1), section, "popular")).toBeNull();
+    expect(applyOrder([...items].reverse(), section, "popular")).toBeNull();
+  });
+
+  test("should return null without orders", () => {
+    expect(applyOrder(items, undefined, "popular")).toBeNull();
+  });
+});
+
+describe("isSortKey", () => {
+  test("should accept the supported sort keys", () => {
+    expect(isSortKey("trending")).toBe(true);
+    expect(isSortKey("date-added")).toBe(true);
+  });
+
+  test("should reject anything else", () => {
+    expect(isSortKey("rate")).toBe(false);
+    expect(isSortKey(null)).toBe(false);
+  });
+});
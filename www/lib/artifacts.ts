@@ -0,0 +1,88 @@
+/**
+ * Content-hash manifest of the generated artifacts (public/artifacts.json),
+ * written by tools/build_artifact_manifest.py. Files under public/ have a
+ * hashed alias (/artifacts/<path>.<hash>.<ext>) that is served with an
+ * immutable Cache-Control header by app/artifacts/[...path]/route.ts.
+ * Server components link them through immutableUrl (the family page's
+ * preview); the font list renders on the client, where the manifest is not
+ * available, and still links the plain /svg paths.
+ */
+
+import fs from "fs";
+import path from "path";
+
+export interface ArtifactEntry {
+  sha256: string;
+  size: number;
+  /** Hashed alias, for files under www/public */
+  url?: string;
+}
+
+export interface ArtifactManifest {
+  version: number;
+  /** Repository-relative path -> entry */
+  artifacts: Record<string, ArtifactEntry>;
+}
+
+const PUBLIC_PREFIX = "www/public/";
+const ALIAS = /^(.*)\.([0-9a-f]{12})(\.[^./]+)$/;
+
+// undefined: not loaded yet, null: not generated
+let manifest: ArtifactManifest | null | undefined;
+
+/**
+ * The artifact manifest, parsed once per server process.
+ */
+export function getArtifactManifest(): ArtifactManifest | null {
+  if (manifest === undefined) {
+    try {
+      manifest = JSON.parse(
+        fs.readFileSync(
+          path.join(process.cwd(), "public", "artifacts.json"),
+          "utf8"
+        )
+      ) as ArtifactManifest;
+    } catch {
+      manifest = null;
+    }
+  }
+  return manifest;
+}
+
+/**
+ * Splits an alias path ("svg/abel.1a2b3c4d5e6f.svg") into the public file
+ * it names and the hash prefix it was issued for.
+ */
+export function parseAlias(
+  alias: string
+): { file: string; hash: string } | null {
+  const match = ALIAS.exec(alias);
+  if (!match || match[1].split("/").includes("..")) return null;
+  return { file: `${match[1]}${match[3]}`, hash: match[2] };
+}
+
+/**
+ * The immutable URL of a public file ("/webfonts.json"), or the plain path
+ * if the manifest has no entry for it.
+ */
+export function immutableUrl(
+  publicPath: string,
+  artifacts: ArtifactManifest | null = getArtifactManifest()
+): string {
+  const key = PUBLIC_PREFIX + publicPath.replace(/^\/+/, "");
+  return artifacts?.artifacts[key]?.url ?? publicPath;
+}
+
+/**
+ * The manifest entry of an alias path, if the alias is current.
+ */
+export function resolveAlias(
+  alias: string,
+  artifacts: ArtifactManifest | null = getArtifactManifest()
+): { file: string; entry: ArtifactEntry } | null {
+  const parsed = parseAlias(alias);
+  if (!parsed || !artifacts) return null;
+  const entry = artifacts.artifacts[PUBLIC_PREFIX + parsed.file];
+  if (!entry || !entry.sha256.startsWith(parsed.hash)) return null;
+  return { file: parsed.file, entry };
+}
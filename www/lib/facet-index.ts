@@ -0,0 +1,91 @@
+/**
+ * Facet bitmaps (public/facet-index.json), generated by
+ * tools/build_facet_index.py. Doc ids are webfonts-vf.json item positions;
+ * a multi-facet filter is the intersection of one bitmap per facet.
+ */
+
+export const FACETS = [
+  "category",
+  "subset",
+  "property",
+  "axis",
+  "license",
+] as const;
+
+export type Facet = (typeof FACETS)[number];
+
+/** A bitset (base64, LSB first) or, for sparse values, sorted doc ids */
+export type EncodedBitmap = { bits: string } | { ids: number[] };
+
+export interface FacetIndex {
+  version: number;
+  /** Doc id -> family, in webfonts-vf.json item order */
+  families: string[];
+  /** Facet -> value -> bitmap */
+  facets: Record<Facet, Record<string, EncodedBitmap>>;
+}
+
+/** Facet -> requested value (a comma-separated list means all of them) */
+export type FacetFilters = Partial<Record<Facet, string | undefined>>;
+
+export function decodeBitmap(entry: EncodedBitmap, size: number): Uint8Array {
+  const bits = new Uint8Array((size + 7) >> 3);
+  if ("ids" in entry) {
+    for (const doc of entry.ids) bits[doc >> 3] |= 1 << (doc & 7);
+  } else {
+    const raw = Buffer.from(entry.bits, "base64");
+    bits.set(raw.subarray(0, bits.length));
+  }
+  return bits;
+}
+
+export function hasDoc(bits: Uint8Array, doc: number): boolean {
+  return ((bits[doc >> 3] >> (doc & 7)) & 1) === 1;
+}
+
+/**
+ * Doc ids set in a bitmap, in ascending order.
+ */
+export function bitmapDocs(bits: Uint8Array): number[] {
+  const docs: number[] = [];
+  for (let byte = 0; byte < bits.length; byte++) {
+    let value = bits[byte];
+    while (value) {
+      const bit = 31 - Math.clz32(value & -value);
+      docs.push((byte << 3) + bit);
+      value &= value - 1;
+    }
+  }
+  return docs;
+}
+
+/**
+ * Intersects the bitmaps of every requested facet value.
+ * @returns The matching docs, or null if no facet filter was given
+ */
+export function facetBitmap(
+  index: FacetIndex,
+  filters: FacetFilters
+): Uint8Array | null {
+  let result: Uint8Array | null = null;
+  const size = index.families.length;
+  for (const facet of FACETS) {
+    const requested = filters[facet];
+    const values = index.facets[facet];
+    // A facet without values was not built (license needs vendor/google)
+    if (!requested || Object.keys(values).length === 0) continue;
+    for (const value of requested.toLowerCase().split(",")) {
+      const key = Object.keys(values).find((k) => k.toLowerCase() === value);
+      // An unknown value matches nothing
+      const bits = key
+        ? decodeBitmap(values[key], size)
+        : new Uint8Array((size + 7) >> 3);
+      if (!result) {
+        result = bits;
+      } else {
+        for (let i = 0; i < result.length; i++) result[i] &= bits[i];
+      }
+    }
+  }
+  return result;
+}
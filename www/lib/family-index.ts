@@ -0,0 +1,64 @@
+/**
+ * Lookups in the family id index (public/family-ids.json), generated by
+ * tools/build_family_ids.py. The build fails on id collisions, so every id
+ * resolves to exactly one family.
+ */
+
+export interface FamilyIndexEntry {
+  family: string;
+  /** Position in webfonts.json items */
+  static?: number;
+  /** Position in webfonts-vf.json items */
+  vf?: number;
+}
+
+export interface FamilyIndex {
+  version: number;
+  /** URL id (see familyToId) -> entry */
+  ids: Record<string, FamilyIndexEntry>;
+  /** Folder id ("opensans") -> URL id ("open-sans") */
+  aliases: Record<string, string>;
+}
+
+function own<T>(record: Record<string, T>, key: string): T | undefined {
+  return Object.prototype.hasOwnProperty.call(record, key)
+    ? record[key]
+    : undefined;
+}
+
+/**
+ * Resolves a URL id or folder id to the canonical URL id.
+ * @returns The URL id, or null if the id is not in the index
+ */
+export function resolveFamilyId(index: FamilyIndex, id: string): string | null {
+  const key = id.toLowerCase();
+  if (own(index.ids, key)) return key;
+  const alias = own(index.aliases, key);
+  return alias && own(index.ids, alias) ? alias : null;
+}
+
+/**
+ * Resolves a URL id or folder id to its index entry.
+ * @returns The entry, or null if the id is not in the index
+ */
+export function lookupFamilyId(
+  index: FamilyIndex,
+  id: string
+): FamilyIndexEntry | null {
+  const key = resolveFamilyId(index, id);
+  return key ? index.ids[key] : null;
+}
+
+/**
+ * Returns the catalog item at an indexed position, but only if it is still
+ * the indexed family (guards against an index older than the catalog).
+ */
+export function itemAt<T extends { family: string }>(
+  items: T[],
+  position: number | undefined,
+  family: string
+): T | undefined {
+  if (position === undefined) return undefined;
+  const item = items[position];
+  return item && item.family === family ? item : undefined;
+}
@@ -0,0 +1,82 @@
+/**
+ * Per-family records (public/families/<id>.json), generated by
+ * tools/build_family_records.py. Each record joins a family's
+ * webfonts-vf.json and webfonts.json items with its PostScript names,
+ * popularity stats and SVG preview, so a detail lookup reads a few KB
+ * instead of parsing both catalogs.
+ */
+
+import fs from "fs";
+import path from "path";
+import { CombinedFont, StaticFont, VfFont } from "@/types";
+import { FontStats } from "@/lib/popular-utils";
+import { FamilyIndex, resolveFamilyId } from "@/lib/family-index";
+
+export interface FamilyRecord {
+  version: number;
+  /** URL id (see familyToId) */
+  id: string;
+  family: string;
+  vf: VfFont | null;
+  static: StaticFont | null;
+  /** PostScript name -> variant */
+  post_script_names: Record<string, string>;
+  stats: Omit<FontStats, "family"> | null;
+  /** SVG preview path, if one was rendered */
+  preview: string | null;
+}
+
+// undefined: not loaded yet, null: index not generated
+let index: FamilyIndex | null | undefined;
+
+/**
+ * The family id index, parsed once per server process.
+ */
+export function loadFamilyIndex(): FamilyIndex | null {
+  if (index === undefined) {
+    try {
+      index = JSON.parse(
+        fs.readFileSync(
+          path.join(process.cwd(), "public", "family-ids.json"),
+          "utf8"
+        )
+      ) as FamilyIndex;
+    } catch {
+      index = null;
+    }
+  }
+  return index;
+}
+
+/**
+ * Reads the record of a URL id or folder id.
+ * @returns The record, or null if the id is unknown or its record is missing
+ */
+export function readFamilyRecord(id: string): FamilyRecord | null {
+  const familyIndex = loadFamilyIndex();
+  // Only ids from the index reach the file system
+  const key = familyIndex ? resolveFamilyId(familyIndex, id) : null;
+  if (!key) return null;
+  try {
+    return JSON.parse(
+      fs.readFileSync(
+        path.join(process.cwd(), "public", "families", `${key}.json`),
+        "utf8"
+      )
+    ) as FamilyRecord;
+  } catch {
+    return null;
+  }
+}
+
+/**
+ * The detail response for a record: the VF item with the static item
+ * attached, or null for families without a webfonts-vf.json entry.
+ */
+export function recordToFont(record: FamilyRecord): CombinedFont | null {
+  if (!record.vf) return null;
+  return {
+    ...record.vf, // webfonts-vf.json data (primary)
+    static: record.static, // webfonts.json data (additional)
+  };
+}
@@ -1,10 +1,11 @@
 "use server";
 
-import { getWebfontsData, paginateFonts, sortFonts } from "./fonts-utils";
+import { getWebfontsData, getSortedFonts, paginateFonts } from "./fonts-utils";
 import fs from "fs";
 import path from "path";
 import { Font, StaticFont, WebfontsResponse } from "@/types";
 import { idToFamily } from "@/lib/fontid";
+import { readFamilyRecord, recordToFont } from "@/lib/family-records";
 
 export async function getInitialFontsData() {
   try {
@@ -12,8 +13,7 @@ export async function getInitialFontsData() {
 
     // Get all fonts (no filters for initial load)
     // Apply popular sorting to match the default client-side behavior
-    const allFonts = [...webfontsData.items] as Font[];
-    sortFonts(allFonts, "popular");
+    const allFonts = getSortedFonts("popular");
 
     // Get first 100 fonts for initial load
     const paginated = paginateFonts(allFonts, 1, 100);
@@ -35,6 +35,12 @@ export async function getInitialFontsData() {
 
 export async function getFontData(fontId: string): Promise<Font | null> {
   try {
+    const record = readFamilyRecord(fontId);
+    const recordFont = record ? recordToFont(record) : null;
+    if (recordFont) {
+      return recordFont;
+    }
+
     // Convert font ID back to family name
     const familyName = idToFamily(fontId);
 
@@ -1,39 +1,233 @@
 import fs from "fs";
 import path from "path";
 import { Font, WebfontsResponse } from "@/types";
-import { getPopularRankMap } from "./popular-utils";
+import { getPopularRankMap, getPopularStats } from "./popular-utils";
+import { SortKey, SortOrders, applyOrder, isSortKey } from "./sort-orders";
+import { SearchIndex, searchIndex } from "./search-index";
+import {
+  FacetFilters,
+  FacetIndex,
+  bitmapDocs,
+  facetBitmap,
+  hasDoc,
+} from "./facet-index";
+
+// Parsed once per server process instead of on every request
+let webfontsData: WebfontsResponse | null = null;
+// undefined: not loaded yet, null: not generated
+let sortOrders: SortOrders | null | undefined;
+const sortedFonts = new Map<SortKey, Font[]>();
+const sortPositions = new Map<SortKey, Map<Font, number>>();
+// undefined: not loaded yet, null: not generated or older than the catalog
+let fontSearchIndex: SearchIndex | null | undefined;
+let fontFacetIndex: FacetIndex | null | undefined;
+
+export interface SearchFilters extends FacetFilters {
+  query?: string;
+}
 
 export function getWebfontsData(): WebfontsResponse {
-  const webfontsPath = path.join(process.cwd(), "public", "webfonts-vf.json");
-  return JSON.parse(fs.readFileSync(webfontsPath, "utf8"));
+  if (!webfontsData) {
+    const webfontsPath = path.join(
+      process.cwd(),
+      "public",
+      "webfonts-vf.json"
+    );
+    webfontsData = JSON.parse(fs.readFileSync(webfontsPath, "utf8"));
+  }
+  return webfontsData as WebfontsResponse;
+}
+
+/**
+ * The precomputed sort orders, parsed once per server process.
+ */
+export function getSortOrders(): SortOrders | null {
+  if (sortOrders === undefined) {
+    try {
+      sortOrders = JSON.parse(
+        fs.readFileSync(
+          path.join(process.cwd(), "public", "sort-orders.json"),
+          "utf8"
+        )
+      ) as SortOrders;
+    } catch {
+      sortOrders = null;
+    }
+  }
+  return sortOrders;
 }
 
 /**
  * Validate and normalize sort parameter.
  * @param sortParam - Sort parameter from query string
  * @param defaultSort - Default sort if invalid (defaults to "popular")
- * @returns Validated sort value: "alphabetical" or "popular"
+ * @returns Validated sort value (see SORT_KEYS)
  */
 export function validateSort(
   sortParam: string | null,
-  defaultSort: "alphabetical" | "popular" = "popular"
-): "alphabetical" | "popular" {
-  return sortParam === "popular" || sortParam === "alphabetical"
-    ? sortParam
-    : defaultSort;
+  defaultSort: SortKey = "popular"
+): SortKey {
+  return isSortKey(sortParam) ? sortParam : defaultSort;
+}
+
+/**
+ * The whole catalog in the given order. Uses the precomputed order from
+ * sort-orders.json when it matches the catalog, and sorts otherwise; either
+ * way the result is computed once per sort key per server process.
+ * @returns Sorted fonts (shared; do not mutate)
+ */
+export function getSortedFonts(sort: SortKey): Font[] {
+  let fonts = sortedFonts.get(sort);
+  if (!fonts) {
+    const items = getWebfontsData().items as Font[];
+    fonts =
+      applyOrder(items, getSortOrders()?.catalog, sort) ??
+      sortFonts([...items], sort);
+    sortedFonts.set(sort, fonts);
+  }
+  return fonts;
+}
+
+/**
+ * Whether an index built over the given families matches the current
+ * catalog; index doc ids are item positions.
+ */
+function isCurrent(families: string[]): boolean {
+  const items = getWebfontsData().items;
+  return (
+    families.length === items.length &&
+    items.every((item, doc) => item.family === families[doc])
+  );
+}
+
+/**
+ * The search index, parsed once per server process. Only returned if it
+ * was built from the current catalog.
+ */
+export function getSearchIndex(): SearchIndex | null {
+  if (fontSearchIndex === undefined) {
+    try {
+      const index = JSON.parse(
+        fs.readFileSync(
+          path.join(process.cwd(), "public", "search-index.json"),
+          "utf8"
+        )
+      ) as SearchIndex;
+      fontSearchIndex = isCurrent(index.families) ? index : null;
+    } catch {
+      fontSearchIndex = null;
+    }
+  }
+  return fontSearchIndex;
+}
+
+/**
+ * The facet bitmaps, parsed once per server process. Only returned if they
+ * were built from the current catalog.
+ */
+export function getFacetIndex(): FacetIndex | null {
+  if (fontFacetIndex === undefined) {
+    try {
+      const index = JSON.parse(
+        fs.readFileSync(
+          path.join(process.cwd(), "public", "facet-index.json"),
+          "utf8"
+        )
+      ) as FacetIndex;
+      fontFacetIndex = isCurrent(index.families) ? index : null;
+    } catch {
+      fontFacetIndex = null;
+    }
+  }
+  return fontFacetIndex;
+}
+
+/**
+ * Fonts matching the query and filters, in the given order. The query is
+ * resolved through the search index and the facet filters by intersecting
+ * the facet bitmaps, so the cost grows with the number of matches rather
+ * than the catalog size. Whatever the indexes cannot serve (a missing or
+ * stale artifact, a query without searchable tokens or without prefix
+ * matches) falls back to filterFonts; the license filter needs a facet
+ * index built with the vendor/google checkout and is ignored otherwise.
+ * @returns Matching fonts (shared when nothing is filtered; do not mutate)
+ */
+export function searchFonts(sort: SortKey, filters: SearchFilters): Font[] {
+  const { query, property, category, subset, axis } = filters;
+  const textIndex = query ? getSearchIndex() : null;
+  const indexed = textIndex && query ? searchIndex(textIndex, query) : null;
+  // The index only matches word prefixes; a query it finds nothing for
+  // ("pen") still gets the substring match of filterFonts
+  const textDocs = indexed && indexed.size > 0 ? indexed : null;
+  const facetIndex = getFacetIndex();
+  const bits = facetIndex ? facetBitmap(facetIndex, filters) : null;
+
+  let docs: number[] | null = null;
+  if (textDocs) {
+    docs = [...textDocs].filter((doc) => !bits || hasDoc(bits, doc));
+  } else if (bits) {
+    docs = bitmapDocs(bits);
+  }
+
+  let fonts: Font[];
+  if (docs) {
+    let positions = sortPositions.get(sort);
+    if (!positions) {
+      positions = new Map(getSortedFonts(sort).map((font, i) => [font, i]));
+      sortPositions.set(sort, positions);
+    }
+    const items = getWebfontsData().items as Font[];
+    fonts = docs
+      .map((doc) => items[doc])
+      .sort((a, b) => positions.get(a)! - positions.get(b)!);
+  } else {
+    fonts = getSortedFonts(sort);
+  }
+
+  if (bits) {
+    return textDocs ? fonts : filterFonts(fonts, query);
+  }
+  return filterFonts(
+    fonts,
+    textDocs ? undefined : query,
+    property,
+    category,
+    subset,
+    axis
+  );
 }
 
 /**
- * Sort fonts by the specified sort method.
+ * Sort fonts by the specified sort method. Fallback for getSortedFonts
+ * when sort-orders.json is missing or stale; "date-added" needs the
+ * METADATA.pb dates in sort-orders.json and sorts alphabetically here.
  * @param fonts - Array of fonts to sort
- * @param sort - Sort method: "alphabetical" or "popular"
+ * @param sort - Sort method (see SORT_KEYS)
  * @returns Sorted array of fonts (mutates the input array)
  */
-export function sortFonts(
-  fonts: Font[],
-  sort: "alphabetical" | "popular"
-): Font[] {
-  if (sort === "popular") {
+export function sortFonts(fonts: Font[], sort: SortKey): Font[] {
+  if (sort === "trending") {
+    const yearChange = new Map(
+      getPopularStats().map((stat) => [
+        stat.family.toLowerCase(),
+        stat.year_change,
+      ])
+    );
+    fonts.sort((a, b) => {
+      const changeA = yearChange.get(a.family.toLowerCase()) ?? -Infinity;
+      const changeB = yearChange.get(b.family.toLowerCase()) ?? -Infinity;
+      if (changeA !== changeB) {
+        return changeB - changeA;
+      }
+      return a.family.toLowerCase().localeCompare(b.family.toLowerCase());
+    });
+  } else if (sort === "last-modified") {
+    fonts.sort(
+      (a, b) =>
+        b.lastModified.localeCompare(a.lastModified) ||
+        a.family.toLowerCase().localeCompare(b.family.toLowerCase())
+    );
+  } else if (sort === "popular") {
     const rankMap = getPopularRankMap();
     fonts.sort((a, b) => {
       const rankA = rankMap.get(a.family.toLowerCase()) ?? Infinity;
@@ -59,7 +253,9 @@ export function filterFonts(
   fonts: Font[],
   query?: string,
   property?: string,
-  category?: string
+  category?: string,
+  subset?: string,
+  axis?: string
 ): Font[] {
   let filteredFonts = fonts;
 
@@ -98,6 +294,22 @@ export function filterFonts(
     });
   }
 
+  // Filter by subset and axis (comma-separated: all of them)
+  if (subset) {
+    const subsets = subset.toLowerCase().split(",");
+    filteredFonts = filteredFonts.filter((font: Font) =>
+      subsets.every((s) => font.subsets?.includes(s))
+    );
+  }
+  if (axis) {
+    const tags = axis.toLowerCase().split(",");
+    filteredFonts = filteredFonts.filter((font: Font) =>
+      tags.every((tag) =>
+        font.axes?.some((a) => a.tag.toLowerCase() === tag)
+      )
+    );
+  }
+
   return filteredFonts;
 }
 
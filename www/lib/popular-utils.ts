@@ -1,4 +1,5 @@
 import statsData from "@/app/api/popular/stats.json";
+import { SortOrders, applyOrder } from "./sort-orders";
 
 export interface FontStats {
   family: string;
@@ -38,3 +39,22 @@ export function getPopularRankMap(): Map<string, number> {
   return rankMap;
 }
 
+
+/**
+ * Popular stats sorted by a field, descending. Uses the precomputed order
+ * from sort-orders.json when it matches stats.json.
+ *
+ * @param sortBy - Stats field to sort by
+ * @param sortOrders - Precomputed orders (see getSortOrders), if any
+ * @returns Sorted stats (a new array)
+ */
+export function getSortedPopularStats(
+  sortBy: "rate" | "total_views" | "year_views",
+  sortOrders: SortOrders | null
+): FontStats[] {
+  const stats = getPopularStats();
+  return (
+    applyOrder(stats, sortOrders?.stats, sortBy) ??
+    [...stats].sort((a, b) => (b[sortBy] || 0) - (a[sortBy] || 0))
+  );
+}
@@ -0,0 +1,94 @@
+/**
+ * Inverted search index (public/search-index.json), generated by
+ * tools/build_search_index.py. A query matches a family when each of its
+ * tokens is a prefix of one of the family's terms (name, variant, or the
+ * name/category with spaces stripped), or when the whole query stripped
+ * the same way is.
+ */
+
+export interface SearchIndex {
+  version: number;
+  /** Doc id -> family, in webfonts-vf.json item order */
+  families: string[];
+  /** Sorted term dictionary */
+  terms: string[];
+  /** Per term: gap-encoded doc ids */
+  postings: number[][];
+}
+
+/**
+ * Lower-cased, diacritic-folded runs of letters or digits. Must stay in
+ * step with tokenize() in tools/build_search_index.py.
+ */
+export function tokenize(text: string): string[] {
+  const folded = text
+    .normalize("NFKD")
+    .replace(/[\u0300-\u036f]/g, "")
+    .toLowerCase();
+  return folded.match(/[a-z]+|[0-9]+/g) ?? [];
+}
+
+const decoded = new WeakMap<number[], number[]>();
+
+function docsOf(gaps: number[]): number[] {
+  let docs = decoded.get(gaps);
+  if (!docs) {
+    docs = [];
+    let current = 0;
+    for (const gap of gaps) {
+      current += gap;
+      docs.push(current);
+    }
+    decoded.set(gaps, docs);
+  }
+  return docs;
+}
+
+function lowerBound(terms: string[], value: string, start = 0): number {
+  let lo = start;
+  let hi = terms.length;
+  while (lo < hi) {
+    const mid = (lo + hi) >>> 1;
+    if (terms[mid] < value) lo = mid + 1;
+    else hi = mid;
+  }
+  return lo;
+}
+
+/**
+ * Doc ids of every term starting with the token.
+ */
+export function prefixDocs(index: SearchIndex, token: string): Set<number> {
+  const start = lowerBound(index.terms, token);
+  const end = lowerBound(index.terms, token + "\uffff", start);
+  const docs = new Set<number>();
+  for (let term = start; term < end; term++) {
+    for (const doc of docsOf(index.postings[term])) docs.add(doc);
+  }
+  return docs;
+}
+
+/**
+ * Doc ids matching the query.
+ * @returns Matching doc ids, or null for a query without tokens
+ */
+export function searchIndex(
+  index: SearchIndex,
+  query: string
+): Set<number> | null {
+  const tokens = tokenize(query);
+  if (tokens.length === 0) return null;
+
+  // Longest token first: it usually has the fewest matches
+  const ordered = [...new Set(tokens)].sort((a, b) => b.length - a.length);
+  let docs = prefixDocs(index, ordered[0]);
+  for (const token of ordered.slice(1)) {
+    if (docs.size === 0) break;
+    const next = prefixDocs(index, token);
+    docs = new Set([...docs].filter((doc) => next.has(doc)));
+  }
+  if (tokens.length > 1) {
+    for (const doc of prefixDocs(index, tokens.join(""))) docs.add(doc);
+  }
+  return docs;
+}
@@ -0,0 +1,57 @@
+/**
+ * Precomputed sort orders (public/sort-orders.json), generated by
+ * tools/build_sort_orders.py. Each order is an array of item positions, so
+ * a sorted listing is a slice instead of a sort per request.
+ */
+
+export const SORT_KEYS = [
+  "popular",
+  "trending",
+  "alphabetical",
+  "date-added",
+  "last-modified",
+] as const;
+
+export type SortKey = (typeof SORT_KEYS)[number];
+
+export interface OrderedSection<K extends string> {
+  /** Families of the indexed file, in item order */
+  families: string[];
+  /** Sort key -> item positions in sorted order */
+  orders: Record<K, number[]>;
+}
+
+export interface SortOrders {
+  version: number;
+  /** Orders over webfonts-vf.json items */
+  catalog: OrderedSection<SortKey> & {
+    /** Dense ranks per item position (1 = top, 0 = no stats) */
+    ranks: Record<"popular" | "trending", number[]>;
+  };
+  /** Orders over stats.json rows */
+  stats: OrderedSection<"rate" | "total_views" | "year_views">;
+}
+
+export function isSortKey(value: string | null): value is SortKey {
+  return SORT_KEYS.includes(value as SortKey);
+}
+
+/**
+ * Returns the items in a precomputed order, or null if the order is missing
+ * or was built from a different version of the items.
+ */
+export function applyOrder<T extends { family: string }, K extends string>(
+  items: T[],
+  section: OrderedSection<K> | undefined,
+  key: K
+): T[] | null {
+  const order = section?.orders[key];
+  if (!section || !order || section.families.length !== items.length) {
+    return null;
+  }
+  const current = items.every(
+    (item, position) => item.family === section.families[position]
+  );
+  if (!current) return null;
+  return order.map((position) => items[position]);
+}